@@ -2,9 +2,16 @@
 #  Hotel Management System - Flask Application
 # ===============================================
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-from database.queries import get_dashboard_stats, get_recent_bookings
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify
+from config import settings
+from database import slow_queries
+from database.queries import get_dashboard_stats, get_recent_bookings, get_revenue_series, warm_pool
+import exports
+import reporting
+import routing
+from datetime import date
 import os
+import threading
 
 # -----------------------
 # Flask App Configuration
@@ -16,6 +23,30 @@ app = Flask(
 )
 app.secret_key = os.getenv("SECRET_KEY", "super_secret_key")
 
+# Prometheus metrics for every dashboard route, served at /metrics
+if settings.METRICS_ENABLED:
+    import metrics
+    metrics.init_flask(app)
+
+# Dashboard pages read from the replica (when configured); a client that just wrote reads from the primary
+routing.init_flask(app)
+
+# Open the shared DB pool once serving starts (not at import), so early views don't each pay for connects
+_pool_warmed = False
+_pool_warm_lock = threading.Lock()
+
+
+@app.before_request
+def warm_up():
+    """Warm the DB pool before the first request is handled (DB_WARM_POOL)."""
+    global _pool_warmed
+    if _pool_warmed or not settings.DB_WARM_POOL:
+        return
+    with _pool_warm_lock:
+        if not _pool_warmed:
+            warm_pool()
+            _pool_warmed = True
+
 # -----------------------
 # Helper Functions
 # -----------------------
@@ -77,8 +108,9 @@ def route_dashboard():
 
     # Fetch stats and recent bookings from DB
     stats = get_dashboard_stats()
-    stats["revenue_days_labels"] = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    stats["revenue_days_data"] = [2100, 2600, 1900, 2500, 3000, 2800, 2200]
+    revenue_dates, revenue_amounts = get_revenue_series(7)
+    stats["revenue_days_labels"] = [day.strftime("%a") for day in revenue_dates]
+    stats["revenue_days_values"] = revenue_amounts
 
     recent_bookings = get_recent_bookings()
 
@@ -154,7 +186,107 @@ def route_generate_bill():
 def route_reports_revenue():
     if not is_logged_in():
         return redirect(url_for('route_login'))
-    return render_template('reports/revenue_report.html', user_name=session.get('username'))
+
+    revenue_dates, revenue_amounts = get_revenue_series(30)
+    total_revenue = sum(revenue_amounts)
+    try:
+        performance = reporting.performance_report(revenue_dates[0], revenue_dates[-1], by='hotel', period='total')
+    except Exception as e:
+        print("❌ Performance report failed:", e)
+        performance = []
+    return render_template(
+        'reports/revenue_report.html',
+        total_revenue=total_revenue,
+        avg_daily_revenue=total_revenue / len(revenue_amounts),
+        performance=performance,
+        performance_totals=reporting.totals(performance),
+        report_start=revenue_dates[0].isoformat(),
+        report_end=revenue_dates[-1].isoformat(),
+        user_name=session.get('username')
+    )
+
+
+@app.route('/reports/revenue/export')
+def route_reports_revenue_export():
+    """Occupancy / ADR / RevPAR as CSV: ?start=&end=&by=hotel|room_type&period=day|month|year|total"""
+    if not is_logged_in():
+        return jsonify(error="Not logged in"), 401
+    try:
+        start = date.fromisoformat(request.args.get('start', ''))
+        end = date.fromisoformat(request.args.get('end', ''))
+        rows = reporting.performance_report(
+            start, end,
+            by=request.args.get('by', 'hotel'),
+            period=request.args.get('period', 'day'),
+            hotel_id=request.args.get('hotel_id', type=int),
+        )
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return Response(
+        reporting.to_csv(rows),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="performance_{start}_{end}.csv"'}
+    )
+
+
+# -----------------------
+# Guest Exports (streamed)
+# -----------------------
+def _export_response(stmt, name):
+    fmt = request.args.get('format', 'csv')
+    if fmt not in exports.MEDIA_TYPES:
+        return jsonify(error=f"format must be one of: {', '.join(exports.MEDIA_TYPES)}"), 400
+    return Response(
+        exports.stream(stmt, fmt),
+        mimetype=exports.MEDIA_TYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{exports.filename(name, fmt)}"'}
+    )
+
+
+@app.route('/api/guests/export/csv')
+def route_export_guests():
+    if not is_logged_in():
+        return jsonify(error="Not logged in"), 401
+    return _export_response(exports.guests_query(), 'guests')
+
+
+@app.route('/api/guests/export')
+def route_export_selected_guests():
+    if not is_logged_in():
+        return jsonify(error="Not logged in"), 401
+    try:
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify(error="ids must be a comma separated list of guest ids"), 400
+    if not ids or len(ids) > settings.BULK_MAX_ROWS:
+        return jsonify(error=f"Select between 1 and {settings.BULK_MAX_ROWS} guests"), 400
+    return _export_response(exports.guests_query(ids=ids), 'guests_selected')
+
+
+@app.route('/api/guests/search/export')
+def route_export_guest_search():
+    """Export the search page results. city / id_proof_type / gender have no column yet and are ignored."""
+    if not is_logged_in():
+        return jsonify(error="Not logged in"), 401
+    stmt = exports.guests_query(
+        term=request.args.get('query'),
+        search_type=request.args.get('search_type', 'all'),
+        registered_since=exports.period_start(request.args.get('period')),
+        min_bookings=request.args.get('min_bookings', type=int),
+    )
+    return _export_response(stmt, 'guest_search')
+
+
+# -----------------------
+# Admin
+# -----------------------
+@app.route('/api/admin/slow-queries')
+def route_slow_queries():
+    """Slow dashboard queries recorded in this process, newest first."""
+    if not is_logged_in():
+        return jsonify(error="Not logged in"), 401
+    limit = request.args.get('limit', 100, type=int)
+    return jsonify(threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS, entries=slow_queries.entries(limit))
 
 
 # -----------------------
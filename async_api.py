@@ -0,0 +1,173 @@
+"""
+async_api.py — Async handlers for the opt-in async API mode (settings.ASYNC_API).
+
+main.py registers this router ahead of its own routes, so these handlers take
+over the same paths and the remaining endpoints stay on the sync handlers.
+Requests here wait on the async engine's pool instead of holding a threadpool
+worker while MySQL answers.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud_async
+import expand as expansions
+import http_cache
+import schemas
+from config import settings
+from database import get_async_db
+from pagination import set_next_cursor
+
+router = APIRouter(include_in_schema=False)
+
+PageLimit = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE)
+
+
+# ============= HOTEL / ROOM ENDPOINTS =============
+@router.get("/hotels/", response_model=List[schemas.HotelResponse])
+async def read_hotels(request: Request, limit: int = PageLimit, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    cached, generation = http_cache.lookup(request, http_cache.HOTELS)
+    if cached:
+        return cached
+    hotels, next_cursor = await crud_async.get_hotels(db, limit, cursor)
+    return http_cache.store(request, http_cache.HOTELS, generation, List[schemas.HotelResponse], hotels, next_cursor)
+
+@router.get("/hotels/{hotel_id}", response_model=schemas.HotelResponse)
+async def read_hotel(hotel_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached, generation = http_cache.lookup(request, http_cache.HOTELS)
+    if cached:
+        return cached
+    hotel = await crud_async.get_hotel(db, hotel_id)
+    if not hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return http_cache.store(request, http_cache.HOTELS, generation, schemas.HotelResponse, hotel)
+
+@router.get("/hotels/{hotel_id}/employees", response_model=List[schemas.EmployeeResponse])
+async def read_hotel_employees(
+    hotel_id: int,
+    request: Request,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    cached, generation = http_cache.lookup(request, http_cache.EMPLOYEES)
+    if cached:
+        return cached
+    employees, next_cursor = await crud_async.get_employees_by_hotel(db, hotel_id, limit, cursor)
+    return http_cache.store(request, http_cache.EMPLOYEES, generation, List[schemas.EmployeeResponse], employees, next_cursor)
+
+@router.get("/rooms/{room_id}", response_model=schemas.RoomResponse)
+async def read_room(room_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached, generation = http_cache.lookup(request, http_cache.ROOMS)
+    if cached:
+        return cached
+    room = await crud_async.get_room(db, room_id)
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return http_cache.store(request, http_cache.ROOMS, generation, schemas.RoomResponse, room)
+
+@router.get("/hotels/{hotel_id}/available-rooms", response_model=List[schemas.RoomResponse])
+async def get_available_rooms(
+    hotel_id: int,
+    check_in: date,
+    check_out: date,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
+    return await crud_async.get_available_rooms(db, hotel_id, check_in, check_out)
+
+
+# ============= GUEST ENDPOINTS =============
+@router.post("/guests/", response_model=schemas.GuestResponse, status_code=status.HTTP_201_CREATED)
+async def create_guest(guest: schemas.GuestCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.create_guest(db, guest)
+
+@router.get("/guests/{guest_id}", response_model=schemas.GuestDetail, response_model_exclude_unset=True)
+async def read_guest(guest_id: int, expand: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    names = expansions.parse_guest(expand)
+    guest = await crud_async.get_guest(db, guest_id, names)
+    if not guest:
+        raise HTTPException(status_code=404, detail="Guest not found")
+    return expansions.guest_detail(guest, names)
+
+@router.get("/guests/search/{search_term}", response_model=List[schemas.GuestResponse])
+async def search_guests(
+    search_term: str,
+    limit: int = Query(20, ge=1, le=settings.GUEST_SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud_async.search_guests(db, search_term, limit, offset)
+
+
+# ============= BOOKING ENDPOINTS =============
+@router.post("/bookings/", response_model=schemas.BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking(booking: schemas.BookingCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.create_booking(db, booking)
+
+@router.get("/bookings/{booking_id}", response_model=schemas.BookingDetail, response_model_exclude_unset=True)
+async def read_booking(booking_id: int, expand: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    names = expansions.parse_booking(expand)
+    booking = await crud_async.get_booking(db, booking_id, names)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return expansions.booking_detail(booking, names)
+
+@router.put("/bookings/{booking_id}", response_model=schemas.BookingResponse)
+async def update_booking(booking_id: int, booking: schemas.BookingUpdate, db: AsyncSession = Depends(get_async_db)):
+    updated = await crud_async.update_booking(db, booking_id, booking)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return updated
+
+@router.get("/guests/{guest_id}/bookings", response_model=List[schemas.BookingDetail], response_model_exclude_unset=True)
+async def read_guest_bookings(
+    guest_id: int,
+    response: Response,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    names = expansions.parse_booking(expand)
+    bookings, next_cursor = await crud_async.get_bookings_by_guest(db, guest_id, limit, cursor, names)
+    set_next_cursor(response, next_cursor)
+    return [expansions.booking_detail(booking, names) for booking in bookings]
+
+
+# ============= PAYMENT / SERVICE ENDPOINTS =============
+@router.post("/payments/", response_model=schemas.PaymentResponse, status_code=status.HTTP_201_CREATED)
+async def create_payment(payment: schemas.PaymentCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.create_payment(db, payment)
+
+@router.get("/bookings/{booking_id}/payments", response_model=List[schemas.PaymentResponse])
+async def read_booking_payments(
+    booking_id: int,
+    response: Response,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    payments, next_cursor = await crud_async.get_payments_by_booking(db, booking_id, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return payments
+
+@router.get("/services/", response_model=List[schemas.ServiceResponse])
+async def read_services(request: Request, limit: int = PageLimit, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    cached, generation = http_cache.lookup(request, http_cache.SERVICES)
+    if cached:
+        return cached
+    services, next_cursor = await crud_async.get_services(db, limit, cursor)
+    return http_cache.store(request, http_cache.SERVICES, generation, List[schemas.ServiceResponse], services, next_cursor)
+
+@router.post("/bookings/{booking_id}/services", response_model=schemas.ServiceUsageResponse)
+async def add_service_to_booking(
+    booking_id: int,
+    service_usage: schemas.ServiceUsageCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud_async.add_service_to_booking(db, service_usage)
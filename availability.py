@@ -0,0 +1,217 @@
+"""
+availability.py — In-process room availability index for the Hotel Management System.
+
+Keeps every active ('Confirmed' / 'Checked-In') stay as a sorted list of
+half-open [check_in, check_out) intervals per room, so availability searches
+are answered with a binary search per room instead of scanning the booking table.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+import models
+from config import settings
+from database import replica_reads
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ACTIVE_STATUSES = (models.BookingStatus.CONFIRMED, models.BookingStatus.CHECKED_IN)
+
+
+class AvailabilityIndex:
+    """
+    Per-room interval index of active stays.
+
+    The index is process-local: writes made through `crud` keep it current,
+    and `ttl_seconds` bounds how long writes from other workers can go unseen
+    before the next full reload.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._stays: Dict[int, List[Tuple[date, date, int]]] = {}
+        self._max_nights: Dict[int, int] = {}
+        self._by_booking: Dict[int, Tuple[int, date, date]] = {}
+        self._loaded_at: Optional[float] = None
+
+    # ---------------------------------------------------------
+    # Loading
+    # ---------------------------------------------------------
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_fresh(self) -> bool:
+        """True if the index is loaded and younger than its TTL."""
+        if self._loaded_at is None:
+            return False
+        if not self.ttl_seconds:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def load(self, db: Session) -> int:
+        """Rebuild the index from the active bookings in the database. Returns the stay count."""
+        # Read from the primary even inside a GET: the index outlives the request,
+        # so a lagging replica would hide fresh stays from every later search
+        with replica_reads(False):
+            rows = db.query(
+                models.Booking.booking_id,
+                models.Booking.room_id,
+                models.Booking.check_in_date,
+                models.Booking.check_out_date,
+            ).filter(models.Booking.status.in_(ACTIVE_STATUSES)).all()
+
+        stays: Dict[int, List[Tuple[date, date, int]]] = {}
+        max_nights: Dict[int, int] = {}
+        by_booking: Dict[int, Tuple[int, date, date]] = {}
+        for booking_id, room_id, check_in, check_out in rows:
+            stays.setdefault(room_id, []).append((check_in, check_out, booking_id))
+            max_nights[room_id] = max(max_nights.get(room_id, 0), (check_out - check_in).days)
+            by_booking[booking_id] = (room_id, check_in, check_out)
+        for room_stays in stays.values():
+            room_stays.sort()
+
+        with self._lock:
+            self._stays = stays
+            self._max_nights = max_nights
+            self._by_booking = by_booking
+            self._loaded_at = time.monotonic()
+        return len(by_booking)
+
+    def clear(self):
+        with self._lock:
+            self._stays = {}
+            self._max_nights = {}
+            self._by_booking = {}
+            self._loaded_at = None
+
+    # ---------------------------------------------------------
+    # Incremental maintenance
+    # ---------------------------------------------------------
+    def add(self, booking_id: int, room_id: int, check_in: date, check_out: date):
+        with self._lock:
+            self.remove(booking_id)
+            insort(self._stays.setdefault(room_id, []), (check_in, check_out, booking_id))
+            self._max_nights[room_id] = max(self._max_nights.get(room_id, 0), (check_out - check_in).days)
+            self._by_booking[booking_id] = (room_id, check_in, check_out)
+
+    def remove(self, booking_id: int):
+        with self._lock:
+            entry = self._by_booking.pop(booking_id, None)
+            if entry is None:
+                return
+            room_id, check_in, check_out = entry
+            room_stays = self._stays.get(room_id, [])
+            pos = bisect_left(room_stays, (check_in, check_out, booking_id))
+            if pos < len(room_stays) and room_stays[pos][2] == booking_id:
+                del room_stays[pos]
+
+    def sync(self, booking: models.Booking):
+        """Bring the index in line with a freshly committed booking row."""
+        if booking.status in ACTIVE_STATUSES:
+            self.add(booking.booking_id, booking.room_id, booking.check_in_date, booking.check_out_date)
+        else:
+            self.remove(booking.booking_id)
+
+    # ---------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------
+    def is_free(self, room_id: int, check_in: date, check_out: date) -> bool:
+        """True if no active stay in the room overlaps [check_in, check_out)."""
+        with self._lock:
+            room_stays = self._stays.get(room_id)
+            if not room_stays:
+                return True
+            max_nights = self._max_nights.get(room_id, 0)
+            # Only stays starting before check_out can overlap; walk back from there
+            # until a stay is too early to reach check_in even at the longest length.
+            pos = bisect_left(room_stays, (check_out,))
+            for i in range(pos - 1, -1, -1):
+                start, end, _ = room_stays[i]
+                if end > check_in:
+                    return False
+                if (check_in - start).days >= max_nights:
+                    break
+            return True
+
+    def booked_rooms(self, room_ids: Iterable[int], check_in: date, check_out: date) -> Set[int]:
+        return {room_id for room_id in room_ids if not self.is_free(room_id, check_in, check_out)}
+
+
+# ---------------------------------------------------------
+# Availability calendar
+# ---------------------------------------------------------
+def occupancy_matrix(db: Session, hotel_id: int, start: date, nights: int, room_type: Optional[str] = None):
+    """
+    Build a rooms x nights occupancy matrix for a hotel in one pass over the bookings.
+
+    Returns (rooms, matrix) where matrix[i, j] is 1 when rooms[i] has an active
+    stay covering night start + j.
+    """
+    import numpy as np  # deferred: only calendar requests need it, not every worker boot
+
+    end = start + timedelta(days=nights)
+    room_query = db.query(models.Room).filter(models.Room.hotel_id == hotel_id)
+    if room_type:
+        room_query = room_query.filter(models.Room.room_type == room_type)
+    rooms = room_query.order_by(models.Room.room_id).all()
+    if not rooms:
+        return rooms, np.zeros((0, nights), dtype=np.uint8)
+
+    row_of = {room.room_id: row for row, room in enumerate(rooms)}
+    stays = db.query(
+        models.Booking.room_id,
+        models.Booking.check_in_date,
+        models.Booking.check_out_date,
+    ).filter(
+        and_(
+            models.Booking.room_id.in_(list(row_of)),
+            models.Booking.status.in_(ACTIVE_STATUSES),
+            models.Booking.check_in_date < end,
+            models.Booking.check_out_date > start,
+        )
+    ).all()
+
+    # Mark +1 at each clipped check-in and -1 at each clipped check-out, then a
+    # running sum along the nights axis gives the number of stays per night.
+    deltas = np.zeros((len(rooms), nights + 1), dtype=np.int32)
+    if stays:
+        rows = np.fromiter((row_of[s.room_id] for s in stays), dtype=np.intp, count=len(stays))
+        first = np.fromiter((max((s.check_in_date - start).days, 0) for s in stays), dtype=np.intp, count=len(stays))
+        last = np.fromiter((min((s.check_out_date - start).days, nights) for s in stays), dtype=np.intp, count=len(stays))
+        np.add.at(deltas, (rows, first), 1)
+        np.add.at(deltas, (rows, last), -1)
+    matrix = (np.cumsum(deltas[:, :nights], axis=1) > 0).astype(np.uint8)
+    return rooms, matrix
+
+
+def pack_bits(matrix: "np.ndarray") -> bytes:
+    """Pack each room row into bytes (most significant bit = first night)."""
+    import numpy as np
+    return np.packbits(matrix, axis=1).tobytes()
+
+
+def booked_spans(matrix: "np.ndarray") -> List[List[Tuple[int, int]]]:
+    """Run-length encode each room row as [(first_night_offset, length), ...] of booked nights."""
+    import numpy as np
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+
+    spans: List[List[Tuple[int, int]]] = [[] for _ in range(matrix.shape[0])]
+    for row, first, stop in zip(start_rows.tolist(), start_cols.tolist(), end_cols.tolist()):
+        spans[row].append((first, stop - first))
+    return spans
+
+
+index = AvailabilityIndex(ttl_seconds=settings.AVAILABILITY_INDEX_TTL)
@@ -0,0 +1,145 @@
+"""
+async_concurrency.py — Requests/second of the sync API vs the opt-in async API mode.
+
+Seeds a throwaway SQLite database, then for each mode starts `uvicorn main:app`
+against it (sync: threadpool handlers on the sqlite driver; async:
+ASYNC_API=true on aiosqlite) and drives a read-heavy request mix at each
+concurrency level with httpx.
+
+Needs uvicorn, httpx and aiosqlite installed. Pass --url/--async-url to run
+against a scratch MySQL database instead (e.g. mysql+pymysql://... and
+mysql+aiomysql://...); it must already have the schema.
+
+Usage:
+    python benchmarks/async_concurrency.py
+    python benchmarks/async_concurrency.py --levels 50 100 250 500 --requests 3000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud, models
+
+HOTELS, ROOMS_PER_HOTEL, GUESTS = 5, 40, 2000
+
+
+def seed(url: str):
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        for h in range(HOTELS):
+            db.add(models.Hotel(name=f"Bench Hotel {h}", city="Delhi"))
+        db.commit()
+        crud.create_rooms_bulk(db, [
+            {"hotel_id": h + 1, "room_number": str(100 + r), "room_type": "Standard", "price_per_night": 100}
+            for h in range(HOTELS) for r in range(ROOMS_PER_HOTEL)
+        ])
+        crud.create_guests_bulk(db, [{"name": f"Guest {g}", "email": f"g{g}@bench.example.com"} for g in range(GUESTS)])
+        start = date.today() + timedelta(days=1)
+        crud.create_bookings_bulk(db, [
+            {
+                "guest_id": random.randint(1, GUESTS),
+                "room_id": room_id,
+                "check_in_date": start + timedelta(days=week * 7),
+                "check_out_date": start + timedelta(days=week * 7 + 3),
+            }
+            for room_id in range(1, HOTELS * ROOMS_PER_HOTEL + 1) for week in range(10)
+        ])
+    engine.dispose()
+
+
+def request_path() -> str:
+    choice = random.random()
+    if choice < 0.4:
+        check_in = date.today() + timedelta(days=random.randint(1, 60))
+        return (f"/hotels/{random.randint(1, HOTELS)}/available-rooms"
+                f"?check_in={check_in}&check_out={check_in + timedelta(days=2)}")
+    if choice < 0.8:
+        return f"/guests/{random.randint(1, GUESTS)}"
+    return f"/hotels/{random.randint(1, HOTELS)}"
+
+
+async def drive(base_url: str, concurrency: int, total: int) -> float:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        remaining = iter(range(total))
+
+        async def client_loop():
+            for _ in remaining:
+                response = await client.get(request_path())
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_mode(mode: str, env: dict, levels, total: int):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.2)
+        results = []
+        for concurrency in levels:
+            rps = asyncio.run(drive(base_url, concurrency, total))
+            results.append((mode, concurrency, rps))
+            print(f"{mode:<6}{concurrency:>12}{rps:>14.0f}", flush=True)
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--url", help="sync SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--async-url", help="async SQLAlchemy URL matching --url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        url = args.url or f"sqlite:///{path}"
+        async_url = args.async_url or f"sqlite+aiosqlite:///{path}"
+        if not args.url:
+            seed(url)
+
+        base_env = dict(os.environ, DB_URL=url, DB_ASYNC_URL=async_url, DEBUG="false")
+        print(f"{'mode':<6}{'concurrency':>12}{'requests/s':>14}")
+        run_mode("sync", dict(base_env, ASYNC_API="false"), args.levels, args.requests)
+        run_mode("async", dict(base_env, ASYNC_API="true"), args.levels, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+booking_contention.py — Booking throughput and conflict rate on contended rooms.
+
+Seeds a throwaway SQLite database with a few hot rooms, then has many threads
+book random short stays in them at once through crud.create_booking. Reports
+attempts/s, successful bookings/s, the share rejected with BookingConflict,
+other errors, and the overlapping active stays left in the table, which must
+be 0.
+`--unchecked` runs the same load through a plain insert (the old
+create_booking) for comparison.
+
+Pass --url to run against a scratch MySQL database instead
+(mysql+pymysql://...); it must already have the schema, one guest and the
+rooms 1..--rooms, and its bookings are deleted first.
+
+Usage:
+    python benchmarks/booking_contention.py
+    python benchmarks/booking_contention.py --threads 64 --attempts 4000 --rooms 2 --unchecked
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import aliased, sessionmaker
+
+import availability
+import crud, models, schemas
+
+WINDOW_DAYS = 60
+
+
+def seed(engine, rooms: int):
+    models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Hotel(name="Bench Hotel", city="Delhi"))
+        db.add(models.Guest(name="Bench Guest", email="bench@bench.example.com"))
+        db.commit()
+        crud.create_rooms_bulk(db, [
+            {"hotel_id": 1, "room_number": str(100 + r), "room_type": "Standard", "price_per_night": 100}
+            for r in range(rooms)
+        ])
+
+
+def unchecked_booking(db, booking: schemas.BookingCreate):
+    """The insert-only path create_booking used before the overlap check"""
+    db_booking = models.Booking(**booking.model_dump())
+    db.add(db_booking)
+    db.commit()
+    return db_booking
+
+
+def overlaps(engine) -> int:
+    """Pairs of active stays in the same room with overlapping dates"""
+    a, b = aliased(models.Booking), aliased(models.Booking)
+    stmt = select(func.count()).select_from(a).join(b, a.room_id == b.room_id).where(
+        a.booking_id < b.booking_id,
+        a.status.in_(availability.ACTIVE_STATUSES),
+        b.status.in_(availability.ACTIVE_STATUSES),
+        a.check_in_date < b.check_out_date,
+        a.check_out_date > b.check_in_date,
+    )
+    with engine.connect() as conn:
+        return conn.execute(stmt).scalar()
+
+
+def run(engine, book, threads: int, attempts: int, rooms: int):
+    Session = sessionmaker(bind=engine)
+    start = date.today() + timedelta(days=1)
+    counts = {"booked": 0, "conflict": 0, "error": 0}
+    lock = threading.Lock()
+    remaining = iter(range(attempts))
+
+    def worker():
+        rng = random.Random()
+        for _ in remaining:
+            check_in = start + timedelta(days=rng.randrange(WINDOW_DAYS))
+            booking = schemas.BookingCreate(
+                guest_id=1,
+                room_id=rng.randint(1, rooms),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=rng.randint(1, 4)),
+            )
+            with Session() as db:
+                try:
+                    book(db, booking)
+                    outcome = "booked"
+                except crud.BookingConflict:
+                    outcome = "conflict"
+                except Exception:
+                    outcome = "error"
+            with lock:
+                counts[outcome] += 1
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return counts, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=2000, help="booking attempts in total")
+    parser.add_argument("--rooms", type=int, default=4, help="hot rooms all threads compete for")
+    parser.add_argument("--url", help="SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--unchecked", action="store_true", help="also run the insert-only path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        options = {} if args.url else {"connect_args": {"check_same_thread": False, "timeout": 60}}
+        engine = create_engine(url, pool_size=args.threads, max_overflow=0, **options)
+        if not args.url:
+            seed(engine, args.rooms)
+
+        modes = [("checked", crud.create_booking)]
+        if args.unchecked:
+            modes.append(("unchecked", unchecked_booking))
+        print(f"{'mode':<10}{'attempts/s':>12}{'bookings/s':>12}{'booked':>8}{'conflict %':>12}{'errors':>8}{'overlaps':>10}")
+        for mode, book in modes:
+            with engine.begin() as conn:
+                conn.execute(delete(models.Booking.__table__))
+            availability.index.clear()
+            counts, elapsed = run(engine, book, args.threads, args.attempts, args.rooms)
+            print(
+                f"{mode:<10}{args.attempts / elapsed:>12.0f}{counts['booked'] / elapsed:>12.0f}{counts['booked']:>8}"
+                f"{counts['conflict'] * 100 / args.attempts:>12.1f}{counts['error']:>8}{overlaps(engine):>10}",
+                flush=True,
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
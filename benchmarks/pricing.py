@@ -0,0 +1,143 @@
+"""
+pricing.py — Quote latency of the rate calendar against a query per night.
+
+Seeds a throwaway SQLite database with one hotel of 50 rooms in 5 room types,
+each with a year of seasonal, weekend and promotional rate plans, then prices
+a 14-night stay in every room:
+  - calendar: pricing.calendar.quote() with the hotel's calendar loaded
+  - arrays:   just the prefix-sum lookups (HotelRates.stay_cents)
+  - cold:     quote() right after a rate edit invalidated the calendar
+  - per-night: one rate plan query per room and night
+All four must agree.
+
+Usage:
+    python benchmarks/pricing.py
+    python benchmarks/pricing.py --rooms 200 --nights 28 --repeat 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import models
+import pricing
+
+ROOM_TYPES = ("Standard", "Deluxe", "Suite", "Family", "Single")
+
+
+def seed(engine, rooms: int, start: date):
+    models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Hotel(name="Bench Hotel", city="Delhi"))
+        db.flush()
+        for r in range(rooms):
+            db.add(models.Room(
+                hotel_id=1, room_number=str(100 + r), room_type=ROOM_TYPES[r % len(ROOM_TYPES)],
+                price_per_night=Decimal(80 + 10 * (r % 7)),
+            ))
+        for t, room_type in enumerate(ROOM_TYPES):
+            base = 100 + 40 * t
+            for month in range(12):
+                season_start = start + timedelta(days=30 * month)
+                db.add(models.RatePlan(
+                    hotel_id=1, room_type=room_type, name=f"Season {month}",
+                    start_date=season_start, end_date=season_start + timedelta(days=30),
+                    price_per_night=Decimal(base + 15 * (month % 4)),
+                ))
+            db.add(models.RatePlan(
+                hotel_id=1, room_type=room_type, name="Weekend", start_date=start,
+                end_date=start + timedelta(days=360), price_per_night=Decimal(base + 60),
+                days_of_week=pricing.WEEKENDS, priority=1,
+            ))
+            db.add(models.RatePlan(
+                hotel_id=1, room_type=room_type, name="Promo", start_date=start + timedelta(days=10),
+                end_date=start + timedelta(days=20), price_per_night=Decimal(base - 30), priority=2,
+            ))
+        db.commit()
+
+
+def per_night(db, rooms, check_in: date, check_out: date):
+    """One query per room and night: the highest priority plan covering it, else the room price"""
+    plan = models.RatePlan.__table__
+    totals = []
+    for room in rooms:
+        total = Decimal("0.00")
+        night = check_in
+        while night < check_out:
+            rows = db.execute(select(plan.c.price_per_night, plan.c.days_of_week).where(
+                plan.c.hotel_id == room.hotel_id,
+                plan.c.room_type == room.room_type,
+                plan.c.start_date <= night,
+                plan.c.end_date > night,
+            ).order_by(plan.c.priority.desc(), plan.c.rate_plan_id.desc())).all()
+            rate = next((p.price_per_night for p in rows if p.days_of_week >> night.weekday() & 1), room.price_per_night)
+            total += rate
+            night += timedelta(days=1)
+        totals.append(total)
+    return totals
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--nights", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=2000, help="quotes per timing")
+    args = parser.parse_args()
+
+    start = date.today()
+    check_in = start + timedelta(days=5)
+    check_out = check_in + timedelta(days=args.nights)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(engine, args.rooms, start)
+        with sessionmaker(bind=engine)() as db:
+            rooms = db.query(models.Room).all()
+            calendar = pricing.RateCalendar()
+
+            expected = per_night(db, rooms, check_in, check_out)
+            assert calendar.quote(db, rooms, check_in, check_out) == expected
+
+            rates = calendar.hotel(db, 1, check_in, check_out)
+            rows = rates.rows(room.room_type for room in rooms)
+            base = pricing.cents(room.price_per_night for room in rooms)
+            first, stop = (check_in - rates.origin).days, (check_out - rates.origin).days
+            assert [pricing.to_decimal(c) for c in rates.stay_cents(rows, base, first, stop)] == expected
+
+            def cold():
+                calendar.invalidate(1)
+                calendar.quote(db, rooms, check_in, check_out)
+
+            results = [
+                ("calendar", timed(lambda: calendar.quote(db, rooms, check_in, check_out), args.repeat)),
+                ("arrays", timed(lambda: rates.stay_cents(rows, base, first, stop), args.repeat)),
+                ("cold", timed(cold, max(args.repeat // 100, 5))),
+                ("per-night", timed(lambda: per_night(db, rooms, check_in, check_out), 3)),
+            ]
+        engine.dispose()
+
+    print(f"{args.rooms} rooms x {args.nights} nights")
+    print(f"{'method':<12}{'per quote':>14}")
+    for name, seconds in results:
+        print(f"{name:<12}{seconds * 1e6:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+bulk.py — Multi-row insert helpers for the bulk ingestion endpoints.
+
+Rows are written with one executemany per table, which SQLAlchemy folds into
+multi-row INSERT ... VALUES statements, inside the caller's transaction.
+Generated primary keys come back through RETURNING where the backend supports
+it (SQLite, MariaDB, PostgreSQL); on MySQL they are recovered by looking the
+rows up again by a natural key.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+LOOKUP_CHUNK = 1000
+
+
+def chunked(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def insert_rows(db: Session, model, rows: List[Dict], natural_key: Sequence[str]) -> List[int]:
+    """
+    Insert `rows` (column dicts) into `model`'s table and return their new
+    primary keys in input order. Does not commit.
+
+    `natural_key` names columns that identify a row when RETURNING is not
+    available; rows whose key is incomplete or repeated within the batch are
+    inserted one statement at a time on that path.
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    pk = list(table.primary_key.columns)[0]
+    dialect = db.get_bind().dialect
+
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.execute(insert(table).returning(pk, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+
+    def key_of(row: Dict) -> Tuple:
+        return tuple(row.get(col) for col in natural_key)
+
+    key_counts: Dict[Tuple, int] = {}
+    for row in rows:
+        key = key_of(row)
+        key_counts[key] = key_counts.get(key, 0) + 1
+
+    def is_keyed(row: Dict) -> bool:
+        key = key_of(row)
+        return None not in key and key_counts[key] == 1
+
+    keyed = [row for row in rows if is_keyed(row)]
+    ids_by_key: Dict[Tuple, int] = {}
+    if keyed:
+        floor = db.execute(select(func.max(pk))).scalar() or 0
+        db.execute(insert(table), keyed)
+        key_cols = [table.c[col] for col in natural_key]
+        for chunk in chunked(keyed, LOOKUP_CHUNK):
+            found = db.execute(
+                select(pk, *key_cols).where(pk > floor, tuple_(*key_cols).in_([key_of(row) for row in chunk]))
+            )
+            for new_id, *key in found:
+                ids_by_key[tuple(key)] = new_id
+
+    ids = []
+    for row in rows:
+        if is_keyed(row):
+            ids.append(ids_by_key[key_of(row)])
+        else:
+            ids.append(db.execute(insert(table), row).inserted_primary_key[0])
+    return ids
+
+
+def existing_keys(db: Session, columns: Sequence, keys: Iterable[Tuple]) -> set:
+    """Which of `keys` (tuples over `columns`) already exist, looked up in chunks."""
+    keys = list(set(keys))
+    found = set()
+    for chunk in chunked(keys, LOOKUP_CHUNK):
+        if len(columns) == 1:
+            rows = db.execute(select(columns[0]).where(columns[0].in_([key[0] for key in chunk])))
+        else:
+            rows = db.execute(select(*columns).where(tuple_(*columns).in_(chunk)))
+        found.update(tuple(row) for row in rows)
+    return found
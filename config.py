@@ -6,6 +6,7 @@ Author: Shivam Gupta
 from pydantic_settings import BaseSettings
 from urllib.parse import quote_plus
 from pathlib import Path
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -21,6 +22,27 @@ class Settings(BaseSettings):
     DB_USER: str = "root"
     DB_PASSWORD: str = ""  # ⚠️ Set in .env or use environment variable
     DB_NAME: str = "hotel_management_system"
+    DB_URL: Optional[str] = None  # full SQLAlchemy URL overriding the DB_* parts (e.g. sqlite:///local.db)
+    DB_ASYNC_URL: Optional[str] = None  # same for the async engine (e.g. sqlite+aiosqlite:///local.db)
+    DB_SCHEMA_CHECK: bool = False  # create missing tables once at API startup
+
+    # =============================
+    # Read Replica
+    # =============================
+    DB_REPLICA_HOST: Optional[str] = None  # MySQL replica for GET requests (same user / password / database)
+    DB_REPLICA_PORT: int = 3306
+    DB_REPLICA_URL: Optional[str] = None  # full SQLAlchemy URL overriding the DB_REPLICA_* parts
+    DB_REPLICA_ASYNC_URL: Optional[str] = None  # same for the async engine
+    READ_YOUR_WRITES_SECONDS: int = 5  # after a write, the client reads from the primary this long
+
+    # =============================
+    # Connection Pool
+    # =============================
+    DB_POOL_SIZE: int = 10  # connections kept open (and pre-warmed)
+    DB_MAX_OVERFLOW: int = 20  # extra connections allowed under burst load
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # seconds before a connection is replaced
+    DB_WARM_POOL: bool = True  # the dashboard opens DB_POOL_SIZE connections when it starts serving
 
     # =============================
     # Flask App Settings
@@ -28,6 +50,80 @@ class Settings(BaseSettings):
     API_TITLE: str = "Hotel Management System API"
     API_VERSION: str = "1.0.0"
     DEBUG: bool = True
+    ASYNC_API: bool = False  # serve the read and booking endpoints from async handlers
+
+    # =============================
+    # Availability Index
+    # =============================
+    AVAILABILITY_INDEX_ENABLED: bool = True
+    AVAILABILITY_INDEX_TTL: int = 300  # seconds before a full reload from the database
+    AVAILABILITY_VERIFY: bool = False  # cross-check every index answer against SQL
+
+    # =============================
+    # Rate Calendar
+    # =============================
+    RATE_CALENDAR_DAYS: int = 730  # nights after today kept in each hotel's cached rate calendar
+    RATE_CALENDAR_PAST_DAYS: int = 365  # and before today, for repricing past stays
+    RATE_CALENDAR_TTL: int = 300  # seconds; bounds staleness from rate edits made by other processes
+
+    # =============================
+    # Pagination
+    # =============================
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+
+    # =============================
+    # Bulk Ingestion
+    # =============================
+    BULK_MAX_ROWS: int = 10000  # rows accepted per bulk request
+
+    # =============================
+    # Guest Search
+    # =============================
+    GUEST_SEARCH_NGRAM_SIZE: int = 2  # must match MySQL's ngram_token_size
+    GUEST_SEARCH_MAX_LIMIT: int = 100
+
+    # =============================
+    # Dashboard
+    # =============================
+    DASHBOARD_CACHE_TTL: int = 10  # seconds a dashboard stats snapshot is reused
+
+    # =============================
+    # HTTP Response Cache
+    # =============================
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_TTL: int = 300  # seconds; bounds staleness from writes made by other processes
+    HTTP_CACHE_MAX_ENTRIES: int = 2048
+
+    # =============================
+    # Metrics
+    # =============================
+    METRICS_ENABLED: bool = True  # request / query / pool metrics at /metrics
+
+    # =============================
+    # Migrations
+    # =============================
+    MIGRATION_LOCK_WAIT_TIMEOUT: int = 5  # seconds a migration waits for a table's metadata lock
+
+    # =============================
+    # Slow Query Log
+    # =============================
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200  # statements at least this slow are logged
+    SLOW_QUERY_EXPLAIN: bool = True  # EXPLAIN the first slow occurrence of each normalized statement
+    SLOW_QUERY_LOG_SIZE: int = 500  # entries kept in the ring buffer
+    ADMIN_API_TOKEN: Optional[str] = None  # bearer token for the API's /admin endpoints; unset disables them
+
+    # =============================
+    # Reports
+    # =============================
+    REPORT_MAX_DAYS: int = 3660  # longest date range a performance report may cover
+
+    # =============================
+    # Exports
+    # =============================
+    EXPORT_CHUNK_ROWS: int = 2000  # rows fetched from the server-side cursor per chunk
+    EXPORT_NET_WRITE_TIMEOUT: int = 600  # seconds MySQL waits on a slow export client
 
     # =============================
     # Paths and Files
@@ -44,10 +140,40 @@ class Settings(BaseSettings):
         Builds a safe SQLAlchemy-compatible MySQL connection string.
         Handles special characters in passwords using urllib.parse.quote_plus().
         """
+        if self.DB_URL:
+            return self.DB_URL
+        return self._mysql_url("pymysql")
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Connection string for the async engine (aiomysql driver)."""
+        if self.DB_ASYNC_URL:
+            return self.DB_ASYNC_URL
+        return self._mysql_url("aiomysql")
+
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        """Connection string for the read replica, or None when reads stay on the primary."""
+        if self.DB_REPLICA_URL:
+            return self.DB_REPLICA_URL
+        if self.DB_REPLICA_HOST:
+            return self._mysql_url("pymysql", self.DB_REPLICA_HOST, self.DB_REPLICA_PORT)
+        return None
+
+    @property
+    def ASYNC_REPLICA_DATABASE_URL(self) -> Optional[str]:
+        """Read replica for the async engine (aiomysql driver)."""
+        if self.DB_REPLICA_ASYNC_URL:
+            return self.DB_REPLICA_ASYNC_URL
+        if self.DB_REPLICA_HOST:
+            return self._mysql_url("aiomysql", self.DB_REPLICA_HOST, self.DB_REPLICA_PORT)
+        return None
+
+    def _mysql_url(self, driver: str, host: Optional[str] = None, port: Optional[int] = None) -> str:
         encoded_password = quote_plus(self.DB_PASSWORD or "")
         return (
-            f"mysql+pymysql://{self.DB_USER}:{encoded_password}"
-            f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+            f"mysql+{driver}://{self.DB_USER}:{encoded_password}"
+            f"@{host or self.DB_HOST}:{port or self.DB_PORT}/{self.DB_NAME}"
         )
 
     class Config:
@@ -59,8 +185,3 @@ class Settings(BaseSettings):
 # Instantiate Global Settings
 # =============================
 settings = Settings()
-
-# Optional: Debug log (only if DEBUG is True)
-if settings.DEBUG:
-    print(f"✅ Loaded configuration for database: {settings.DB_NAME}")
-    print(f"🔗 Connection URL: {settings.DATABASE_URL}")
@@ -1,8 +1,20 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, case, func, insert, select, type_coerce, update
+from sqlalchemy.dialects.mysql import match
+from pydantic import ValidationError
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import date
+from decimal import Decimal
+import time
 import models, schemas
+import availability
+import pricing
+import revenue
+import bulk
+import http_cache
+from pagination import keyset_page
+from config import settings
+from database.queries import invalidate_dashboard_cache
 
 
 # ============= HOTEL CRUD =============
@@ -11,13 +23,15 @@ def create_hotel(db: Session, hotel: schemas.HotelCreate):
     db.add(db_hotel)
     db.commit()
     db.refresh(db_hotel)
+    http_cache.invalidate(http_cache.HOTELS)
     return db_hotel
 
 def get_hotel(db: Session, hotel_id: int):
     return db.query(models.Hotel).filter(models.Hotel.hotel_id == hotel_id).first()
 
-def get_hotels(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Hotel).offset(skip).limit(limit).all()
+def get_hotels(db: Session, limit: int = 100, cursor: Optional[str] = None):
+    """One keyset page of hotels by hotel_id; returns (hotels, next_cursor)"""
+    return keyset_page(db.query(models.Hotel), [models.Hotel.hotel_id], limit, cursor)
 
 def update_hotel(db: Session, hotel_id: int, hotel: schemas.HotelCreate):
     db_hotel = get_hotel(db, hotel_id)
@@ -26,6 +40,7 @@ def update_hotel(db: Session, hotel_id: int, hotel: schemas.HotelCreate):
             setattr(db_hotel, key, value)
         db.commit()
         db.refresh(db_hotel)
+        http_cache.invalidate(http_cache.HOTELS)
     return db_hotel
 
 def delete_hotel(db: Session, hotel_id: int):
@@ -33,6 +48,8 @@ def delete_hotel(db: Session, hotel_id: int):
     if db_hotel:
         db.delete(db_hotel)
         db.commit()
+        # Employees and rooms go with the hotel (ON DELETE CASCADE)
+        http_cache.invalidate(http_cache.HOTELS, http_cache.EMPLOYEES, http_cache.ROOMS)
         return True
     return False
 
@@ -43,13 +60,16 @@ def create_employee(db: Session, employee: schemas.EmployeeCreate):
     db.add(db_emp)
     db.commit()
     db.refresh(db_emp)
+    http_cache.invalidate(http_cache.EMPLOYEES)
     return db_emp
 
 def get_employee(db: Session, emp_id: int):
     return db.query(models.Employee).filter(models.Employee.emp_id == emp_id).first()
 
-def get_employees_by_hotel(db: Session, hotel_id: int):
-    return db.query(models.Employee).filter(models.Employee.hotel_id == hotel_id).all()
+def get_employees_by_hotel(db: Session, hotel_id: int, limit: int = 100, cursor: Optional[str] = None):
+    """One keyset page of a hotel's employees by emp_id; returns (employees, next_cursor)"""
+    query = db.query(models.Employee).filter(models.Employee.hotel_id == hotel_id)
+    return keyset_page(query, [models.Employee.emp_id], limit, cursor)
 
 
 # ============= ROOM CRUD =============
@@ -58,13 +78,42 @@ def create_room(db: Session, room: schemas.RoomCreate):
     db.add(db_room)
     db.commit()
     db.refresh(db_room)
+    http_cache.invalidate(http_cache.ROOMS)
     return db_room
 
 def get_room(db: Session, room_id: int):
     return db.query(models.Room).filter(models.Room.room_id == room_id).first()
 
 def get_available_rooms(db: Session, hotel_id: int, check_in: date, check_out: date):
-    """Get rooms available for given dates"""
+    """Get rooms available for given dates, answered from the in-memory availability index"""
+    index = availability.index
+    if not settings.AVAILABILITY_INDEX_ENABLED:
+        return get_available_rooms_sql(db, hotel_id, check_in, check_out)
+    if not index.is_fresh():
+        try:
+            index.load(db)
+        except Exception as e:
+            print("❌ Availability index reload failed, using SQL:", e)
+            return get_available_rooms_sql(db, hotel_id, check_in, check_out)
+
+    rooms = db.query(models.Room).filter(
+        and_(
+            models.Room.hotel_id == hotel_id,
+            models.Room.status == models.RoomStatus.AVAILABLE
+        )
+    ).all()
+    available = [room for room in rooms if index.is_free(room.room_id, check_in, check_out)]
+
+    if settings.AVAILABILITY_VERIFY:
+        expected = get_available_rooms_sql(db, hotel_id, check_in, check_out)
+        if {r.room_id for r in expected} != {r.room_id for r in available}:
+            print(f"❌ Availability index drift for hotel {hotel_id}, reloading")
+            index.load(db)
+            return expected
+    return available
+
+def get_available_rooms_sql(db: Session, hotel_id: int, check_in: date, check_out: date):
+    """Get rooms available for given dates by scanning bookings (fallback and verifier)"""
     booked_rooms = db.query(models.Booking.room_id).filter(
         and_(
             models.Booking.status.in_(['Confirmed', 'Checked-In']),
@@ -74,7 +123,7 @@ def get_available_rooms(db: Session, hotel_id: int, check_in: date, check_out: d
                 and_(models.Booking.check_in_date >= check_in, models.Booking.check_out_date <= check_out)
             )
         )
-    ).subquery()
+    ).scalar_subquery()
     
     return db.query(models.Room).filter(
         and_(
@@ -84,6 +133,72 @@ def get_available_rooms(db: Session, hotel_id: int, check_in: date, check_out: d
         )
     ).all()
 
+def get_availability_calendar(db: Session, hotel_id: int, start_date: date, nights: int, room_type: Optional[str] = None):
+    """Rooms of a hotel and their rooms x nights occupancy matrix (1 = booked)"""
+    return availability.occupancy_matrix(db, hotel_id, start_date, nights, room_type)
+
+
+# ============= RATE PLAN CRUD =============
+def create_rate_plan(db: Session, rate_plan: schemas.RatePlanCreate):
+    db_plan = models.RatePlan(**rate_plan.model_dump())
+    db.add(db_plan)
+    db.commit()
+    db.refresh(db_plan)
+    pricing.calendar.invalidate(db_plan.hotel_id)
+    return db_plan
+
+def get_rate_plan(db: Session, rate_plan_id: int):
+    return db.query(models.RatePlan).filter(models.RatePlan.rate_plan_id == rate_plan_id).first()
+
+def get_rate_plans(db: Session, hotel_id: int, room_type: Optional[str] = None, limit: int = 100,
+                   cursor: Optional[str] = None):
+    """One keyset page of a hotel's rate plans by (start_date, rate_plan_id); returns (plans, next_cursor)"""
+    query = db.query(models.RatePlan).filter(models.RatePlan.hotel_id == hotel_id)
+    if room_type is not None:
+        query = query.filter(models.RatePlan.room_type == room_type)
+    return keyset_page(query, [models.RatePlan.start_date, models.RatePlan.rate_plan_id], limit, cursor)
+
+def update_rate_plan(db: Session, rate_plan_id: int, rate_plan: schemas.RatePlanCreate):
+    """Replace a rate plan. Existing booking totals keep their price until recalculated."""
+    db_plan = get_rate_plan(db, rate_plan_id)
+    if db_plan:
+        old_hotel_id = db_plan.hotel_id
+        for key, value in rate_plan.model_dump().items():
+            setattr(db_plan, key, value)
+        db.commit()
+        db.refresh(db_plan)
+        pricing.calendar.invalidate(old_hotel_id)
+        pricing.calendar.invalidate(db_plan.hotel_id)
+    return db_plan
+
+def delete_rate_plan(db: Session, rate_plan_id: int):
+    db_plan = get_rate_plan(db, rate_plan_id)
+    if db_plan:
+        hotel_id = db_plan.hotel_id
+        db.delete(db_plan)
+        db.commit()
+        pricing.calendar.invalidate(hotel_id)
+        return True
+    return False
+
+def quote_rooms(db: Session, hotel_id: int, check_in: date, check_out: date, room_type: Optional[str] = None):
+    """The hotel's available rooms for the stay, each priced night by night from the rate calendar"""
+    rooms = get_available_rooms(db, hotel_id, check_in, check_out)
+    if room_type is not None:
+        rooms = [room for room in rooms if room.room_type == room_type]
+    nights = (check_out - check_in).days
+    return [
+        schemas.RoomQuote(
+            room_id=room.room_id,
+            room_number=room.room_number,
+            room_type=room.room_type,
+            nights=nights,
+            total=total,
+            average_nightly=(total / nights).quantize(Decimal("0.01")),
+        )
+        for room, total in zip(rooms, pricing.calendar.quote(db, rooms, check_in, check_out))
+    ]
+
 
 # ============= GUEST CRUD =============
 def create_guest(db: Session, guest: schemas.GuestCreate):
@@ -104,67 +219,244 @@ def create_guest(db: Session, guest: schemas.GuestCreate):
     db.refresh(db_guest)
     return db_guest
 
-def get_guest(db: Session, guest_id: int):
-    return db.query(models.Guest).filter(models.Guest.guest_id == guest_id).first()
+# ?expand= name -> eager loader; collections use selectinload (one extra query each)
+GUEST_EXPANSIONS = {
+    "phones": selectinload(models.Guest.phones),
+    "bookings": selectinload(models.Guest.bookings),
+}
+
+def get_guest(db: Session, guest_id: int, expand: Sequence[str] = ()):
+    query = db.query(models.Guest).options(*(GUEST_EXPANSIONS[name] for name in expand))
+    return query.filter(models.Guest.guest_id == guest_id).first()
+
+def search_guests(db: Session, search_term: str, limit: int = 20, offset: int = 0):
+    """
+    Ranked substring search over guest name and email.
+    On MySQL this uses the ngram FULLTEXT index ft_guest_search; terms shorter
+    than one n-gram fall back to an index-friendly prefix match.
+    """
+    term = search_term.strip().replace('"', '')
+    if not term:
+        return []
+
+    query = db.query(models.Guest)
+    is_mysql = db.get_bind().dialect.name == "mysql"
+    if is_mysql and len(term) >= settings.GUEST_SEARCH_NGRAM_SIZE:
+        relevance = match(models.Guest.name, models.Guest.email, against=f'"{term}"').in_boolean_mode()
+        query = query.filter(relevance).order_by(relevance.desc(), models.Guest.guest_id)
+    elif is_mysql:
+        query = query.filter(
+            or_(models.Guest.name.like(f"{term}%"), models.Guest.email.like(f"{term}%"))
+        ).order_by(models.Guest.name, models.Guest.guest_id)
+    else:
+        query = query.filter(
+            or_(models.Guest.name.contains(term, autoescape=True), models.Guest.email.contains(term, autoescape=True))
+        ).order_by(models.Guest.name, models.Guest.guest_id)
+    return query.offset(offset).limit(limit).all()
+
 
-def search_guests(db: Session, search_term: str):
-    return db.query(models.Guest).filter(
-        or_(
-            models.Guest.name.like(f"%{search_term}%"),
-            models.Guest.email.like(f"%{search_term}%")
+# ============= BOOKING CRUD =============
+class BookingConflict(Exception):
+    """The room already has an active stay overlapping the requested dates."""
+
+
+class InvalidBooking(ValueError):
+    """The requested change would leave the booking invalid (check-out not after check-in)."""
+
+
+def _lock_room(db: Session, room_id: int):
+    """
+    Row-lock the room (SELECT ... FOR UPDATE) until commit, so bookers of the
+    same room queue up and each one's overlap check sees the stays committed
+    before it. Other rooms are not blocked.
+    """
+    db.query(models.Room.room_id).filter(models.Room.room_id == room_id).with_for_update().scalar()
+
+
+def _check_overlap(db: Session, db_booking: models.Booking):
+    """
+    Raise BookingConflict if another active stay in the room overlaps the
+    (already flushed) booking. Runs after the INSERT/UPDATE, so on SQLite,
+    which ignores FOR UPDATE, the database write lock serializes it instead.
+    """
+    if db_booking.status not in availability.ACTIVE_STATUSES:
+        return
+    # A locking read sees the latest committed stays, not the transaction's snapshot
+    clash = db.query(models.Booking.booking_id).filter(
+        models.Booking.room_id == db_booking.room_id,
+        models.Booking.booking_id != db_booking.booking_id,
+        models.Booking.status.in_(availability.ACTIVE_STATUSES),
+        models.Booking.check_in_date < db_booking.check_out_date,
+        models.Booking.check_out_date > db_booking.check_in_date,
+    ).with_for_update().limit(1).scalar()
+    if clash is not None:
+        raise BookingConflict(
+            f"Room {db_booking.room_id} is already booked for part of {db_booking.check_in_date} "
+            f"to {db_booking.check_out_date} (booking {clash})"
         )
-    ).all()
 
 
-# ============= BOOKING CRUD =============
 def create_booking(db: Session, booking: schemas.BookingCreate):
+    """Insert a booking, or raise BookingConflict if the room is taken for any of its nights"""
+    _lock_room(db, booking.room_id)
     db_booking = models.Booking(**booking.model_dump())
     db.add(db_booking)
-    db.commit()
+    try:
+        db.flush()
+        _check_overlap(db, db_booking)
+        # Price the booking in the same transaction as the insert
+        _update_booking_totals(db, [db_booking.booking_id])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(db_booking)
-    
-    # Recalculate total (triggers will handle this in actual DB)
-    recalc_booking_total(db, db_booking.booking_id)
+    availability.index.sync(db_booking)
+    # trg_room_status_update rewrites room.status behind cached room responses
+    http_cache.invalidate(http_cache.ROOMS)
+    invalidate_dashboard_cache()
     return db_booking
 
-def get_booking(db: Session, booking_id: int):
-    return db.query(models.Booking).filter(models.Booking.booking_id == booking_id).first()
+# ?expand= name -> eager loader; many-to-one rides along in a JOIN, collections use selectinload
+BOOKING_EXPANSIONS = {
+    "room": joinedload(models.Booking.room),
+    "guest": joinedload(models.Booking.guest),
+    "payments": selectinload(models.Booking.payments),
+    "services": selectinload(models.Booking.service_usages).joinedload(models.ServiceUsage.service),
+}
+
+def get_booking(db: Session, booking_id: int, expand: Sequence[str] = ()):
+    query = db.query(models.Booking).options(*(BOOKING_EXPANSIONS[name] for name in expand))
+    return query.filter(models.Booking.booking_id == booking_id).first()
+
+def get_bookings_by_guest(db: Session, guest_id: int, limit: int = 100, cursor: Optional[str] = None,
+                          expand: Sequence[str] = ()):
+    """One keyset page of a guest's bookings by (check_in_date, booking_id); returns (bookings, next_cursor)"""
+    query = db.query(models.Booking).options(*(BOOKING_EXPANSIONS[name] for name in expand))
+    query = query.filter(models.Booking.guest_id == guest_id)
+    return keyset_page(query, [models.Booking.check_in_date, models.Booking.booking_id], limit, cursor)
+
+def update_booking(db: Session, booking_id: int, booking: schemas.BookingUpdate):
+    db_booking = get_booking(db, booking_id)
+    if db_booking:
+        changes = booking.model_dump(exclude_unset=True, exclude_none=True)
+        # The schema checks both dates when both are sent; a single new date is checked against the row
+        check_in = changes.get("check_in_date", db_booking.check_in_date)
+        check_out = changes.get("check_out_date", db_booking.check_out_date)
+        if check_out <= check_in:
+            raise InvalidBooking(f"check_out_date ({check_out}) must be after check_in_date ({check_in})")
+        if changes:
+            # New dates, or reactivating a cancelled stay, can clash like a new booking
+            _lock_room(db, db_booking.room_id)
+        for key, value in changes.items():
+            setattr(db_booking, key, value)
+        try:
+            if changes:
+                db.flush()
+                _check_overlap(db, db_booking)
+            if 'check_in_date' in changes or 'check_out_date' in changes:
+                _update_booking_totals(db, [booking_id])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        db.refresh(db_booking)
+        availability.index.sync(db_booking)
+        http_cache.invalidate(http_cache.ROOMS)
+        invalidate_dashboard_cache()
+    return db_booking
 
-def get_bookings_by_guest(db: Session, guest_id: int):
-    return db.query(models.Booking).filter(models.Booking.guest_id == guest_id).all()
+def _services_total_expr():
+    """SQL expression for a booking row's services total: SUM(service price * quantity)"""
+    booking = models.Booking.__table__
+    return select(
+        func.coalesce(func.sum(models.Service.price * models.ServiceUsage.quantity), 0)
+    ).select_from(models.ServiceUsage).join(
+        models.Service, models.Service.service_id == models.ServiceUsage.service_id
+    ).where(models.ServiceUsage.booking_id == booking.c.booking_id).scalar_subquery()
+
+def _stay_chunks(db: Session, booking_ids: Optional[List[int]]):
+    """
+    (booking_id, hotel_id, room_type, room price, check_in, check_out) rows
+    in chunks of LOOKUP_CHUNK; all bookings, walked by booking_id, if
+    booking_ids is None.
+    """
+    booking, room = models.Booking.__table__, models.Room.__table__
+    query = select(
+        booking.c.booking_id, room.c.hotel_id, room.c.room_type, room.c.price_per_night,
+        booking.c.check_in_date, booking.c.check_out_date,
+    ).join_from(booking, room, booking.c.room_id == room.c.room_id)
+    if booking_ids is not None:
+        for chunk in bulk.chunked(list(booking_ids), bulk.LOOKUP_CHUNK):
+            yield db.execute(query.where(booking.c.booking_id.in_(chunk))).all()
+        return
+    last = 0
+    while True:
+        stays = db.execute(
+            query.where(booking.c.booking_id > last).order_by(booking.c.booking_id).limit(bulk.LOOKUP_CHUNK)
+        ).all()
+        if not stays:
+            return
+        yield stays
+        last = stays[-1].booking_id
+
+def _update_booking_totals(db: Session, booking_ids: Optional[List[int]] = None) -> int:
+    """
+    Recompute totals without committing; all bookings if booking_ids is None.
+    Nights are priced from the rate calendar (pricing.py), matching the
+    recalc_booking_total procedure. Each chunk is one UPDATE: the room
+    charges as a CASE on booking_id, plus the services summed in SQL.
+    """
+    booking = models.Booking.__table__
+    updated = 0
+    for stays in _stay_chunks(db, booking_ids):
+        if not stays:
+            continue
+        room_totals = pricing.calendar.stay_cents(db, [stay[1:] for stay in stays])
+        room_total = case(
+            {stay.booking_id: pricing.to_decimal(total) for stay, total in zip(stays, room_totals.tolist())},
+            value=booking.c.booking_id,
+        )
+        updated += db.execute(
+            update(booking).where(booking.c.booking_id.in_([stay.booking_id for stay in stays])).values(
+                total_amount=type_coerce(room_total, booking.c.total_amount.type) + _services_total_expr()
+            )
+        ).rowcount
+    return updated
 
 def recalc_booking_total(db: Session, booking_id: int):
-    """Recalculate booking total amount"""
-    booking = get_booking(db, booking_id)
-    if not booking:
-        return
-    
-    # Calculate room total
-    days = (booking.check_out_date - booking.check_in_date).days
-    room_total = days * booking.room.price_per_night
-    
-    # Calculate services total
-    services_total = sum(
-        su.quantity * su.service.price 
-        for su in booking.service_usages
-    )
-    
-    booking.total_amount = room_total + services_total
+    """Recalculate booking total amount with one aggregate UPDATE"""
+    if not _update_booking_totals(db, [booking_id]):
+        return None
     db.commit()
-    db.refresh(booking)
-    return booking
+    return get_booking(db, booking_id)
+
+def recalc_booking_totals(db: Session, booking_ids: Optional[List[int]] = None) -> int:
+    """Recalculate totals for many bookings (or all of them) in one transaction; returns rows updated"""
+    try:
+        updated = _update_booking_totals(db, booking_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return updated
 
 
 # ============= PAYMENT CRUD =============
 def create_payment(db: Session, payment: schemas.PaymentCreate):
-    db_payment = models.Payment(**payment.model_dump())
+    db_payment = models.Payment(**payment.model_dump(exclude_none=True))
     db.add(db_payment)
+    db.flush()
+    revenue.record_payment(db, db_payment)
     db.commit()
     db.refresh(db_payment)
+    invalidate_dashboard_cache()
     return db_payment
 
-def get_payments_by_booking(db: Session, booking_id: int):
-    return db.query(models.Payment).filter(models.Payment.booking_id == booking_id).all()
+def get_payments_by_booking(db: Session, booking_id: int, limit: int = 100, cursor: Optional[str] = None):
+    """One keyset page of a booking's payments by (payment_date, payment_id); returns (payments, next_cursor)"""
+    query = db.query(models.Payment).filter(models.Payment.booking_id == booking_id)
+    return keyset_page(query, [models.Payment.payment_date, models.Payment.payment_id], limit, cursor)
 
 
 # ============= SERVICE CRUD =============
@@ -173,22 +465,258 @@ def create_service(db: Session, service: schemas.ServiceCreate):
     db.add(db_service)
     db.commit()
     db.refresh(db_service)
+    http_cache.invalidate(http_cache.SERVICES)
     return db_service
 
 def get_service(db: Session, service_id: int):
     return db.query(models.Service).filter(models.Service.service_id == service_id).first()
 
-def get_services(db: Session):
-    return db.query(models.Service).all()
+def get_services(db: Session, limit: int = 100, cursor: Optional[str] = None):
+    """One keyset page of services by service_id; returns (services, next_cursor)"""
+    return keyset_page(db.query(models.Service), [models.Service.service_id], limit, cursor)
+
+
+def update_service_price(db: Session, service_id: int, price: Decimal, dry_run: bool = False):
+    """
+    Change a service's price and shift the totals of open (Confirmed/Checked-In)
+    bookings that use it by (new - old) * quantity, in one set-based UPDATE.
+    With dry_run the same statements run and are rolled back, reporting what would change.
+    """
+    db_service = db.query(models.Service).filter(
+        models.Service.service_id == service_id
+    ).with_for_update().first()
+    if not db_service:
+        return None
+    old_price = db_service.price
+    delta = price - old_price
+
+    usage = models.ServiceUsage.__table__
+    booking = models.Booking.__table__
+    quantity = select(usage.c.quantity).where(
+        and_(usage.c.booking_id == booking.c.booking_id, usage.c.service_id == service_id)
+    ).scalar_subquery()
+    stmt = update(booking).values(total_amount=booking.c.total_amount + delta * quantity).where(
+        and_(
+            booking.c.booking_id.in_(select(usage.c.booking_id).where(usage.c.service_id == service_id)),
+            booking.c.status.in_(availability.ACTIVE_STATUSES)
+        )
+    )
+
+    started = time.perf_counter()
+    try:
+        affected = db.execute(stmt).rowcount if delta else 0
+        db_service.price = price
+        db.flush()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+            http_cache.invalidate(http_cache.SERVICES)
+    except Exception:
+        db.rollback()
+        raise
+
+    return schemas.ServicePriceUpdateResult(
+        service_id=service_id,
+        old_price=old_price,
+        new_price=price,
+        affected_bookings=affected,
+        elapsed_ms=round(elapsed_ms, 3),
+        dry_run=dry_run
+    )
 
 
 # ============= SERVICE USAGE CRUD =============
 def add_service_to_booking(db: Session, service_usage: schemas.ServiceUsageCreate):
     db_usage = models.ServiceUsage(**service_usage.model_dump())
     db.add(db_usage)
+    db.flush()
+    
+    # Recalculate booking total in the same transaction
+    _update_booking_totals(db, [service_usage.booking_id])
     db.commit()
     db.refresh(db_usage)
-    
-    # Recalculate booking total
-    recalc_booking_total(db, service_usage.booking_id)
-    return db_usage
\ No newline at end of file
+    return db_usage
+
+
+# ============= BULK INGESTION =============
+def _validate_rows(rows: List[dict], schema) -> Tuple[List[Tuple[int, object]], Dict[int, List[str]]]:
+    """Validate raw rows one by one; returns ([(index, model)], {index: [errors]})"""
+    valid, errors = [], {}
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as e:
+            errors[index] = [
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            ]
+    return valid, errors
+
+def _bulk_result(total: int, accepted_indexes: List[int], ids: List[int], errors: Dict[int, List[str]]):
+    id_by_index = dict(zip(accepted_indexes, ids))
+    return schemas.BulkResult(
+        created=len(ids),
+        ids=[id_by_index.get(index) for index in range(total)],
+        errors=[schemas.BulkRowError(index=index, errors=msgs) for index, msgs in sorted(errors.items())]
+    )
+
+def create_rooms_bulk(db: Session, rows: List[dict]):
+    """Validate and insert many rooms in one transaction; invalid rows are reported, not inserted"""
+    valid, errors = _validate_rows(rows, schemas.RoomCreate)
+    statuses = {s.value for s in models.RoomStatus}
+    known_hotels = {key[0] for key in bulk.existing_keys(db, [models.Hotel.hotel_id], [(r.hotel_id,) for _, r in valid])}
+    taken = bulk.existing_keys(
+        db, [models.Room.hotel_id, models.Room.room_number], [(r.hotel_id, r.room_number) for _, r in valid]
+    )
+
+    accepted = []
+    for index, room in valid:
+        key = (room.hotel_id, room.room_number)
+        if room.hotel_id not in known_hotels:
+            errors[index] = [f"hotel_id: hotel {room.hotel_id} does not exist"]
+        elif key in taken:
+            errors[index] = [f"room_number: {room.room_number} already exists in hotel {room.hotel_id}"]
+        elif room.status not in statuses:
+            errors[index] = [f"status: must be one of {sorted(statuses)}"]
+        else:
+            taken.add(key)
+            accepted.append((index, room.model_dump()))
+
+    try:
+        ids = bulk.insert_rows(db, models.Room, [row for _, row in accepted], natural_key=("hotel_id", "room_number"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    http_cache.invalidate(http_cache.ROOMS)
+    return _bulk_result(len(rows), [index for index, _ in accepted], ids, errors)
+
+def create_guests_bulk(db: Session, rows: List[dict]):
+    """Validate and insert many guests and their phones in one transaction; invalid rows are reported, not inserted"""
+    valid, errors = _validate_rows(rows, schemas.GuestCreate)
+    phone_types = {t.value for t in models.PhoneType}
+    taken = bulk.existing_keys(db, [models.Guest.email], [(g.email,) for _, g in valid if g.email])
+
+    accepted = []
+    for index, guest in valid:
+        phones = [p.phone for p in guest.phones]
+        if guest.email and (guest.email,) in taken:
+            errors[index] = [f"email: {guest.email} is already registered"]
+        elif len(set(phones)) != len(phones):
+            errors[index] = ["phones: duplicate phone number"]
+        elif any(p.phone_type not in phone_types for p in guest.phones):
+            errors[index] = [f"phones.phone_type: must be one of {sorted(phone_types)}"]
+        else:
+            if guest.email:
+                taken.add((guest.email,))
+            accepted.append((index, guest))
+
+    try:
+        ids = bulk.insert_rows(
+            db, models.Guest,
+            [{"name": guest.name, "email": guest.email} for _, guest in accepted],
+            natural_key=("email",)
+        )
+        phone_rows = [
+            {"guest_id": guest_id, "phone": p.phone, "phone_type": p.phone_type}
+            for guest_id, (_, guest) in zip(ids, accepted)
+            for p in guest.phones
+        ]
+        if phone_rows:
+            db.execute(insert(models.GuestPhone), phone_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return _bulk_result(len(rows), [index for index, _ in accepted], ids, errors)
+
+def _reject_bulk_overlaps(db: Session, accepted: List[Tuple[int, dict]], errors: Dict[int, List[str]]):
+    """
+    Lock the rooms of the batch's active stays, then drop (and report in
+    `errors`) each stay that overlaps an active booking already in the table
+    or an earlier stay of the batch. Returns the rows left to insert.
+    """
+    active = [(index, row) for index, row in accepted if row["status"] in availability.ACTIVE_STATUSES]
+    if not active:
+        return accepted
+    room_ids = sorted({row["room_id"] for _, row in active})
+    first = min(row["check_in_date"] for _, row in active)
+    last = max(row["check_out_date"] for _, row in active)
+
+    # Rooms locked in ascending id order, so concurrent imports queue instead of deadlocking
+    existing: Dict[int, List[Tuple[date, date, int]]] = {}
+    for chunk in bulk.chunked(room_ids, bulk.LOOKUP_CHUNK):
+        db.query(models.Room.room_id).filter(models.Room.room_id.in_(chunk)) \
+            .order_by(models.Room.room_id).with_for_update().all()
+        stays = db.query(
+            models.Booking.room_id, models.Booking.check_in_date, models.Booking.check_out_date, models.Booking.booking_id
+        ).filter(
+            models.Booking.room_id.in_(chunk),
+            models.Booking.status.in_(availability.ACTIVE_STATUSES),
+            models.Booking.check_in_date < last,
+            models.Booking.check_out_date > first,
+        ).with_for_update()
+        for room_id, check_in, check_out, booking_id in stays:
+            existing.setdefault(room_id, []).append((check_in, check_out, booking_id))
+
+    # One sweep per room over the batch sorted by check-in: clashes with the stays
+    # already booked, then with the last stay of the batch kept in that room
+    rejected = set()
+    kept_until: Dict[int, Tuple[date, int]] = {}
+    for index, row in sorted(active, key=lambda item: (item[1]["room_id"], item[1]["check_in_date"], item[0])):
+        room_id, check_in, check_out = row["room_id"], row["check_in_date"], row["check_out_date"]
+        clash = next((b for s, e, b in existing.get(room_id, ()) if s < check_out and e > check_in), None)
+        if clash is not None:
+            errors[index] = [
+                f"room_id: room {room_id} is already booked for part of {check_in} to {check_out} (booking {clash})"
+            ]
+        elif room_id in kept_until and kept_until[room_id][0] > check_in:
+            errors[index] = [
+                f"room_id: room {room_id} is booked for part of {check_in} to {check_out} by row {kept_until[room_id][1]}"
+            ]
+        else:
+            kept_until[room_id] = (check_out, index)
+            continue
+        rejected.add(index)
+    return [(index, row) for index, row in accepted if index not in rejected]
+
+def create_bookings_bulk(db: Session, rows: List[dict]):
+    """Validate and insert many bookings in one transaction, pricing them with one set-based UPDATE"""
+    # BookingCreate already rejects unknown statuses and check-out on or before check-in
+    valid, errors = _validate_rows(rows, schemas.BookingCreate)
+    known_guests = {key[0] for key in bulk.existing_keys(db, [models.Guest.guest_id], [(b.guest_id,) for _, b in valid])}
+    known_rooms = {key[0] for key in bulk.existing_keys(db, [models.Room.room_id], [(b.room_id,) for _, b in valid])}
+
+    accepted = []
+    today = date.today()
+    for index, booking in valid:
+        if booking.check_in_date < today:
+            # trg_validate_dates_before_insert would otherwise abort the whole batch
+            errors[index] = ["check_in_date: cannot be in the past"]
+        elif booking.guest_id not in known_guests:
+            errors[index] = [f"guest_id: guest {booking.guest_id} does not exist"]
+        elif booking.room_id not in known_rooms:
+            errors[index] = [f"room_id: room {booking.room_id} does not exist"]
+        else:
+            accepted.append((index, booking.model_dump()))
+
+    try:
+        accepted = _reject_bulk_overlaps(db, accepted, errors)
+        ids = bulk.insert_rows(
+            db, models.Booking, [row for _, row in accepted],
+            natural_key=("guest_id", "room_id", "check_in_date", "check_out_date")
+        )
+        _update_booking_totals(db, ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for booking_id, (_, row) in zip(ids, accepted):
+        if row["status"] in availability.ACTIVE_STATUSES:
+            availability.index.add(booking_id, row["room_id"], row["check_in_date"], row["check_out_date"])
+    if ids:
+        http_cache.invalidate(http_cache.ROOMS)
+        invalidate_dashboard_cache()
+    return _bulk_result(len(rows), [index for index, _ in accepted], ids, errors)
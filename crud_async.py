@@ -0,0 +1,46 @@
+"""
+crud_async.py — Async counterparts of the crud functions for the async API mode.
+
+Each function takes an AsyncSession and runs the matching `crud` implementation
+through AsyncSession.run_sync: the same queries, validation and side effects
+(availability index, dashboard cache, revenue rollup), with every database
+round trip awaited on the async driver instead of blocking a worker thread.
+"""
+
+import functools
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+
+
+def _run_sync(fn):
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+    return wrapper
+
+
+# Hotels / employees / rooms
+get_hotel = _run_sync(crud.get_hotel)
+get_hotels = _run_sync(crud.get_hotels)
+get_employees_by_hotel = _run_sync(crud.get_employees_by_hotel)
+get_room = _run_sync(crud.get_room)
+get_available_rooms = _run_sync(crud.get_available_rooms)
+
+# Guests
+create_guest = _run_sync(crud.create_guest)
+get_guest = _run_sync(crud.get_guest)
+search_guests = _run_sync(crud.search_guests)
+
+# Bookings
+create_booking = _run_sync(crud.create_booking)
+get_booking = _run_sync(crud.get_booking)
+get_bookings_by_guest = _run_sync(crud.get_bookings_by_guest)
+update_booking = _run_sync(crud.update_booking)
+
+# Payments / services
+create_payment = _run_sync(crud.create_payment)
+get_payments_by_booking = _run_sync(crud.get_payments_by_booking)
+get_services = _run_sync(crud.get_services)
+add_service_to_booking = _run_sync(crud.add_service_to_booking)
@@ -0,0 +1,16 @@
+from .core import (
+    Base, SessionLocal, ensure_schema, execute_sql_file, get_db, get_engine, on_engine_created, setup_database,
+    begin_replica_reads, end_replica_reads, get_read_engine, get_replica_engine, reading_from_replica, replica_reads,
+)
+from .connection import get_connection, warm_pool
+from .async_core import dispose_async_engine, get_async_db, get_async_engine, get_async_replica_engine
+from .sql_runner import SQLScriptError, iter_statements, run_sql_file
+from .migrate import MigrationError, migrate
+from . import slow_queries
+
+
+def __getattr__(name):
+    # `engine` is created on first access (see core.get_engine)
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
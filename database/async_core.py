@@ -0,0 +1,72 @@
+# database/async_core.py
+"""
+Async SQLAlchemy engine and session dependency for the opt-in async API mode
+(settings.ASYNC_API). Created on first use, so sync-only deployments never
+load the async driver.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import settings
+from .core import LazySession, _created, engine_options
+
+_async_engine = None
+_async_replica_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """The process-wide async engine, pooled with the same settings as the sync one."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL
+        _async_engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, **engine_options(url))
+        _created(_async_engine.sync_engine, "primary")
+        # Objects stay readable after commit; async code cannot lazy-load on access
+        _async_session_factory = async_sessionmaker(
+            class_=AsyncSession, sync_session_class=AsyncRoutingSession,
+            autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def get_async_replica_engine():
+    """Async engine for the read replica, or None when there is no replica."""
+    global _async_replica_engine
+    url = settings.ASYNC_REPLICA_DATABASE_URL
+    if url is None:
+        return None
+    if _async_replica_engine is None:
+        _async_replica_engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, **engine_options(url))
+        _created(_async_replica_engine.sync_engine, "replica")
+    return _async_replica_engine
+
+
+class AsyncRoutingSession(LazySession):
+    """The sync side of AsyncSession: LazySession's routing over the async engines"""
+
+    def _primary(self):
+        return get_async_engine().sync_engine
+
+    def _replica(self):
+        replica = get_async_replica_engine()
+        return replica.sync_engine if replica is not None else None
+
+
+async def get_async_db():
+    """Dependency for getting an async DB session"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_replica_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+    if _async_replica_engine is not None:
+        await _async_replica_engine.dispose()
+        _async_replica_engine = None
@@ -1,16 +1,49 @@
-import mysql.connector
-from mysql.connector import Error
+# database/connection.py
+"""
+Raw DB-API connections borrowed from the shared SQLAlchemy engine pool.
+Used by the lightweight (non-ORM) queries such as the Flask dashboard.
+"""
+
+from .core import get_engine, get_read_engine, get_replica_engine
+from config import settings
+
 
 def get_connection():
-    """Establish a connection to the MySQL database."""
+    """
+    Borrow a pooled DB-API connection from the engine (the replica inside replica_reads()).
+    Calling close() on it returns it to the pool instead of disconnecting.
+    Returns None if the database is unreachable or the pool checkout times out.
+    """
     try:
-        connection = mysql.connector.connect(
-            host="localhost",         # or your DB host
-            user="root",              # change to your MySQL username
-            password="your_password", # change this
-            database="hotel_management_system"  # must match 01_create_database.sql
-        )
-        return connection
-    except Error as e:
+        return get_read_engine().raw_connection()
+    except Exception as e:
         print(f"❌ Database connection error: {e}")
         return None
+
+
+def warm_pool(size=None):
+    """
+    Open `size` pool connections up front (defaults to DB_POOL_SIZE) so the
+    first requests after startup don't pay the connect and auth round trips.
+    The read replica's pool, when configured, is warmed the same way.
+    Returns the number of primary connections opened.
+    """
+    size = settings.DB_POOL_SIZE if size is None else size
+    opened = _warm(get_engine(), size)
+    replica = get_replica_engine()
+    if replica is not None:
+        _warm(replica, size)
+    return opened
+
+
+def _warm(engine, size):
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.raw_connection())
+    except Exception as e:
+        print(f"❌ Pool warm-up stopped after {len(connections)} connections: {e}")
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
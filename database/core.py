@@ -0,0 +1,235 @@
+from sqlalchemy import Select, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, sessionmaker
+from config import settings
+from .migrate import migrate
+from .sql_runner import run_sql_file
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import threading
+
+def engine_options(url: str) -> dict:
+    """Pool settings shared by the sync and async engines"""
+    options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=settings.DEBUG
+    )
+    if url.startswith("sqlite"):
+        # Local SQLite stand-ins are shared across request threads
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+_engine = None
+_engine_lock = threading.Lock()
+_engine_hooks = []
+_created_engines = []
+
+
+def on_engine_created(hook):
+    """
+    Call hook(engine, role) for each app engine, role being "primary" or
+    "replica"; engines that already exist are passed straight away. Async
+    engines are passed as their sync_engine.
+    """
+    _engine_hooks.append(hook)
+    for engine, role in list(_created_engines):
+        hook(engine, role)
+
+
+def _created(engine, role: str):
+    _created_engines.append((engine, role))
+    for hook in _engine_hooks:
+        hook(engine, role)
+
+
+def get_engine():
+    """
+    The process-wide engine: one bounded pool shared by the ORM sessions and
+    the raw dashboard queries. Created on first use, so importing the app
+    never touches the database.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+                _created(_engine, "primary")
+    return _engine
+
+
+_replica_engine = None
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+def get_replica_engine():
+    """The read replica engine (settings.REPLICA_DATABASE_URL), or None when there is no replica."""
+    global _replica_engine
+    url = settings.REPLICA_DATABASE_URL
+    if url is None:
+        return None
+    if _replica_engine is None:
+        with _engine_lock:
+            if _replica_engine is None:
+                _replica_engine = create_engine(url, **engine_options(url))
+                _created(_replica_engine, "replica")
+    return _replica_engine
+
+
+def begin_replica_reads(enabled: bool = True):
+    """Let this context's reads go to the replica; returns the token for end_replica_reads()"""
+    return _read_from_replica.set(enabled)
+
+
+def end_replica_reads(token):
+    _read_from_replica.reset(token)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Within this block, sessions and get_read_engine() may read from the replica."""
+    token = begin_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        end_replica_reads(token)
+
+
+def reading_from_replica() -> bool:
+    """Whether reads in this context are served by a replica (replica_reads() and one is configured)."""
+    return _read_from_replica.get() and settings.REPLICA_DATABASE_URL is not None
+
+
+def get_read_engine():
+    """The replica inside replica_reads() when one is configured, else the primary."""
+    if _read_from_replica.get():
+        return get_replica_engine() or get_engine()
+    return get_engine()
+
+
+def __getattr__(name):
+    # `from database import engine` keeps working, resolved lazily
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession(Session):
+    """
+    Session that binds to get_engine() when it first needs a connection.
+    Inside replica_reads(), plain SELECTs go to the replica until the session
+    flushes or runs anything else (DML, text(), FOR UPDATE). From then on it
+    stays on the primary, so it always sees its own writes.
+    """
+
+    def _primary(self):
+        return get_engine()
+
+    def _replica(self):
+        return get_replica_engine()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.bind is not None:
+            return self.bind
+        if _read_from_replica.get() and not self.info.get("pinned_to_primary"):
+            if not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None:
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+            else:
+                self.info["pinned_to_primary"] = True
+        return self._primary()
+
+
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
+Base = declarative_base()
+
+_schema_checked = False
+
+
+def ensure_schema():
+    """
+    Create any missing tables from the ORM models, once per process.
+    Run explicitly (DB_SCHEMA_CHECK=true at startup, or `python main.py --create-schema`);
+    importing the app never issues DDL.
+    """
+    global _schema_checked
+    if not _schema_checked:
+        import models  # noqa: F401  (registers the tables on Base.metadata)
+        Base.metadata.create_all(bind=get_engine())
+        _schema_checked = True
+
+def get_db():
+    """Dependency for getting DB session"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def execute_sql_file(filepath: str, connection):
+    """Execute a SQL file, streamed statement by statement; stops at the first failing statement"""
+    print(f"Executing {filepath}...")
+    count = run_sql_file(filepath, connection)
+    print(f"✓ {filepath} executed successfully ({count} statements)")
+
+
+def setup_database():
+    """Setup database from SQL files"""
+    sql_dir = settings.SQL_FILES_DIR
+    
+    # Order matters! Fresh install only: database.sql and tables.sql drop what exists.
+    # Later schema changes ship as migrations (database/migrations/), applied before the sample data.
+    sql_files = [
+        'schema/database.sql',
+        'schema/tables.sql',
+        'schema/indexes.sql',
+        'schema/views.sql',
+        'procedures/procedures.sql',
+        'triggers/triggers.sql',
+    ]
+    sample_data = 'sample_data/sample_data.sql'
+
+    # First connect to the server without a database, so database.sql can create it
+    initial_url = make_url(settings.DATABASE_URL).set(database="")
+
+    initial_engine = create_engine(initial_url)
+
+    try:
+        with initial_engine.connect() as conn:
+            # Execute database.sql to create database
+            db_file = os.path.join(sql_dir, sql_files[0])
+            if os.path.exists(db_file):
+                execute_sql_file(db_file, conn)
+        
+        initial_engine.dispose()
+        
+        # Now connect to the actual database and run remaining files
+        with get_engine().connect() as conn:
+            for sql_file in sql_files[1:]:  # Skip database.sql
+                filepath = os.path.join(sql_dir, sql_file)
+                if os.path.exists(filepath):
+                    execute_sql_file(filepath, conn)
+                else:
+                    print(f"⚠️ Warning: {sql_file} not found at {filepath}, skipping...")
+
+            migrate(conn)
+
+            filepath = os.path.join(sql_dir, sample_data)
+            if os.path.exists(filepath):
+                execute_sql_file(filepath, conn)
+        
+        print("\n✅ Database setup completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Error setting up database: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
\ No newline at end of file
@@ -0,0 +1,156 @@
+# database/migrate.py
+"""
+Forward-only schema migrations for live databases.
+
+Each change is a numbered script in database/migrations/ (0003_add_x.sql)
+that runs exactly once per database. The schema_migrations table records the
+version, name, checksum and run time of every script applied. A script that
+was edited after it was applied, or a new script numbered below the latest
+applied one, stops the run: fix forward with a new migration.
+
+Migrations are for databases that hold data. tables.sql drops and recreates
+everything and is only for fresh installs. Write scripts with online DDL
+(ALGORITHM=INPLACE, LOCK=NONE), one ALTER per table, so each table's metadata
+lock is taken once. MySQL DDL is not transactional: a script that fails
+halfway is not recorded, but the statements that completed stay applied.
+The session's lock_wait_timeout is kept short, so a migration blocked by a
+long transaction fails quickly instead of stalling every query queued
+behind it.
+"""
+
+import hashlib
+import re
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+
+from config import settings
+from .sql_runner import run_sql_file
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+_FILENAME_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+Migration = namedtuple("Migration", "version name path checksum")
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String(16), primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("checksum", String(64), nullable=False),
+    Column("execution_ms", Integer, nullable=False, default=0),
+    Column("applied_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+)
+
+
+class MigrationError(Exception):
+    """The migration history and the scripts on disk disagree, or a lock could not be taken."""
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migration scripts in `directory`, in version order"""
+    migrations = []
+    for path in sorted(Path(directory).glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise MigrationError(f"{path.name}: migration files are named NNNN_description.sql")
+        migrations.append(Migration(
+            match.group(1), match.group(2), path, hashlib.sha256(path.read_bytes()).hexdigest()
+        ))
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def applied(connection) -> dict:
+    """version -> checksum of every migration recorded in this database"""
+    schema_migrations.create(connection, checkfirst=True)
+    rows = connection.execute(select(schema_migrations.c.version, schema_migrations.c.checksum))
+    return {version: checksum for version, checksum in rows}
+
+
+def pending(connection, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Scripts not applied yet; raises MigrationError if the history was rewritten"""
+    done = applied(connection)
+    migrations = discover(directory)
+    for m in migrations:
+        if m.version in done and done[m.version] != m.checksum:
+            raise MigrationError(
+                f"{m.path.name} changed after it was applied; revert it and add a new migration instead"
+            )
+    todo = [m for m in migrations if m.version not in done]
+    if todo and done and todo[0].version < max(done):
+        raise MigrationError(
+            f"{todo[0].path.name} is numbered below the latest applied migration ({max(done)}); renumber it"
+        )
+    return todo
+
+
+@contextmanager
+def _migration_lock(connection, timeout: int = 60):
+    """Serialize migrators across processes (MySQL named lock; a no-op elsewhere)"""
+    if connection.dialect.name != "mysql":
+        yield
+        return
+    if connection.execute(text("SELECT GET_LOCK('hms_schema_migrations', :t)"), {"t": timeout}).scalar() != 1:
+        raise MigrationError("Another process is running migrations")
+    try:
+        connection.execute(text("SET SESSION lock_wait_timeout = :t"), {"t": settings.MIGRATION_LOCK_WAIT_TIMEOUT})
+        yield
+    finally:
+        connection.execute(text("SELECT RELEASE_LOCK('hms_schema_migrations')"))
+
+
+def migrate(
+    connection,
+    directory: Path = MIGRATIONS_DIR,
+    target: Optional[str] = None,
+    progress: Optional[Callable[[str], None]] = print,
+) -> List[str]:
+    """
+    Apply pending migrations in order, up to and including `target`, and
+    record each one as it completes. Returns the versions applied.
+    """
+    versions = []
+    with _migration_lock(connection):
+        todo = pending(connection, directory)
+        connection.commit()
+        for m in todo:
+            if target is not None and m.version > target:
+                break
+            if progress:
+                progress(f"Applying {m.path.name}...")
+            started = time.monotonic()
+            run_sql_file(str(m.path), connection, progress=progress)
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            connection.execute(insert(schema_migrations).values(
+                version=m.version, name=m.name, checksum=m.checksum, execution_ms=elapsed_ms
+            ))
+            connection.commit()
+            versions.append(m.version)
+            if progress:
+                progress(f"✓ {m.version} {m.name} ({elapsed_ms} ms)")
+    return versions
+
+
+def stamp(connection, target: Optional[str] = None, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Record migrations up to `target` (default: all) as applied without running
+    them, for databases that already have those changes (e.g. built by
+    ensure_schema from the ORM models).
+    """
+    versions = []
+    with _migration_lock(connection):
+        for m in pending(connection, directory):
+            if target is not None and m.version > target:
+                break
+            connection.execute(insert(schema_migrations).values(
+                version=m.version, name=m.name, checksum=m.checksum, execution_ms=0
+            ))
+            versions.append(m.version)
+        connection.commit()
+    return versions
@@ -0,0 +1,11 @@
+-- Booking indexes matched to the real predicates.
+--   idx_booking_room_status_dates: availability (crud.get_available_rooms_sql, availability.load)
+--     probes a room's live bookings: equality on room_id and status, then the stay range.
+--     Its room_id prefix also serves fk_booking_room, so idx_booking_room is dropped.
+--   idx_booking_booking_date: recent bookings, ORDER BY booking_date DESC LIMIT n.
+-- One in-place ALTER: concurrent reads and writes continue while the indexes build.
+ALTER TABLE booking
+    ADD INDEX idx_booking_room_status_dates (room_id, status, check_in_date, check_out_date),
+    ADD INDEX idx_booking_booking_date (booking_date),
+    DROP INDEX idx_booking_room,
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,4 @@
+-- Revenue reports and the dashboard filter payments by date range (payment_date >= ? AND < ?).
+ALTER TABLE payment
+    ADD INDEX idx_payment_date (payment_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
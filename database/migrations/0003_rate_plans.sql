@@ -0,0 +1,76 @@
+-- Rate plans: nightly rates per hotel and room type by date range, weekday and priority
+-- (pricing.py). idx_rate_plan_hotel_dates serves the rate calendar load, which reads one
+-- hotel's plans overlapping a window.
+CREATE TABLE rate_plan (
+    rate_plan_id INT NOT NULL AUTO_INCREMENT,
+    hotel_id INT NOT NULL,
+    room_type VARCHAR(50) NOT NULL,
+    name VARCHAR(100),
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    price_per_night DECIMAL(10,2) NOT NULL,
+    days_of_week TINYINT UNSIGNED NOT NULL DEFAULT 127,
+    priority INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (rate_plan_id),
+    CONSTRAINT fk_rate_plan_hotel FOREIGN KEY (hotel_id)
+        REFERENCES hotel(hotel_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    CONSTRAINT chk_rate_plan_dates CHECK (end_date > start_date),
+    INDEX idx_rate_plan_hotel_dates (hotel_id, start_date, end_date)
+) ENGINE=InnoDB;
+
+-- recalc_booking_total prices each night from the rate plans
+DROP PROCEDURE IF EXISTS recalc_booking_total;
+
+DELIMITER //
+
+CREATE PROCEDURE recalc_booking_total(IN p_booking_id INT)
+BEGIN
+    DECLARE v_room_total DECIMAL(12,2) DEFAULT 0;
+    DECLARE v_services_total DECIMAL(12,2) DEFAULT 0;
+    DECLARE v_total DECIMAL(12,2) DEFAULT 0;
+
+    -- Each night at the highest priority rate plan covering it, else the room's own price
+    -- (the same rule as pricing.py, which prices bookings made through the API)
+    WITH RECURSIVE nights (night) AS (
+        SELECT check_in_date FROM booking WHERE booking_id = p_booking_id
+        UNION ALL
+        SELECT n.night + INTERVAL 1 DAY
+        FROM nights n
+        JOIN booking b ON b.booking_id = p_booking_id
+        WHERE n.night + INTERVAL 1 DAY < b.check_out_date
+    )
+    SELECT SUM(COALESCE((
+        SELECT rp.price_per_night
+        FROM rate_plan rp
+        WHERE rp.hotel_id = r.hotel_id
+          AND rp.room_type = r.room_type
+          AND rp.start_date <= n.night
+          AND rp.end_date > n.night
+          AND rp.days_of_week & (1 << WEEKDAY(n.night))
+        ORDER BY rp.priority DESC, rp.rate_plan_id DESC
+        LIMIT 1
+    ), r.price_per_night))
+    INTO v_room_total
+    FROM nights n
+    JOIN booking b ON b.booking_id = p_booking_id
+    JOIN room r ON b.room_id = r.room_id
+    WHERE n.night < b.check_out_date;
+
+    SELECT COALESCE(SUM(s.price * su.quantity), 0)
+    INTO v_services_total
+    FROM service_usage su
+    JOIN service s ON su.service_id = s.service_id
+    WHERE su.booking_id = p_booking_id;
+
+    SET v_total = COALESCE(v_room_total, 0) + COALESCE(v_services_total, 0);
+
+    UPDATE booking
+    SET total_amount = v_total,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE booking_id = p_booking_id;
+END//
+
+DELIMITER ;
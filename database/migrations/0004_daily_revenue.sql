@@ -0,0 +1,27 @@
+-- daily_revenue: paid payment totals per hotel, day and payment method (revenue.py), read by
+-- the dashboard's revenue chart instead of scanning payment.
+CREATE TABLE IF NOT EXISTS daily_revenue (
+    hotel_id INT NOT NULL,
+    revenue_date DATE NOT NULL,
+    payment_method ENUM('Cash','Card','UPI') NOT NULL,
+    amount DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    payment_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hotel_id, revenue_date, payment_method),
+    CONSTRAINT fk_dr_hotel FOREIGN KEY (hotel_id)
+        REFERENCES hotel(hotel_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX idx_daily_revenue_date (revenue_date)
+) ENGINE=InnoDB;
+
+-- Backfill from the paid payments (same totals as `python revenue.py rebuild`);
+-- days already in the rollup are overwritten with the recomputed totals.
+INSERT INTO daily_revenue (hotel_id, revenue_date, payment_method, amount, payment_count)
+SELECT * FROM (
+    SELECT r.hotel_id, p.payment_date, p.payment_method, SUM(p.amount) AS amount, COUNT(*) AS payment_count
+    FROM payment p
+    JOIN booking b ON b.booking_id = p.booking_id
+    JOIN room r ON r.room_id = b.room_id
+    WHERE p.payment_status = 'Paid' AND p.payment_date IS NOT NULL
+    GROUP BY r.hotel_id, p.payment_date, p.payment_method
+) AS totals
+ON DUPLICATE KEY UPDATE amount = totals.amount, payment_count = totals.payment_count;
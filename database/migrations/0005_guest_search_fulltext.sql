@@ -0,0 +1,13 @@
+-- ft_guest_search: ngram FULLTEXT index behind guest search by name or email
+-- (crud.search_guests). MySQL has no ADD INDEX IF NOT EXISTS, so the ALTER is only
+-- prepared when the index is missing. A FULLTEXT build cannot run with LOCK=NONE:
+-- writes to guest wait until it finishes, reads continue.
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'guest' AND index_name = 'ft_guest_search') = 0,
+    'ALTER TABLE guest ADD FULLTEXT INDEX ft_guest_search (name, email) WITH PARSER ngram, ALGORITHM=INPLACE, LOCK=SHARED',
+    'DO 0'
+);
+PREPARE add_ft_guest_search FROM @ddl;
+EXECUTE add_ft_guest_search;
+DEALLOCATE PREPARE add_ft_guest_search;
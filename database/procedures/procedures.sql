@@ -2,17 +2,40 @@ USE hotel_management_system;
 
 DROP PROCEDURE IF EXISTS recalc_booking_total;
 
+DELIMITER //
+
 CREATE PROCEDURE recalc_booking_total(IN p_booking_id INT)
 BEGIN
     DECLARE v_room_total DECIMAL(12,2) DEFAULT 0;
     DECLARE v_services_total DECIMAL(12,2) DEFAULT 0;
     DECLARE v_total DECIMAL(12,2) DEFAULT 0;
 
-    SELECT GREATEST(DATEDIFF(b.check_out_date, b.check_in_date), 0) * r.price_per_night
+    -- Each night at the highest priority rate plan covering it, else the room's own price
+    -- (the same rule as pricing.py, which prices bookings made through the API)
+    WITH RECURSIVE nights (night) AS (
+        SELECT check_in_date FROM booking WHERE booking_id = p_booking_id
+        UNION ALL
+        SELECT n.night + INTERVAL 1 DAY
+        FROM nights n
+        JOIN booking b ON b.booking_id = p_booking_id
+        WHERE n.night + INTERVAL 1 DAY < b.check_out_date
+    )
+    SELECT SUM(COALESCE((
+        SELECT rp.price_per_night
+        FROM rate_plan rp
+        WHERE rp.hotel_id = r.hotel_id
+          AND rp.room_type = r.room_type
+          AND rp.start_date <= n.night
+          AND rp.end_date > n.night
+          AND rp.days_of_week & (1 << WEEKDAY(n.night))
+        ORDER BY rp.priority DESC, rp.rate_plan_id DESC
+        LIMIT 1
+    ), r.price_per_night))
     INTO v_room_total
-    FROM booking b
+    FROM nights n
+    JOIN booking b ON b.booking_id = p_booking_id
     JOIN room r ON b.room_id = r.room_id
-    WHERE b.booking_id = p_booking_id;
+    WHERE n.night < b.check_out_date;
 
     SELECT COALESCE(SUM(s.price * su.quantity), 0)
     INTO v_services_total
@@ -26,4 +49,6 @@ BEGIN
     SET total_amount = v_total,
         updated_at = CURRENT_TIMESTAMP
     WHERE booking_id = p_booking_id;
-END;
+END//
+
+DELIMITER ;
@@ -4,86 +4,137 @@ Database query functions for the Hotel Management System.
 Handles dashboard data, recent bookings, and other queries.
 """
 
+import threading
+import time
+from datetime import date, timedelta
+
 import pymysql
 from config import settings
+from .connection import get_connection, warm_pool
+from .slow_queries import execute
 
 
 # -------------------------------------------------------------
-# 🔌 Database Connection Helper
+# 📊 Dashboard Stats
 # -------------------------------------------------------------
-def get_connection():
+# All four figures in one round trip. The date filters are ranges on the bare
+# columns (not DATE(col) = CURDATE()) so idx_booking_dates / payment_date
+# indexes stay usable. 'Booked' is what trg_room_status_update writes.
+DASHBOARD_STATS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM room) AS total_rooms,
+        (SELECT COUNT(*) FROM room WHERE status IN ('Occupied', 'Booked')) AS occupied,
+        (SELECT COUNT(*) FROM booking
+            WHERE check_in_date >= CURDATE() AND check_in_date < CURDATE() + INTERVAL 1 DAY) AS bookings_today,
+        (SELECT COALESCE(SUM(amount), 0) FROM payment
+            WHERE payment_date >= CURDATE() AND payment_date < CURDATE() + INTERVAL 1 DAY) AS revenue_today;
+"""
+
+_stats_lock = threading.Lock()
+_stats_cache = {"value": None, "expires": 0.0, "generation": 0}
+
+
+def invalidate_dashboard_cache():
     """
-    Establish a database connection using .env variables from config.py.
-    Returns a connection object or None if connection fails.
+    Drop the cached dashboard stats. Called by crud after booking and payment
+    writes; other processes see the change once their DASHBOARD_CACHE_TTL expires.
     """
-    try:
-        conn = pymysql.connect(
-            host=settings.DB_HOST,
-            user=settings.DB_USER,
-            password=settings.DB_PASSWORD,
-            database=settings.DB_NAME,
-            port=settings.DB_PORT,
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        return conn
-    except Exception as e:
-        print("❌ Database connection failed:", e)
-        return None
+    _stats_cache["generation"] += 1
+    _stats_cache["value"] = None
+    _stats_cache["expires"] = 0.0
 
 
-# -------------------------------------------------------------
-# 📊 Dashboard Stats
-# -------------------------------------------------------------
 def get_dashboard_stats():
     """
-    Fetch summarized dashboard statistics from the database.
-    Returns counts for rooms, guests, bookings, and revenue.
+    Fetch summarized dashboard statistics, served from a short-TTL cache.
+    Concurrent refreshes are collapsed so only one caller queries MySQL.
+    Returns counts for rooms, bookings, and revenue.
     """
+    cached = _stats_cache["value"]
+    if cached is not None and time.monotonic() < _stats_cache["expires"]:
+        return dict(cached)
+
+    with _stats_lock:
+        # Another caller may have refreshed the cache while we waited
+        cached = _stats_cache["value"]
+        if cached is not None and time.monotonic() < _stats_cache["expires"]:
+            return dict(cached)
+
+        generation = _stats_cache["generation"]
+        stats = _fetch_dashboard_stats()
+        if stats is None:
+            return {
+                "total_rooms": 0,
+                "occupied": 0,
+                "bookings_today": 0,
+                "revenue_today": "₹0",
+            }
+        if generation == _stats_cache["generation"]:
+            _stats_cache["value"] = stats
+            _stats_cache["expires"] = time.monotonic() + settings.DASHBOARD_CACHE_TTL
+        return dict(stats)
+
+
+def _fetch_dashboard_stats():
+    """Run the aggregated stats query. Returns None if the database is unavailable."""
     conn = get_connection()
     if not conn:
+        return None
+
+    try:
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+            execute(cursor, DASHBOARD_STATS_SQL)
+            row = cursor.fetchone()
+
         return {
-            "total_rooms": 0,
-            "occupied": 0,
-            "bookings_today": 0,
-            "revenue_today": "₹0"
+            "total_rooms": row["total_rooms"],
+            "occupied": row["occupied"],
+            "bookings_today": row["bookings_today"],
+            "revenue_today": f"₹{row['revenue_today']:,}",
         }
 
-    try:
-        with conn.cursor() as cursor:
-            # Total rooms
-            cursor.execute("SELECT COUNT(*) AS total_rooms FROM rooms;")
-            total_rooms = cursor.fetchone()["total_rooms"]
+    except Exception as e:
+        print("❌ Query failed:", e)
+        return None
+    finally:
+        conn.close()
 
-            # Occupied rooms
-            cursor.execute("SELECT COUNT(*) AS occupied FROM rooms WHERE status='Occupied';")
-            occupied = cursor.fetchone()["occupied"]
 
-            # Bookings today
-            cursor.execute("SELECT COUNT(*) AS bookings_today FROM bookings WHERE DATE(checkin_date)=CURDATE();")
-            bookings_today = cursor.fetchone()["bookings_today"]
+# -------------------------------------------------------------
+# 💰 Daily Revenue
+# -------------------------------------------------------------
+def get_revenue_series(days=7):
+    """
+    Fetch paid revenue per day for the last `days` days (today included)
+    from the daily_revenue rollup. Returns (dates, amounts), oldest first,
+    with 0 for days that had no payments.
+    """
+    today = date.today()
+    dates = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    amounts = {day: 0 for day in dates}
 
-            # Revenue today
-            cursor.execute("SELECT IFNULL(SUM(amount),0) AS revenue_today FROM payments WHERE DATE(payment_date)=CURDATE();")
-            revenue_today = cursor.fetchone()["revenue_today"]
+    conn = get_connection()
+    if not conn:
+        return dates, [0] * days
 
-        return {
-            "total_rooms": total_rooms,
-            "occupied": occupied,
-            "bookings_today": bookings_today,
-            "revenue_today": f"₹{revenue_today:,}",
-        }
+    try:
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+            execute(cursor, """
+                SELECT revenue_date, SUM(amount) AS amount
+                FROM daily_revenue
+                WHERE revenue_date >= %s AND revenue_date <= %s
+                GROUP BY revenue_date;
+            """, (dates[0], today))
+            for row in cursor.fetchall():
+                amounts[row["revenue_date"]] = float(row["amount"])
 
     except Exception as e:
-        print("❌ Query failed:", e)
-        return {
-            "total_rooms": 0,
-            "occupied": 0,
-            "bookings_today": 0,
-            "revenue_today": "₹0",
-        }
+        print("❌ Failed to fetch daily revenue:", e)
     finally:
         conn.close()
 
+    return dates, [amounts[day] for day in dates]
+
 
 # -------------------------------------------------------------
 # 🧾 Recent Bookings
@@ -91,25 +142,31 @@ def get_dashboard_stats():
 def get_recent_bookings(limit=5):
     """
     Fetch the most recent bookings for dashboard display.
-    Returns a list of dicts with guest name, room, and status.
+    Returns a list of dicts with the fields dashboard.html shows: booking id,
+    guest name, room, dates, status and amount.
     """
     conn = get_connection()
     if not conn:
         return []
 
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+            # %% because pymysql applies %-formatting to the statement when params are passed;
+            # booking_id breaks ties within a day and rides along in idx_booking_booking_date
+            execute(cursor, """
+                SELECT
+                    b.booking_id,
                     g.name AS guest_name,
-                    r.room_number AS room_number,
-                    b.status AS booking_status,
-                    DATE_FORMAT(b.checkin_date, '%Y-%m-%d') AS checkin_date,
-                    DATE_FORMAT(b.checkout_date, '%Y-%m-%d') AS checkout_date
-                FROM bookings b
-                JOIN guests g ON b.guest_id = g.guest_id
-                JOIN rooms r ON b.room_id = r.room_id
-                ORDER BY b.booking_date DESC
+                    r.room_number,
+                    r.room_type,
+                    DATE_FORMAT(b.check_in_date, '%%Y-%%m-%%d') AS check_in_date,
+                    DATE_FORMAT(b.check_out_date, '%%Y-%%m-%%d') AS check_out_date,
+                    b.status,
+                    b.total_amount AS amount
+                FROM booking b
+                JOIN guest g ON b.guest_id = g.guest_id
+                JOIN room r ON b.room_id = r.room_id
+                ORDER BY b.booking_date DESC, b.booking_id DESC
                 LIMIT %s;
             """, (limit,))
             records = cursor.fetchall()
@@ -147,4 +204,5 @@ if __name__ == "__main__":
     test_connection()
     print("Dashboard Stats:", get_dashboard_stats())
     print("Recent Bookings:", get_recent_bookings())
+    print("Revenue (7 days):", get_revenue_series())
 
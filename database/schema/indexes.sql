@@ -1,8 +1,9 @@
 USE hotel_management_system;
 
--- Ensure proper indexing for performance
+-- Secondary indexes for a fresh install, run by setup_database() after tables.sql.
+-- guest.email and service.service_name are already covered by their unique keys, and
+-- ft_guest_search (crud.search_guests) is created by migration 0005.
+-- Indexes for databases that are already live ship as migrations in database/migrations/.
 CREATE INDEX idx_booking_status ON booking(status);
 CREATE INDEX idx_payment_method ON payment(payment_method);
 CREATE INDEX idx_room_status ON room(status);
-CREATE INDEX idx_guest_email ON guest(email);
-CREATE INDEX idx_service_name ON service(service_name);
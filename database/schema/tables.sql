@@ -1,6 +1,11 @@
 USE hotel_management_system;
 
+-- Fresh installs only: this drops every table. Change a live database with a
+-- migration in database/migrations/ (python migrate.py).
+
 -- Drop tables in reverse dependency order
+DROP TABLE IF EXISTS rate_plan;  -- created by migration 0003
+DROP TABLE IF EXISTS daily_revenue;  -- created by migration 0004
 DROP TABLE IF EXISTS service_usage;
 DROP TABLE IF EXISTS payment;
 DROP TABLE IF EXISTS booking;
@@ -79,6 +84,7 @@ CREATE TABLE guest (
     PRIMARY KEY (guest_id),
     UNIQUE KEY uq_guest_email (email),
     INDEX idx_guest_name (name)
+    -- ft_guest_search FULLTEXT (name, email): migration 0005
 ) ENGINE=InnoDB;
 
 -- ===============================
@@ -173,3 +179,5 @@ CREATE TABLE service_usage (
         ON DELETE RESTRICT ON UPDATE CASCADE,
     INDEX idx_su_service (service_id)
 ) ENGINE=InnoDB;
+
+-- daily_revenue (rollup of paid payments, see revenue.py): migration 0004
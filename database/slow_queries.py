@@ -0,0 +1,183 @@
+# database/slow_queries.py
+"""
+Slow query log: every statement slower than SLOW_QUERY_THRESHOLD_MS is kept
+in a bounded in-memory ring buffer, together with its duration, redacted
+parameters and the crud (or dashboard query) function that issued it.
+
+ORM and Core statements are timed through class-level engine events, so both
+the sync and async engines are covered. The raw DB-API cursors in
+database/queries.py go through `execute()`, which also reports each
+statement to the hooks registered with `on_raw_query()` (metrics.py). The
+first time each normalized statement is slow, an EXPLAIN is run on a
+background thread with its own pooled connection, so request latency is
+never affected and a streaming cursor is never interrupted.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+
+CALLER_MODULES = ("crud", "database.queries")
+_SKIP_MODULES = ("sqlalchemy", "pymysql", "aiomysql", "greenlet", "contextlib", __name__)
+_EXPLAINABLE = ("select", "with", "update", "delete", "insert", "replace")
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\([^)]+\)s|%s|\?|:\w+")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+_lock = threading.Lock()
+_entries = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+_plans = OrderedDict()  # fingerprint -> EXPLAIN rows (None while pending)
+_explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+_raw_query_hooks = []
+
+
+def normalize(statement: str) -> str:
+    """Fingerprint of a statement: literals and placeholders become ?, IN lists collapse, whitespace folds."""
+    text = _STRING_RE.sub("?", statement)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(?)", text)
+    return " ".join(text.split()).rstrip(";").lower()
+
+
+def redact(parameters):
+    """Parameter shapes without values: type names, and lengths for strings and bytes."""
+    if not parameters:
+        return None
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in list(parameters.items())[:20]}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"<{len(parameters)} parameter sets>"
+        return [_redact_value(value) for value in parameters[:20]]
+    return _redact_value(parameters)
+
+
+def _redact_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def _caller() -> str:
+    """Innermost crud / dashboard query function on the stack, else the first application frame."""
+    frame = sys._getframe(2)
+    fallback = None
+    depth = 0
+    while frame is not None and depth < 60:
+        module = frame.f_globals.get("__name__", "")
+        if module in CALLER_MODULES:
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and not module.startswith(_SKIP_MODULES):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+        depth += 1
+    return fallback or "?"
+
+
+def record(statement: str, parameters, seconds: float, executemany: bool = False, caller: str = None):
+    """Add a slow statement to the log and schedule an EXPLAIN for new fingerprints."""
+    fingerprint = normalize(statement)
+    entry = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "duration_ms": round(seconds * 1000, 2),
+        "caller": caller or _caller(),
+        "fingerprint": fingerprint,
+        "statement": " ".join(statement.split())[:4000],
+        "parameters": redact(parameters),
+    }
+    with _lock:
+        _entries.append(entry)
+        first = fingerprint not in _plans
+        if first:
+            _plans[fingerprint] = None
+            while len(_plans) > settings.SLOW_QUERY_LOG_SIZE:
+                _plans.popitem(last=False)
+
+    if first:
+        print(f"🐢 Slow query ({entry['duration_ms']} ms) in {entry['caller']}: {entry['statement'][:200]}")
+        if settings.SLOW_QUERY_EXPLAIN and not executemany and fingerprint.startswith(_EXPLAINABLE):
+            # The real parameters are handed to the EXPLAIN job only; the log keeps the redacted shape
+            _explainer.submit(_explain, fingerprint, statement, parameters)
+
+
+def _explain(fingerprint: str, statement: str, parameters):
+    from .core import get_engine
+
+    try:
+        engine = get_engine()
+        prefix = {"mysql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}.get(engine.dialect.name)
+        if prefix is None:
+            return
+        with engine.connect() as conn:
+            conn = conn.execution_options(slow_query_log=False)
+            if parameters:
+                result = conn.exec_driver_sql(prefix + statement, parameters)
+            else:
+                result = conn.exec_driver_sql(prefix + statement, execution_options={"no_parameters": True})
+            plan = [dict(row._mapping) for row in result]
+            conn.rollback()
+    except Exception as e:
+        plan = [{"error": str(e)}]
+    with _lock:
+        if fingerprint in _plans:
+            _plans[fingerprint] = plan
+
+
+def entries(limit: int = 100) -> list:
+    """Newest slow queries first, each with the EXPLAIN of its fingerprint (None while pending)"""
+    with _lock:
+        recent = list(_entries)[-limit:][::-1]
+        return [dict(entry, plan=_plans.get(entry["fingerprint"])) for entry in recent]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _plans.clear()
+
+
+def on_raw_query(hook):
+    """Call hook(seconds) after every statement run through execute(); engine events never see these."""
+    _raw_query_hooks.append(hook)
+
+
+def execute(cursor, sql: str, params=None):
+    """cursor.execute() for the raw DB-API queries, recorded when slower than the threshold"""
+    start = time.perf_counter()
+    result = cursor.execute(sql, params)
+    elapsed = time.perf_counter() - start
+    for hook in _raw_query_hooks:
+        hook(elapsed)
+    if settings.SLOW_QUERY_LOG_ENABLED and elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        record(sql, params, elapsed)
+    return result
+
+
+# ============= ENGINE HOOKS =============
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not settings.SLOW_QUERY_LOG_ENABLED:
+        return
+    elapsed = time.perf_counter() - context._slow_query_start
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS and context.execution_options.get("slow_query_log", True):
+        record(statement, parameters, elapsed, executemany)
@@ -0,0 +1,182 @@
+# database/sql_runner.py
+"""
+Streaming runner for MySQL scripts: schema files, procedures, triggers and dumps.
+
+Statements are split by a small tokenizer that follows the mysql client's
+rules — quoted strings and identifiers, `--`/`#`/`/* */` comments and
+`DELIMITER` directives — reading one line at a time, so multi-GB dumps
+(plain or .gz) never sit in memory. Statements run in batches with one commit
+per batch, and the run stops at the first failing statement, reporting the
+file and line it started on.
+"""
+
+import gzip
+import io
+import os
+import re
+import time
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+_DELIMITER_RE = re.compile(r"\s*delimiter\s+(\S+)", re.IGNORECASE)
+
+# Remainder of a quoted token, up to and including its closing quote
+_QUOTE_END = {
+    "'": re.compile(r"(?:[^'\\]|\\.|'')*'", re.DOTALL),
+    '"': re.compile(r'(?:[^"\\]|\\.|"")*"', re.DOTALL),
+    "`": re.compile(r"(?:[^`]|``)*`", re.DOTALL),
+}
+
+
+class SQLScriptError(Exception):
+    """A statement in a script failed (or the script itself is malformed)."""
+
+    def __init__(self, path: str, line: int, statement: str, error):
+        self.path = path
+        self.line = line
+        self.statement = statement
+        self.error = error
+        excerpt = " ".join(statement.split())
+        if len(excerpt) > 200:
+            excerpt = excerpt[:200] + " …"
+        super().__init__(f"{path}:{line}: {error}\n    in: {excerpt}")
+
+
+def _token_pattern(delimiter: str):
+    # `--` only starts a comment when followed by whitespace, as in MySQL
+    return re.compile(r"['\"`]|/\*|--(?=\s|$)|#|" + re.escape(delimiter))
+
+
+def iter_statements(lines: Iterable[str], path: str = "<script>") -> Iterator[Tuple[str, int]]:
+    """
+    Yield (statement, first_line) for every statement in `lines`, without the
+    delimiter. Comments are dropped except `/*! ... */` and `/*+ ... */`,
+    which carry meaning for the server.
+    """
+    delimiter = ";"
+    pattern = _token_pattern(delimiter)
+    parts = []
+    start = None
+    state = None  # None, a quote character, or "/*"
+    keep_comment = False
+    lineno = 0
+
+    for lineno, line in enumerate(lines, 1):
+        if state is None and start is None:
+            directive = _DELIMITER_RE.match(line)
+            if directive:
+                delimiter = directive.group(1)
+                pattern = _token_pattern(delimiter)
+                parts = []
+                continue
+
+        pos, end = 0, len(line)
+        while pos < end:
+            if state is None:
+                match = pattern.search(line, pos)
+                if match is None:
+                    chunk = line[pos:]
+                    pos = end
+                else:
+                    chunk = line[pos:match.start()]
+                    pos = match.end()
+                if chunk:
+                    parts.append(chunk)
+                    if start is None and not chunk.isspace():
+                        start = lineno
+                if match is None:
+                    break
+
+                token = match.group()
+                if token == delimiter:
+                    statement = "".join(parts).strip()
+                    if statement:
+                        yield statement, start
+                    parts, start = [], None
+                elif token in _QUOTE_END:
+                    state = token
+                    parts.append(token)
+                    if start is None:
+                        start = lineno
+                elif token == "/*":
+                    state = "/*"
+                    keep_comment = line.startswith(("/*!", "/*+"), match.start())
+                    parts.append(token if keep_comment else " ")
+                    if keep_comment and start is None:
+                        start = lineno
+                else:
+                    # -- or # comment: skip the rest of the line
+                    parts.append("\n")
+                    break
+            elif state == "/*":
+                close = line.find("*/", pos)
+                if close < 0:
+                    if keep_comment:
+                        parts.append(line[pos:])
+                    break
+                if keep_comment:
+                    parts.append(line[pos:close + 2])
+                state = None
+                pos = close + 2
+            else:
+                match = _QUOTE_END[state].match(line, pos)
+                if match is None:
+                    # The quoted token continues on the next line
+                    parts.append(line[pos:])
+                    break
+                parts.append(match.group())
+                state = None
+                pos = match.end()
+
+    if state is not None and state != "/*":
+        raise SQLScriptError(path, start or lineno, "".join(parts), f"unterminated {state} quote")
+    statement = "".join(parts).strip()
+    if statement:
+        yield statement, start
+
+
+def open_script(path: str):
+    """Open a .sql or .sql.gz file for streaming; returns (text_stream, raw_binary_file)."""
+    raw = open(path, "rb")
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding="utf-8"), raw
+    return io.TextIOWrapper(raw, encoding="utf-8"), raw
+
+
+def run_sql_file(
+    path: str,
+    connection,
+    batch_size: int = 500,
+    progress: Optional[Callable[[str], None]] = print,
+    progress_interval: float = 5.0,
+) -> int:
+    """
+    Execute every statement in `path` on a SQLAlchemy Connection, committing
+    every `batch_size` statements. Raises SQLScriptError at the first failure
+    after rolling back the open batch. Returns the number of statements run.
+    """
+    stream, raw = open_script(path)
+    total_bytes = os.path.getsize(path)
+    executed = pending = 0
+    next_report = time.monotonic() + progress_interval
+    try:
+        for statement, line in iter_statements(stream, path):
+            try:
+                # no_parameters: statements go to the driver verbatim (no %-formatting, no :binds)
+                connection.exec_driver_sql(statement, execution_options={"no_parameters": True})
+            except Exception as e:
+                connection.rollback()
+                raise SQLScriptError(path, line, statement, e) from e
+            executed += 1
+            pending += 1
+            if pending >= batch_size:
+                connection.commit()
+                pending = 0
+            if progress and time.monotonic() >= next_report:
+                done = raw.tell()
+                progress(f"… {path}: {executed:,} statements, {done / max(total_bytes, 1):.0%} "
+                         f"({done / 1e6:,.0f} / {total_bytes / 1e6:,.0f} MB)")
+                next_report = time.monotonic() + progress_interval
+        connection.commit()
+    finally:
+        stream.close()
+    return executed
@@ -7,6 +7,14 @@ DROP TRIGGER IF EXISTS trg_su_after_update;
 DROP TRIGGER IF EXISTS trg_su_after_delete;
 DROP TRIGGER IF EXISTS trg_room_after_update;
 DROP TRIGGER IF EXISTS trg_service_after_update;
+DROP TRIGGER IF EXISTS trg_room_status_update;
+DROP TRIGGER IF EXISTS trg_booking_status_checkin;
+DROP TRIGGER IF EXISTS trg_booking_status_checkout;
+DROP TRIGGER IF EXISTS trg_validate_dates_before_insert;
+DROP TRIGGER IF EXISTS trg_validate_dates_before_update;
+
+-- Trigger bodies contain ';', so statements end with // inside this block
+DELIMITER //
 
 -- Trigger 1
 CREATE TRIGGER trg_room_status_update
@@ -20,7 +28,7 @@ BEGIN
         ELSE status
     END
     WHERE room_id = NEW.room_id;
-END;
+END//
 
 -- Trigger 2
 CREATE TRIGGER trg_booking_status_checkin
@@ -33,7 +41,7 @@ BEGIN
             SET MESSAGE_TEXT = 'Cannot check in before check-in date';
         END IF;
     END IF;
-END;
+END//
 
 -- Trigger 3
 CREATE TRIGGER trg_booking_status_checkout
@@ -46,7 +54,7 @@ BEGIN
             SET MESSAGE_TEXT = 'Cannot check out before check-out date';
         END IF;
     END IF;
-END;
+END//
 
 -- Trigger 4
 CREATE TRIGGER trg_validate_dates_before_insert
@@ -62,7 +70,7 @@ BEGIN
         SIGNAL SQLSTATE '45000'
         SET MESSAGE_TEXT = 'Check-in date cannot be in the past';
     END IF;
-END;
+END//
 
 -- Trigger 5
 CREATE TRIGGER trg_validate_dates_before_update
@@ -73,4 +81,6 @@ BEGIN
         SIGNAL SQLSTATE '45000'
         SET MESSAGE_TEXT = 'Check-out date must be after check-in date';
     END IF;
-END;
+END//
+
+DELIMITER ;
@@ -0,0 +1,53 @@
+"""
+expand.py — `?expand=` handling for the composite booking and guest endpoints.
+
+crud loads the requested relationships eagerly, so a booking with its room,
+guest, payments and service lines costs a fixed number of queries. Only the
+expanded relationships are read while serializing; the rest are left out of
+the response instead of being lazy-loaded.
+"""
+
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+import crud
+import schemas
+
+# expand name -> ORM attribute holding it
+BOOKING_ATTRIBUTES = {"room": "room", "guest": "guest", "payments": "payments", "services": "service_usages"}
+GUEST_ATTRIBUTES = {"phones": "phones", "bookings": "bookings"}
+
+
+def parse(expand: Optional[str], allowed: Dict) -> List[str]:
+    """Split a comma-separated expand list, rejecting names not in `allowed`"""
+    names = list(dict.fromkeys(name.strip() for name in (expand or "").split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot expand {', '.join(unknown)}; choose from {', '.join(allowed)}"
+        )
+    return names
+
+
+def parse_booking(expand: Optional[str]) -> List[str]:
+    return parse(expand, crud.BOOKING_EXPANSIONS)
+
+
+def parse_guest(expand: Optional[str]) -> List[str]:
+    return parse(expand, crud.GUEST_EXPANSIONS)
+
+
+def _detail(detail_model, base_model, obj, expand: List[str], attributes: Dict[str, str]):
+    fields = base_model.model_validate(obj).model_dump()
+    fields.update({name: getattr(obj, attributes[name]) for name in expand})
+    return detail_model(**fields)
+
+
+def booking_detail(booking, expand: List[str]) -> schemas.BookingDetail:
+    return _detail(schemas.BookingDetail, schemas.BookingWithTotal, booking, expand, BOOKING_ATTRIBUTES)
+
+
+def guest_detail(guest, expand: List[str]) -> schemas.GuestDetail:
+    return _detail(schemas.GuestDetail, schemas.GuestResponse, guest, expand, GUEST_ATTRIBUTES)
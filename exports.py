@@ -0,0 +1,172 @@
+"""
+exports.py — Streaming CSV / NDJSON exports of guests, bookings and payments.
+
+Rows are read through a server-side cursor (stream_results + yield_per, which
+is a PyMySQL SSCursor on MySQL) and encoded one chunk at a time, so an export
+of millions of rows runs in bounded memory and the first bytes go out as soon
+as the first chunk arrives. Serves the FastAPI /exports/* endpoints and the
+Flask /api/guests/export* routes that the guest templates link to.
+"""
+
+import csv
+import enum
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import and_, func, or_, select, text
+
+import models
+from config import settings
+from database import get_read_engine
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+PERIODS = {"today": 0, "week": 7, "month": 30, "quarter": 91, "year": 365}
+
+
+def _value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def guests_query(
+    ids: Optional[List[int]] = None,
+    term: Optional[str] = None,
+    search_type: str = "all",
+    registered_since: Optional[date] = None,
+    min_bookings: Optional[int] = None,
+):
+    """Guests with their phones (comma separated), optionally filtered like the search page."""
+    guest, phone, booking = models.Guest.__table__, models.GuestPhone.__table__, models.Booking.__table__
+    phones = select(func.group_concat(phone.c.phone)).where(phone.c.guest_id == guest.c.guest_id).scalar_subquery()
+    stmt = select(guest.c.guest_id, guest.c.name, guest.c.email, phones.label("phones"), guest.c.created_at)
+
+    if ids is not None:
+        stmt = stmt.where(guest.c.guest_id.in_(ids))
+    term = (term or "").strip()
+    if term:
+        has_phone = select(phone.c.guest_id).where(
+            and_(phone.c.guest_id == guest.c.guest_id, phone.c.phone.contains(term, autoescape=True))
+        ).exists()
+        by_id = guest.c.guest_id == int(term) if term.isdigit() else None
+        predicates = {
+            "name": guest.c.name.contains(term, autoescape=True),
+            "email": guest.c.email.contains(term, autoescape=True),
+            "phone": has_phone,
+            "guest_id": by_id if by_id is not None else guest.c.guest_id.is_(None),
+        }
+        if search_type in predicates:
+            stmt = stmt.where(predicates[search_type])
+        else:
+            stmt = stmt.where(or_(*(p for key, p in predicates.items() if key != "guest_id" or by_id is not None)))
+    if registered_since:
+        stmt = stmt.where(guest.c.created_at >= registered_since)
+    if min_bookings:
+        count = select(func.count()).where(booking.c.guest_id == guest.c.guest_id).scalar_subquery()
+        stmt = stmt.where(count >= min_bookings)
+    return stmt.order_by(guest.c.guest_id)
+
+
+def bookings_query(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    hotel_id: Optional[int] = None,
+    guest_id: Optional[int] = None,
+):
+    """Bookings with their hotel, filtered by check-in date range."""
+    booking, room = models.Booking.__table__, models.Room.__table__
+    stmt = select(
+        booking.c.booking_id, booking.c.guest_id, room.c.hotel_id, booking.c.room_id, room.c.room_number,
+        booking.c.check_in_date, booking.c.check_out_date, booking.c.booking_date, booking.c.status,
+        booking.c.total_amount,
+    ).select_from(booking.join(room, booking.c.room_id == room.c.room_id))
+    if date_from:
+        stmt = stmt.where(booking.c.check_in_date >= date_from)
+    if date_to:
+        stmt = stmt.where(booking.c.check_in_date < date_to + timedelta(days=1))
+    if hotel_id is not None:
+        stmt = stmt.where(room.c.hotel_id == hotel_id)
+    if guest_id is not None:
+        stmt = stmt.where(booking.c.guest_id == guest_id)
+    return stmt.order_by(booking.c.booking_id)
+
+
+def payments_query(date_from: Optional[date] = None, date_to: Optional[date] = None, status=None):
+    """Payments filtered by payment date range and status."""
+    payment = models.Payment.__table__
+    stmt = select(
+        payment.c.payment_id, payment.c.booking_id, payment.c.payment_date, payment.c.amount,
+        payment.c.payment_method, payment.c.payment_status,
+    )
+    if date_from:
+        stmt = stmt.where(payment.c.payment_date >= date_from)
+    if date_to:
+        stmt = stmt.where(payment.c.payment_date <= date_to)
+    if status:
+        stmt = stmt.where(payment.c.payment_status == models.PaymentStatus(status))
+    return stmt.order_by(payment.c.payment_id)
+
+
+def period_start(period: Optional[str]) -> Optional[date]:
+    """First day of a search-page period (today, week, month, quarter, year)."""
+    if period not in PERIODS:
+        return None
+    return date.today() - timedelta(days=PERIODS[period])
+
+
+def _encode_csv(rows: Iterable, header: Optional[List[str]] = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows([_value(v) for v in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: Iterable, keys: List[str]) -> bytes:
+    return "".join(
+        json.dumps({k: _value(v) for k, v in zip(keys, row)}, default=str) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def stream(stmt, fmt: str = "csv", chunk_rows: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Execute `stmt` on a dedicated connection with a server-side cursor and
+    yield the encoded output chunk by chunk. The connection goes back to the
+    pool when the generator finishes; on MySQL, one abandoned mid-result (the
+    client disconnected) is closed instead.
+    """
+    chunk_rows = chunk_rows or settings.EXPORT_CHUNK_ROWS
+    with get_read_engine().connect() as conn:
+        long_timeout = conn.dialect.name == "mysql"
+        if long_timeout:
+            # A slow client must not make the server abort the unbuffered result
+            conn.execute(text("SET SESSION net_write_timeout = :t"), {"t": settings.EXPORT_NET_WRITE_TIMEOUT})
+        finished = False
+        try:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_rows).execute(stmt)
+            keys = list(result.keys())
+            if fmt == "csv":
+                yield _encode_csv([], keys)
+            for rows in result.partitions():
+                yield _encode_csv(rows) if fmt == "csv" else _encode_ndjson(rows, keys)
+            finished = True
+        finally:
+            # Otherwise the long timeout outlives the export on the pooled connection
+            if long_timeout and finished:
+                conn.execute(text("SET SESSION net_write_timeout = DEFAULT"))
+            elif long_timeout:
+                # Abandoned mid-result: discard the connection rather than drain the rest of the rows
+                conn.invalidate()
+
+
+def filename(name: str, fmt: str) -> str:
+    return f"{name}_{date.today().isoformat()}.{fmt}"
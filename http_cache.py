@@ -0,0 +1,115 @@
+"""
+http_cache.py — ETag response cache for the read-mostly catalog endpoints.
+
+Responses are kept per (path, query string) as already-serialized JSON with an
+ETag hashed from that body (and the next-page cursor), so the validator
+changes whenever the representation does. A hit costs neither a query nor a Pydantic pass: a matching
+If-None-Match gets 304, anything else the stored body. crud writes to hotels,
+employees, rooms and services evict their namespace; HTTP_CACHE_TTL bounds
+staleness from writers outside this process (other workers, the dashboard).
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from config import settings
+from database import reading_from_replica
+from pagination import NEXT_CURSOR_HEADER
+
+HOTELS = "hotels"
+EMPLOYEES = "employees"
+ROOMS = "rooms"
+SERVICES = "services"
+
+_lock = threading.Lock()
+_entries: Dict[Tuple[str, str], dict] = {}
+_generations: Dict[str, int] = {}
+_invalidated_at: Dict[str, float] = {}
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def invalidate(*namespaces: str):
+    """Drop cached responses for the given namespaces (called by crud writers)"""
+    with _lock:
+        for namespace in namespaces:
+            _generations[namespace] = _generations.get(namespace, 0) + 1
+            _invalidated_at[namespace] = time.monotonic()
+        for key in [k for k, e in _entries.items() if e["namespace"] in namespaces]:
+            del _entries[key]
+
+
+def _key(request: Request) -> Tuple[str, str]:
+    return request.url.path, str(sorted(request.query_params.multi_items()))
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _respond(request: Request, entry: dict) -> Response:
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if entry["next_cursor"]:
+        headers[NEXT_CURSOR_HEADER] = entry["next_cursor"]
+    if _matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def lookup(request: Request, namespace: str) -> Tuple[Optional[Response], int]:
+    """
+    Return (response, generation). On a hit the response is ready to send;
+    on a miss pass the generation on to store() after loading the data.
+    """
+    key = _key(request)
+    with _lock:
+        generation = _generations.get(namespace, 0)
+        entry = _entries.get(key) if settings.HTTP_CACHE_ENABLED else None
+        if entry is not None and time.monotonic() >= entry["expires"]:
+            del _entries[key]
+            entry = None
+    if entry is None:
+        return None, generation
+    return _respond(request, entry), generation
+
+
+def _etag(body: bytes, next_cursor: Optional[str]) -> str:
+    digest = hashlib.sha1(body)
+    digest.update(b"|" + (next_cursor or "").encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def store(request: Request, namespace: str, generation: int, response_model, payload,
+          next_cursor: Optional[str] = None) -> Response:
+    """Serialize `payload` once through `response_model`, cache it and build the response"""
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters.setdefault(response_model, TypeAdapter(response_model))
+
+    key = _key(request)
+    body = adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+    entry = {
+        "namespace": namespace,
+        "etag": _etag(body, next_cursor),
+        "body": body,
+        "next_cursor": next_cursor,
+        "expires": time.monotonic() + settings.HTTP_CACHE_TTL,
+    }
+    with _lock:
+        # Skip the insert if a write evicted this namespace while we were loading, or
+        # recently enough that a replica read may predate it
+        recent_write = time.monotonic() - _invalidated_at.get(namespace, float("-inf")) < settings.READ_YOUR_WRITES_SECONDS
+        if (settings.HTTP_CACHE_ENABLED and _generations.get(namespace, 0) == generation
+                and not (recent_write and reading_from_replica())):
+            if key not in _entries and len(_entries) >= settings.HTTP_CACHE_MAX_ENTRIES:
+                del _entries[next(iter(_entries))]
+            _entries[key] = entry
+    return _respond(request, entry)
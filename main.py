@@ -1,162 +1,408 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 from datetime import date
-
-import importlib
+import base64
+import secrets
 import sys
 
-# Force reload schemas module
-if 'schemas' in sys.modules:
-    importlib.reload(sys.modules['schemas'])
-    
-import models, schemas, crud
-from database import engine, get_db
+import schemas, crud, models
+import availability
+import expand as expansions
+import exports
+import reporting
+import http_cache
+import routing
+from pagination import NEXT_CURSOR_HEADER, InvalidCursor, set_next_cursor
+from database import ensure_schema, get_db, SessionLocal, dispose_async_engine, slow_queries
 from config import settings
 
-# Create tables
-models.Base.metadata.create_all(bind=engine)
+router = APIRouter()
+
+PageLimit = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE)
+
+
+def check_batch_size(rows: list):
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ROWS} rows per request")
+
+
+def integrity_error_handler(request: Request, exc: IntegrityError):
+    # Bulk batches are pre-validated; this only fires on a race with another writer
+    return JSONResponse(status_code=409, content={"detail": f"Rejected by the database: {exc.orig}"})
+
+
+def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def booking_conflict_handler(request: Request, exc: crud.BookingConflict):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+def invalid_booking_handler(request: Request, exc: crud.InvalidBooking):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
+def on_startup():
+    """One-time work before serving: optional schema check, then the availability index"""
+    if settings.DEBUG:
+        print(f"✅ Loaded configuration for database: {settings.DB_NAME}")
+        print(f"🔗 Connection URL: {make_url(settings.DATABASE_URL).render_as_string(hide_password=True)}")
+    if settings.DB_SCHEMA_CHECK:
+        ensure_schema()
+    if not settings.AVAILABILITY_INDEX_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        availability.index.load(db)
+    except Exception as e:
+        print("❌ Availability index load failed, searches will use SQL:", e)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    on_startup()
+    yield
+    await dispose_async_engine()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the API. Nothing here touches the database: the engine is created on
+    first use and the schema is only checked when DB_SCHEMA_CHECK is set.
+    """
+    app = FastAPI(
+        title=settings.API_TITLE,
+        version=settings.API_VERSION,
+        description="Complete Hotel Management System API",
+        lifespan=lifespan
+    )
+    app.add_exception_handler(IntegrityError, integrity_error_handler)
+    app.add_exception_handler(InvalidCursor, invalid_cursor_handler)
+    app.add_exception_handler(crud.BookingConflict, booking_conflict_handler)
+    app.add_exception_handler(crud.InvalidBooking, invalid_booking_handler)
 
-# Initialize FastAPI
-app = FastAPI(
-    title=settings.API_TITLE,
-    version=settings.API_VERSION,
-    description="Complete Hotel Management System API"
-)
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+    )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # GET / HEAD read from the replica (when configured); writers are pinned to the primary briefly
+    app.add_middleware(routing.ReplicaRoutingMiddleware)
+
+    if settings.METRICS_ENABLED:
+        import metrics
+        app.add_middleware(metrics.MetricsMiddleware)
+
+        @app.get("/metrics", include_in_schema=False)
+        def read_metrics():
+            body, content_type = metrics.exposition()
+            return Response(body, media_type=content_type)
+
+    # Opt-in async mode: registered first, so its handlers take over the paths they cover
+    if settings.ASYNC_API:
+        import async_api
+        app.include_router(async_api.router)
+    app.include_router(router)
+    return app
 
 
 # ============= HOTEL ENDPOINTS =============
-@app.post("/hotels/", response_model=schemas.HotelResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/hotels/", response_model=schemas.HotelResponse, status_code=status.HTTP_201_CREATED)
 def create_hotel(hotel: schemas.HotelCreate, db: Session = Depends(get_db)):
     return crud.create_hotel(db, hotel)
 
-@app.get("/hotels/", response_model=List[schemas.HotelResponse])
-def read_hotels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_hotels(db, skip, limit)
-
-@app.get("/hotels/{hotel_id}", response_model=schemas.HotelResponse)
-def read_hotel(hotel_id: int, db: Session = Depends(get_db)):
+@router.get("/hotels/", response_model=List[schemas.HotelResponse])
+def read_hotels(request: Request, limit: int = PageLimit, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    cached, generation = http_cache.lookup(request, http_cache.HOTELS)
+    if cached:
+        return cached
+    hotels, next_cursor = crud.get_hotels(db, limit, cursor)
+    return http_cache.store(request, http_cache.HOTELS, generation, List[schemas.HotelResponse], hotels, next_cursor)
+
+@router.get("/hotels/{hotel_id}", response_model=schemas.HotelResponse)
+def read_hotel(hotel_id: int, request: Request, db: Session = Depends(get_db)):
+    cached, generation = http_cache.lookup(request, http_cache.HOTELS)
+    if cached:
+        return cached
     hotel = crud.get_hotel(db, hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return hotel
+    return http_cache.store(request, http_cache.HOTELS, generation, schemas.HotelResponse, hotel)
 
-@app.put("/hotels/{hotel_id}", response_model=schemas.HotelResponse)
+@router.put("/hotels/{hotel_id}", response_model=schemas.HotelResponse)
 def update_hotel(hotel_id: int, hotel: schemas.HotelCreate, db: Session = Depends(get_db)):
     updated = crud.update_hotel(db, hotel_id, hotel)
     if not updated:
         raise HTTPException(status_code=404, detail="Hotel not found")
     return updated
 
-@app.delete("/hotels/{hotel_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/hotels/{hotel_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_hotel(hotel_id: int, db: Session = Depends(get_db)):
     if not crud.delete_hotel(db, hotel_id):
         raise HTTPException(status_code=404, detail="Hotel not found")
 
 
 # ============= EMPLOYEE ENDPOINTS =============
-@app.post("/employees/", response_model=schemas.EmployeeResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/employees/", response_model=schemas.EmployeeResponse, status_code=status.HTTP_201_CREATED)
 def create_employee(employee: schemas.EmployeeCreate, db: Session = Depends(get_db)):
     return crud.create_employee(db, employee)
 
-@app.get("/employees/{emp_id}", response_model=schemas.EmployeeResponse)
+@router.get("/employees/{emp_id}", response_model=schemas.EmployeeResponse)
 def read_employee(emp_id: int, db: Session = Depends(get_db)):
     employee = crud.get_employee(db, emp_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
-@app.get("/hotels/{hotel_id}/employees", response_model=List[schemas.EmployeeResponse])
-def read_hotel_employees(hotel_id: int, db: Session = Depends(get_db)):
-    return crud.get_employees_by_hotel(db, hotel_id)
+@router.get("/hotels/{hotel_id}/employees", response_model=List[schemas.EmployeeResponse])
+def read_hotel_employees(
+    hotel_id: int,
+    request: Request,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    cached, generation = http_cache.lookup(request, http_cache.EMPLOYEES)
+    if cached:
+        return cached
+    employees, next_cursor = crud.get_employees_by_hotel(db, hotel_id, limit, cursor)
+    return http_cache.store(request, http_cache.EMPLOYEES, generation, List[schemas.EmployeeResponse], employees, next_cursor)
 
 
 # ============= ROOM ENDPOINTS =============
-@app.post("/rooms/", response_model=schemas.RoomResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/rooms/", response_model=schemas.RoomResponse, status_code=status.HTTP_201_CREATED)
 def create_room(room: schemas.RoomCreate, db: Session = Depends(get_db)):
     return crud.create_room(db, room)
 
-@app.get("/rooms/{room_id}", response_model=schemas.RoomResponse)
-def read_room(room_id: int, db: Session = Depends(get_db)):
+@router.post("/rooms/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+def create_rooms_bulk(rows: List[dict], db: Session = Depends(get_db)):
+    check_batch_size(rows)
+    return crud.create_rooms_bulk(db, rows)
+
+@router.get("/rooms/{room_id}", response_model=schemas.RoomResponse)
+def read_room(room_id: int, request: Request, db: Session = Depends(get_db)):
+    cached, generation = http_cache.lookup(request, http_cache.ROOMS)
+    if cached:
+        return cached
     room = crud.get_room(db, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
-    return room
+    return http_cache.store(request, http_cache.ROOMS, generation, schemas.RoomResponse, room)
 
-@app.get("/hotels/{hotel_id}/available-rooms", response_model=List[schemas.RoomResponse])
+@router.get("/hotels/{hotel_id}/available-rooms", response_model=List[schemas.RoomResponse])
 def get_available_rooms(
     hotel_id: int, 
     check_in: date, 
     check_out: date, 
     db: Session = Depends(get_db)
 ):
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
     return crud.get_available_rooms(db, hotel_id, check_in, check_out)
 
+@router.get("/hotels/{hotel_id}/availability-calendar", response_model=schemas.AvailabilityCalendarResponse)
+def get_availability_calendar(
+    hotel_id: int,
+    start_date: date,
+    nights: int = Query(30, ge=1, le=365),
+    room_type: Optional[str] = None,
+    encoding: str = Query("spans", pattern="^(spans|bits)$"),
+    db: Session = Depends(get_db)
+):
+    rooms, matrix = crud.get_availability_calendar(db, hotel_id, start_date, nights, room_type)
+    calendar = {
+        "hotel_id": hotel_id,
+        "start_date": start_date,
+        "nights": nights,
+        "encoding": encoding,
+        "rooms": rooms,
+    }
+    if encoding == "bits":
+        calendar["bits"] = base64.b64encode(availability.pack_bits(matrix)).decode("ascii")
+    else:
+        calendar["spans"] = availability.booked_spans(matrix)
+    return calendar
+
+
+# ============= RATE PLAN ENDPOINTS =============
+def check_rate_plan_dates(rate_plan: schemas.RatePlanCreate):
+    if rate_plan.end_date <= rate_plan.start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+@router.post("/rate-plans/", response_model=schemas.RatePlanResponse, status_code=status.HTTP_201_CREATED)
+def create_rate_plan(rate_plan: schemas.RatePlanCreate, db: Session = Depends(get_db)):
+    check_rate_plan_dates(rate_plan)
+    return crud.create_rate_plan(db, rate_plan)
+
+@router.get("/hotels/{hotel_id}/rate-plans", response_model=List[schemas.RatePlanResponse])
+def read_rate_plans(
+    hotel_id: int,
+    response: Response,
+    room_type: Optional[str] = None,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    plans, next_cursor = crud.get_rate_plans(db, hotel_id, room_type, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return plans
+
+@router.put("/rate-plans/{rate_plan_id}", response_model=schemas.RatePlanResponse)
+def update_rate_plan(rate_plan_id: int, rate_plan: schemas.RatePlanCreate, db: Session = Depends(get_db)):
+    check_rate_plan_dates(rate_plan)
+    updated = crud.update_rate_plan(db, rate_plan_id, rate_plan)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Rate plan not found")
+    return updated
+
+@router.delete("/rate-plans/{rate_plan_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rate_plan(rate_plan_id: int, db: Session = Depends(get_db)):
+    if not crud.delete_rate_plan(db, rate_plan_id):
+        raise HTTPException(status_code=404, detail="Rate plan not found")
+
+@router.get("/hotels/{hotel_id}/quote", response_model=List[schemas.RoomQuote])
+def quote_rooms(
+    hotel_id: int,
+    check_in: date,
+    check_out: date,
+    room_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Available rooms for the stay with their price, night by night from the hotel's rate plans"""
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
+    return crud.quote_rooms(db, hotel_id, check_in, check_out, room_type)
+
 
 # ============= GUEST ENDPOINTS =============
-@app.post("/guests/", response_model=schemas.GuestResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/guests/", response_model=schemas.GuestResponse, status_code=status.HTTP_201_CREATED)
 def create_guest(guest: schemas.GuestCreate, db: Session = Depends(get_db)):
     return crud.create_guest(db, guest)
 
-@app.get("/guests/{guest_id}", response_model=schemas.GuestResponse)
-def read_guest(guest_id: int, db: Session = Depends(get_db)):
-    guest = crud.get_guest(db, guest_id)
+@router.post("/guests/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+def create_guests_bulk(rows: List[dict], db: Session = Depends(get_db)):
+    check_batch_size(rows)
+    return crud.create_guests_bulk(db, rows)
+
+@router.get("/guests/{guest_id}", response_model=schemas.GuestDetail, response_model_exclude_unset=True)
+def read_guest(guest_id: int, expand: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a guest; `expand=phones,bookings` embeds related rows"""
+    names = expansions.parse_guest(expand)
+    guest = crud.get_guest(db, guest_id, names)
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found")
-    return guest
+    return expansions.guest_detail(guest, names)
 
-@app.get("/guests/search/{search_term}", response_model=List[schemas.GuestResponse])
-def search_guests(search_term: str, db: Session = Depends(get_db)):
-    return crud.search_guests(db, search_term)
+@router.get("/guests/search/{search_term}", response_model=List[schemas.GuestResponse])
+def search_guests(
+    search_term: str,
+    limit: int = Query(20, ge=1, le=settings.GUEST_SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    return crud.search_guests(db, search_term, limit, offset)
 
 
 # ============= BOOKING ENDPOINTS =============
-@app.post("/bookings/", response_model=schemas.BookingResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/bookings/", response_model=schemas.BookingResponse, status_code=status.HTTP_201_CREATED)
 def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)):
     return crud.create_booking(db, booking)
 
-@app.get("/bookings/{booking_id}", response_model=schemas.BookingResponse)
-def read_booking(booking_id: int, db: Session = Depends(get_db)):
-    booking = crud.get_booking(db, booking_id)
+@router.post("/bookings/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+def create_bookings_bulk(rows: List[dict], db: Session = Depends(get_db)):
+    check_batch_size(rows)
+    return crud.create_bookings_bulk(db, rows)
+
+@router.get("/bookings/{booking_id}", response_model=schemas.BookingDetail, response_model_exclude_unset=True)
+def read_booking(booking_id: int, expand: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a booking; `expand=room,guest,payments,services` embeds related rows"""
+    names = expansions.parse_booking(expand)
+    booking = crud.get_booking(db, booking_id, names)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return expansions.booking_detail(booking, names)
 
-@app.get("/guests/{guest_id}/bookings", response_model=List[schemas.BookingResponse])
-def read_guest_bookings(guest_id: int, db: Session = Depends(get_db)):
-    return crud.get_bookings_by_guest(db, guest_id)
+@router.put("/bookings/{booking_id}", response_model=schemas.BookingResponse)
+def update_booking(booking_id: int, booking: schemas.BookingUpdate, db: Session = Depends(get_db)):
+    updated = crud.update_booking(db, booking_id, booking)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return updated
+
+@router.get("/guests/{guest_id}/bookings", response_model=List[schemas.BookingDetail], response_model_exclude_unset=True)
+def read_guest_bookings(
+    guest_id: int,
+    response: Response,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    names = expansions.parse_booking(expand)
+    bookings, next_cursor = crud.get_bookings_by_guest(db, guest_id, limit, cursor, names)
+    set_next_cursor(response, next_cursor)
+    return [expansions.booking_detail(booking, names) for booking in bookings]
 
 
 # ============= PAYMENT ENDPOINTS =============
-@app.post("/payments/", response_model=schemas.PaymentResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/payments/", response_model=schemas.PaymentResponse, status_code=status.HTTP_201_CREATED)
 def create_payment(payment: schemas.PaymentCreate, db: Session = Depends(get_db)):
     return crud.create_payment(db, payment)
 
-@app.get("/bookings/{booking_id}/payments", response_model=List[schemas.PaymentResponse])
-def read_booking_payments(booking_id: int, db: Session = Depends(get_db)):
-    return crud.get_payments_by_booking(db, booking_id)
+@router.get("/bookings/{booking_id}/payments", response_model=List[schemas.PaymentResponse])
+def read_booking_payments(
+    booking_id: int,
+    response: Response,
+    limit: int = PageLimit,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    payments, next_cursor = crud.get_payments_by_booking(db, booking_id, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return payments
 
 
 # ============= SERVICE ENDPOINTS =============
-@app.post("/services/", response_model=schemas.ServiceResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/services/", response_model=schemas.ServiceResponse, status_code=status.HTTP_201_CREATED)
 def create_service(service: schemas.ServiceCreate, db: Session = Depends(get_db)):
     return crud.create_service(db, service)
 
-@app.get("/services/", response_model=List[schemas.ServiceResponse])
-def read_services(db: Session = Depends(get_db)):
-    return crud.get_services(db)
+@router.get("/services/", response_model=List[schemas.ServiceResponse])
+def read_services(request: Request, limit: int = PageLimit, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    cached, generation = http_cache.lookup(request, http_cache.SERVICES)
+    if cached:
+        return cached
+    services, next_cursor = crud.get_services(db, limit, cursor)
+    return http_cache.store(request, http_cache.SERVICES, generation, List[schemas.ServiceResponse], services, next_cursor)
+
+@router.patch("/services/{service_id}/price", response_model=schemas.ServicePriceUpdateResult)
+def update_service_price(
+    service_id: int,
+    price_update: schemas.ServicePriceUpdate,
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    result = crud.update_service_price(db, service_id, price_update.price, dry_run)
+    if not result:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return result
 
-@app.post("/bookings/{booking_id}/services", response_model=schemas.ServiceUsageResponse)
+@router.post("/bookings/{booking_id}/services", response_model=schemas.ServiceUsageResponse)
 def add_service_to_booking(
     booking_id: int,
     service_usage: schemas.ServiceUsageCreate,
@@ -165,8 +411,98 @@ def add_service_to_booking(
     return crud.add_service_to_booking(db, service_usage)
 
 
+# ============= EXPORT ENDPOINTS =============
+ExportFormat = Query("csv", pattern="^(csv|ndjson)$")
+
+
+def export_response(stmt, name: str, fmt: str) -> StreamingResponse:
+    # Streams from its own connection; a request-scoped Session would close before the body is sent
+    return StreamingResponse(
+        exports.stream(stmt, fmt),
+        media_type=exports.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{exports.filename(name, fmt)}"'}
+    )
+
+@router.get("/exports/guests")
+def export_guests(
+    search: Optional[str] = None,
+    registered_since: Optional[date] = None,
+    min_bookings: Optional[int] = Query(None, ge=1),
+    format: str = ExportFormat
+):
+    stmt = exports.guests_query(term=search, registered_since=registered_since, min_bookings=min_bookings)
+    return export_response(stmt, "guests", format)
+
+@router.get("/exports/bookings")
+def export_bookings(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    hotel_id: Optional[int] = None,
+    guest_id: Optional[int] = None,
+    format: str = ExportFormat
+):
+    return export_response(exports.bookings_query(date_from, date_to, hotel_id, guest_id), "bookings", format)
+
+@router.get("/exports/payments")
+def export_payments(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    payment_status: Optional[models.PaymentStatus] = None,
+    format: str = ExportFormat
+):
+    return export_response(exports.payments_query(date_from, date_to, payment_status), "payments", format)
+
+
+# ============= REPORT ENDPOINTS =============
+@router.get("/reports/performance")
+def read_performance_report(
+    start: date,
+    end: date,
+    by: str = Query("hotel", pattern="^(hotel|room_type)$"),
+    period: str = Query("day", pattern="^(day|month|year|total)$"),
+    hotel_id: Optional[int] = None,
+    format: str = Query("json", pattern="^(json|csv)$")
+):
+    """Occupancy %, ADR and RevPAR per hotel (or room type) and period, from start to end inclusive"""
+    try:
+        rows = reporting.performance_report(start, end, by, period, hotel_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "csv":
+        return Response(
+            reporting.to_csv(rows),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="performance_{start}_{end}.csv"'}
+        )
+    return {"start": start, "end": end, "by": by, "period": period, "totals": reporting.totals(rows), "rows": rows}
+
+
+# ============= ADMIN ENDPOINTS =============
+admin_bearer = HTTPBearer(auto_error=False)
+
+
+def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Depends(admin_bearer)):
+    """Bearer ADMIN_API_TOKEN; without a configured token the admin endpoints do not exist"""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode("utf-8"), settings.ADMIN_API_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=401, detail="Admin token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+@router.get("/admin/slow-queries", dependencies=[Depends(require_admin)])
+def read_slow_queries(limit: int = Query(100, ge=1, le=settings.SLOW_QUERY_LOG_SIZE)):
+    """Recent statements over SLOW_QUERY_THRESHOLD_MS in this process, newest first, with their EXPLAIN"""
+    return {"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "entries": slow_queries.entries(limit)}
+
+@router.delete("/admin/slow-queries", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
+def clear_slow_queries():
+    slow_queries.clear()
+
+
 # ============= ROOT ENDPOINT =============
-@app.get("/")
+@router.get("/")
 def root():
     return {
         "message": "Hotel Management System API",
@@ -175,6 +511,13 @@ def root():
     }
 
 
+app = create_app()
+
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if "--create-schema" in sys.argv:
+        ensure_schema()
+        print("✅ Schema check complete")
+    else:
+        import uvicorn
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
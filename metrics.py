@@ -0,0 +1,208 @@
+"""
+metrics.py — Prometheus metrics for the API and the dashboard.
+
+Per route: request latency, and the number of queries and total database time
+each request spent. Per engine role (primary / replica) and kind (sync /
+async): pool checkout wait, and connections in use and open. Query accounting
+hangs off class-level SQLAlchemy engine events, so the sync engine, the async
+engine and any engine created later are all covered; the dashboard's raw
+DB-API queries report through slow_queries.execute(). The per-request totals live in a context variable,
+which reaches threadpool endpoints and run_sync greenlets alike.
+
+The overhead is two perf_counter() calls per query and a few histogram
+observations per request. Route labels use route templates (/guests/{guest_id}),
+never raw paths, so the series count stays bounded.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database import on_engine_created, slow_queries
+
+UNMATCHED = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "hms_http_request_duration_seconds", "Request latency by route",
+    ["app", "method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    "hms_db_queries_per_request", "Database queries issued per request",
+    ["app", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "hms_db_time_per_request_seconds", "Total database time per request",
+    ["app", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+QUERIES = Counter("hms_db_queries", "Database queries executed", ["app", "route"])
+POOL_CHECKOUT_WAIT = Histogram(
+    "hms_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ["role", "engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5, 30),
+)
+POOL_IN_USE = Gauge("hms_db_pool_connections_in_use", "Pooled connections checked out", ["role", "engine"])
+POOL_OPEN = Gauge("hms_db_pool_connections_open", "Database connections the pool holds open", ["role", "engine"])
+POOL_SIZE = Gauge("hms_db_pool_size", "Configured pool size", ["role", "engine"])
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("hms_request_stats", default=None)
+
+
+# ============= ENGINE INSTRUMENTATION =============
+def _engine_label(engine: Engine) -> str:
+    return "async" if engine.dialect.is_async else "sync"
+
+
+def _time_checkouts(pool, wait: Histogram):
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            wait.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+
+def _instrument_engine(engine: Engine, role: str):
+    """
+    Pool gauges of one of the app's engines, kept by its pool's own events, so
+    raw_connection() checkouts (the dashboard's) count like Session ones. The
+    listeners carry over when dispose() replaces the pool; the timer is re-applied.
+    """
+    labels = (role, _engine_label(engine))
+    wait = POOL_CHECKOUT_WAIT.labels(*labels)
+    in_use, opened = POOL_IN_USE.labels(*labels), POOL_OPEN.labels(*labels)
+    if hasattr(engine.pool, "size"):
+        POOL_SIZE.labels(*labels).set(engine.pool.size())
+
+    _time_checkouts(engine.pool, wait)
+    event.listen(engine, "engine_disposed", lambda disposed: _time_checkouts(disposed.pool, wait))
+    event.listen(engine, "checkout", lambda *args: in_use.inc())
+    event.listen(engine, "checkin", lambda *args: in_use.dec())
+    event.listen(engine, "connect", lambda *args: opened.inc())
+    event.listen(engine, "close", lambda *args: opened.dec())
+    event.listen(engine, "close_detached", lambda *args: opened.dec())
+
+
+on_engine_created(_instrument_engine)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._hms_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and context is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - context._hms_start
+
+
+def _raw_query(seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+
+
+slow_queries.on_raw_query(_raw_query)
+
+
+# ============= REQUEST ACCOUNTING =============
+def begin_request() -> tuple:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(app: str, method: str, route: str, status: int, started: float, stats: RequestStats, token):
+    _current.reset(token)
+    REQUEST_LATENCY.labels(app, method, route, str(status)).observe(time.perf_counter() - started)
+    REQUEST_QUERIES.labels(app, route).observe(stats.queries)
+    REQUEST_DB_TIME.labels(app, route).observe(stats.db_seconds)
+    if stats.queries:
+        QUERIES.labels(app, route).inc(stats.queries)
+
+
+def exposition() -> tuple:
+    """(body, content type) of the Prometheus text format"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware for the FastAPI app; pure ASGI, so streamed responses are not buffered."""
+
+    def __init__(self, app, app_label: str = "api"):
+        self.app = app
+        self.app_label = app_label
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+        stats, token = begin_request()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            end_request(
+                self.app_label, scope["method"], getattr(route, "path", UNMATCHED),
+                status_code, started, stats, token,
+            )
+
+
+def init_flask(app, app_label: str = "dashboard"):
+    """Account every Flask request and serve /metrics from the dashboard process."""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _metrics_begin():
+        g.metrics = (time.perf_counter(), *begin_request())
+
+    @app.after_request
+    def _metrics_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _metrics_end(exc):
+        if "metrics" not in g:
+            return
+        started, stats, token = g.pop("metrics")
+        status = 500 if exc is not None else g.pop("metrics_status", 500)
+        route = request.url_rule.rule if request.url_rule else UNMATCHED
+        end_request(app_label, request.method, route, status, started, stats, token)
+
+    @app.route('/metrics')
+    def route_metrics():
+        body, content_type = exposition()
+        return Response(body, content_type=content_type)
@@ -89,6 +89,28 @@ class Room(Base):
     bookings = relationship("Booking", back_populates="room")
 
 
+class RatePlan(Base):
+    """Nightly rate for one hotel's room type over [start_date, end_date); see pricing.py"""
+    __tablename__ = "rate_plan"
+    
+    rate_plan_id = Column(Integer, primary_key=True, autoincrement=True)
+    hotel_id = Column(Integer, ForeignKey("hotel.hotel_id", ondelete="CASCADE"), nullable=False)
+    room_type = Column(String(50), nullable=False)
+    name = Column(String(100))
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    price_per_night = Column(DECIMAL(10, 2), nullable=False)
+    days_of_week = Column(Integer, nullable=False, default=127)  # bit 0 = Monday ... bit 6 = Sunday
+    priority = Column(Integer, nullable=False, default=0)  # the highest priority plan covering a night wins
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
+    updated_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    
+    __table_args__ = (
+        CheckConstraint('end_date > start_date', name='chk_rate_plan_dates'),
+        Index('idx_rate_plan_hotel_dates', 'hotel_id', 'start_date', 'end_date'),
+    )
+
+
 class Guest(Base):
     __tablename__ = "guest"
     
@@ -98,6 +120,11 @@ class Guest(Base):
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
     
+    __table_args__ = (
+        # n-gram full-text index backing crud.search_guests (plain composite index on other backends)
+        Index('ft_guest_search', 'name', 'email', mysql_prefix='FULLTEXT', mysql_with_parser='ngram'),
+    )
+    
     # Relationships
     phones = relationship("GuestPhone", back_populates="guest", cascade="all, delete-orphan")
     bookings = relationship("Booking", back_populates="guest")
@@ -119,7 +146,7 @@ class Booking(Base):
     
     booking_id = Column(Integer, primary_key=True, autoincrement=True)
     guest_id = Column(Integer, ForeignKey("guest.guest_id", ondelete="RESTRICT"), nullable=False, index=True)
-    room_id = Column(Integer, ForeignKey("room.room_id", ondelete="RESTRICT"), nullable=False, index=True)
+    room_id = Column(Integer, ForeignKey("room.room_id", ondelete="RESTRICT"), nullable=False)
     check_in_date = Column(Date, nullable=False)
     check_out_date = Column(Date, nullable=False)
     booking_date = Column(Date, nullable=False, server_default=func.current_date())
@@ -131,6 +158,9 @@ class Booking(Base):
     __table_args__ = (
         CheckConstraint('check_out_date > check_in_date', name='chk_dates'),
         Index('idx_booking_dates', 'check_in_date', 'check_out_date'),
+        # Availability probes and recent bookings (migration 0001)
+        Index('idx_booking_room_status_dates', 'room_id', 'status', 'check_in_date', 'check_out_date'),
+        Index('idx_booking_booking_date', 'booking_date'),
     )
     
     # Relationships
@@ -152,6 +182,10 @@ class Payment(Base):
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
     
+    __table_args__ = (
+        Index('idx_payment_date', 'payment_date'),  # revenue by date range (migration 0002)
+    )
+    
     # Relationships
     booking = relationship("Booking", back_populates="payments")
 
@@ -181,3 +215,18 @@ class ServiceUsage(Base):
     # Relationships
     booking = relationship("Booking", back_populates="service_usages")
     service = relationship("Service", back_populates="service_usages")
+
+
+class DailyRevenue(Base):
+    """Per-day paid revenue rollup, maintained by crud.create_payment (see revenue.py)"""
+    __tablename__ = "daily_revenue"
+    
+    hotel_id = Column(Integer, ForeignKey("hotel.hotel_id", ondelete="CASCADE"), primary_key=True)
+    revenue_date = Column(Date, primary_key=True)
+    payment_method = Column(Enum(PaymentMethod), primary_key=True)
+    amount = Column(DECIMAL(14, 2), nullable=False, default=0.00)
+    payment_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_daily_revenue_date', 'revenue_date'),
+    )
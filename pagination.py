@@ -0,0 +1,74 @@
+"""
+pagination.py — Keyset (cursor) pagination helpers for the Hotel Management System.
+
+Pages are ordered by a unique key (the primary key, or a (date, id) pair)
+and each page continues strictly after the last key of the previous one, so
+a deep page costs the same index range scan as the first. The key of the last
+row is handed to clients as an opaque continuation token.
+"""
+
+import base64
+import json
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+# List endpoints return one page; the token for the next one goes in this response header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token cannot be decoded for the requested list."""
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> tuple:
+    """Decode a token back into typed key values for `columns`."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong key length")
+        return tuple(
+            date.fromisoformat(v) if col.type.python_type is date else col.type.python_type(v)
+            for col, v in zip(columns, values)
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def _after(columns: Sequence, values: tuple):
+    """(c1, c2, ...) > (v1, v2, ...) expanded so every backend can use the index."""
+    clauses = []
+    for i, (col, value) in enumerate(zip(columns, values)):
+        equal_prefix = [c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, col > value))
+    return or_(*clauses)
+
+
+def keyset_page(query: Query, columns: Sequence, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of `query` ordered by `columns` (ascending, unique together).
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+    rows = query.order_by(*columns).limit(limit + 1).all()
+
+    items = rows[:limit]
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, col.key) for col in columns])
+
+
+def set_next_cursor(response, next_cursor: Optional[str]):
+    """Expose the continuation token on an API response, if there is a next page."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
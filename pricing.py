@@ -0,0 +1,235 @@
+"""
+pricing.py — Rate plans and the nightly rate calendar.
+
+A rate plan (models.RatePlan) prices the nights [start_date, end_date) of one
+hotel's room type, optionally only on some weekdays (days_of_week bitmask,
+bit 0 = Monday). Where plans overlap, the highest priority wins, then the
+newest. Nights no plan covers cost the room's own price_per_night.
+
+RateCalendar keeps, per hotel and room type, prefix sums over a window of
+days: the plan rate in cents and the count of nights no plan covers. A stay
+in a room of type t over nights [i, j) then costs
+
+    (rate_sum[t, j] - rate_sum[t, i]) + (unpriced[t, j] - unpriced[t, i]) * room price
+
+so pricing any number of stays is a handful of array lookups, however many
+nights they span, and needs no query once the hotel's calendar is loaded.
+crud's rate plan writers invalidate the hotel's calendar; RATE_CALENDAR_TTL
+bounds how long edits from other workers go unseen.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+import models
+from config import settings
+from database import replica_reads
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ALL_DAYS = 0b1111111
+WEEKENDS = 0b1100000
+
+
+def cents(amounts: Iterable):
+    """Decimal / float amounts as an int64 array of cents"""
+    import numpy as np
+    return np.rint(np.array(list(amounts), dtype=np.float64) * 100).astype(np.int64)
+
+
+def to_decimal(amount_cents) -> Decimal:
+    return Decimal(int(amount_cents)).scaleb(-2)
+
+
+class HotelRates:
+    """
+    One hotel's plan rates over the nights [origin, origin + days).
+    Row types[room_type] of each array belongs to that room type; the last
+    row, shared by room types without plans, is all unpriced.
+    """
+
+    def __init__(self, origin: date, days: int, plans: Sequence):
+        import numpy as np
+
+        self.origin, self.days = origin, days
+        self.types = {room_type: row for row, room_type in enumerate(sorted({p.room_type for p in plans}))}
+        rate = np.zeros((len(self.types) + 1, days), dtype=np.int64)
+        priced = np.zeros((len(self.types) + 1, days), dtype=bool)
+        weekday = (np.arange(days) + origin.weekday()) % 7
+
+        # Lowest priority first, so higher priority (then newer) plans paint over it
+        for plan in sorted(plans, key=lambda p: (p.priority, p.rate_plan_id)):
+            first = max((plan.start_date - origin).days, 0)
+            stop = min((plan.end_date - origin).days, days)
+            if first >= stop:
+                continue
+            nights = ((plan.days_of_week >> weekday[first:stop]) & 1).astype(bool)
+            row = self.types[plan.room_type]
+            rate[row, first:stop][nights] = int(cents([plan.price_per_night])[0])
+            priced[row, first:stop] |= nights
+
+        self.rate, self.priced = rate, priced
+        zero = np.zeros((rate.shape[0], 1), dtype=np.int64)
+        self.rate_sum = np.hstack([zero, np.cumsum(rate, axis=1)])
+        self.unpriced_sum = np.hstack([zero, np.cumsum(~priced, axis=1)])
+        self.loaded_at = time.monotonic()
+
+    def covers(self, first: date, stop: date) -> bool:
+        return self.origin <= first and stop <= self.origin + timedelta(days=self.days)
+
+    def rows(self, room_types: Iterable[str]):
+        import numpy as np
+        fallback = len(self.types)
+        return np.array([self.types.get(room_type, fallback) for room_type in room_types], dtype=np.int64)
+
+    def stay_cents(self, rows: "np.ndarray", base_cents: "np.ndarray", first, stop):
+        """Room charge in cents of each stay; first / stop are night offsets from origin (arrays or scalars)"""
+        import numpy as np
+        stop = np.maximum(stop, first)
+        planned = self.rate_sum[rows, stop] - self.rate_sum[rows, first]
+        unpriced = self.unpriced_sum[rows, stop] - self.unpriced_sum[rows, first]
+        return planned + unpriced * base_cents
+
+
+class RateCalendar:
+    """
+    Per-hotel cache of HotelRates covering RATE_CALENDAR_PAST_DAYS before
+    today to RATE_CALENDAR_DAYS after it. Stays outside that window are priced
+    from a one-off calendar of just their range.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._hotels: Dict[int, HotelRates] = {}
+        self._generations: Dict[int, int] = {}
+
+    def invalidate(self, hotel_id: Optional[int] = None):
+        """Drop the cached calendar of one hotel (all hotels if hotel_id is None)"""
+        with self._lock:
+            if hotel_id is None:
+                for key in self._generations:
+                    self._generations[key] += 1
+                self._hotels.clear()
+            else:
+                self._generations[hotel_id] = self._generations.get(hotel_id, 0) + 1
+                self._hotels.pop(hotel_id, None)
+
+    def _fresh(self, rates: Optional[HotelRates]) -> bool:
+        if rates is None:
+            return False
+        return not self.ttl_seconds or time.monotonic() - rates.loaded_at < self.ttl_seconds
+
+    def hotel(self, db, hotel_id: int, first: date, stop: date) -> HotelRates:
+        """Rates of `hotel_id` covering the nights [first, stop); `db` is a Session or Connection"""
+        today = date.today()
+        origin = today - timedelta(days=settings.RATE_CALENDAR_PAST_DAYS)
+        end = today + timedelta(days=settings.RATE_CALENDAR_DAYS)
+        if not (origin <= first and stop <= end):
+            return HotelRates(first, max((stop - first).days, 0), _load_plans(db, hotel_id, first, stop))
+
+        with self._lock:
+            rates = self._hotels.get(hotel_id)
+            generation = self._generations.get(hotel_id, 0)
+        if self._fresh(rates) and rates.covers(first, stop):
+            return rates
+
+        # The cached calendar is shared by later requests, so it is filled from the primary
+        with replica_reads(False):
+            plans = _load_plans(db, hotel_id, origin, end)
+        rates = HotelRates(origin, (end - origin).days, plans)
+        with self._lock:
+            # Skip caching if a rate edit invalidated this hotel while we were loading
+            if self._generations.get(hotel_id, 0) == generation:
+                self._hotels[hotel_id] = rates
+        return rates
+
+    def stay_cents(self, db, stays: Sequence[Tuple[int, str, Decimal, date, date]]):
+        """
+        Room charge in cents of each (hotel_id, room_type, room price,
+        check_in, check_out) stay, as an int64 array.
+        """
+        import numpy as np
+
+        totals = np.zeros(len(stays), dtype=np.int64)
+        by_hotel: Dict[int, List[int]] = {}
+        for position, stay in enumerate(stays):
+            by_hotel.setdefault(stay[0], []).append(position)
+
+        for hotel_id, positions in by_hotel.items():
+            group = [stays[p] for p in positions]
+            rates = self.hotel(db, hotel_id, min(s[3] for s in group), max(max(s[3], s[4]) for s in group))
+            first = np.array([(s[3] - rates.origin).days for s in group], dtype=np.int64)
+            stop = np.array([(s[4] - rates.origin).days for s in group], dtype=np.int64)
+            totals[positions] = rates.stay_cents(
+                rates.rows(s[1] for s in group), cents(s[2] for s in group), first, stop
+            )
+        return totals
+
+    def quote(self, db, rooms: Sequence[models.Room], check_in: date, check_out: date) -> List[Decimal]:
+        """Price of the stay [check_in, check_out) in each of `rooms`"""
+        import numpy as np
+
+        totals = np.zeros(len(rooms), dtype=np.int64)
+        by_hotel: Dict[int, List[int]] = {}
+        for position, room in enumerate(rooms):
+            by_hotel.setdefault(room.hotel_id, []).append(position)
+
+        for hotel_id, positions in by_hotel.items():
+            group = [rooms[p] for p in positions]
+            rates = self.hotel(db, hotel_id, check_in, max(check_in, check_out))
+            first = (check_in - rates.origin).days
+            totals[positions] = rates.stay_cents(
+                rates.rows(room.room_type for room in group),
+                cents(room.price_per_night for room in group),
+                first, max((check_out - rates.origin).days, first),
+            )
+        return [to_decimal(total) for total in totals.tolist()]
+
+
+def _plans_query(first: date, stop: date):
+    plan = models.RatePlan.__table__
+    return select(
+        plan.c.hotel_id, plan.c.rate_plan_id, plan.c.room_type, plan.c.start_date, plan.c.end_date,
+        plan.c.price_per_night, plan.c.days_of_week, plan.c.priority,
+    ).where(plan.c.start_date < stop, plan.c.end_date > first)
+
+
+def _load_plans(db, hotel_id: int, first: date, stop: date) -> list:
+    plan = models.RatePlan.__table__
+    return db.execute(_plans_query(first, stop).where(plan.c.hotel_id == hotel_id)).all()
+
+
+def nightly_rates(db, keys: Sequence[Tuple[int, str]], start: date, days: int):
+    """
+    Plan rate in cents, and whether a plan covers the night, for each
+    (hotel_id, room_type) key and each of `days` nights from `start`: two
+    (len(keys), days) arrays. One query, not cached; for reports.
+    """
+    import numpy as np
+
+    plan = models.RatePlan.__table__
+    rate = np.zeros((len(keys), days), dtype=np.int64)
+    priced = np.zeros((len(keys), days), dtype=bool)
+    hotels = sorted({hotel_id for hotel_id, _ in keys})
+    if not hotels:
+        return rate, priced
+    by_hotel: Dict[int, list] = {}
+    for row in db.execute(_plans_query(start, start + timedelta(days=days)).where(plan.c.hotel_id.in_(hotels))):
+        by_hotel.setdefault(row.hotel_id, []).append(row)
+
+    calendars = {hotel_id: HotelRates(start, days, plans) for hotel_id, plans in by_hotel.items()}
+    for k, (hotel_id, room_type) in enumerate(keys):
+        rates = calendars.get(hotel_id)
+        if rates is not None and room_type in rates.types:
+            rate[k], priced[k] = rates.rate[rates.types[room_type]], rates.priced[rates.types[room_type]]
+    return rate, priced
+
+
+calendar = RateCalendar(ttl_seconds=settings.RATE_CALENDAR_TTL)
@@ -0,0 +1,235 @@
+"""
+reporting.py — Occupancy, ADR and RevPAR by hotel or room type, per day, month, year or range.
+
+Rooms, the stays overlapping the range and the paid payments in it are each
+read once, as columns. Stays are never expanded night by night. Each stay adds
+one room and its nightly rate on its first night in range, and removes them
+the day after its last. A cumulative sum along the days axis then gives rooms
+sold and room revenue for every (group, day): O(bookings + groups x days)
+NumPy work however long the stays are.
+
+    occupancy = rooms sold / rooms available
+    ADR       = room revenue / rooms sold
+    RevPAR    = room revenue / rooms available
+
+Room revenue is each sold night at its rate: the hotel's rate plan for the
+room type and night (pricing.py), else the room's price_per_night. Stays are
+summed per (hotel, room type) first, so plan rates apply to whole rows of
+the calendar at once. Services are excluded. Rooms available counts every
+room of the group on every day, since room status is current state, not
+history. `paid` is the payments received that day (cash basis), attributed
+to the booking's room.
+"""
+
+import csv
+import io
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from sqlalchemy import and_, select, true
+
+import models
+import pricing
+from config import settings
+from database import get_read_engine
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SOLD_STATUSES = (models.BookingStatus.CONFIRMED, models.BookingStatus.CHECKED_IN, models.BookingStatus.CHECKED_OUT)
+GROUPINGS = ("hotel", "room_type")
+PERIODS = ("day", "month", "year", "total")
+_CHUNK_ROWS = 50000
+
+
+def _columns(conn, stmt, width: int) -> List[list]:
+    """Run `stmt` and return its result as `width` Python lists, fetched in chunks."""
+    columns = [[] for _ in range(width)]
+    result = conn.execution_options(stream_results=True, yield_per=_CHUNK_ROWS).execute(stmt)
+    for rows in result.partitions():
+        for column, values in zip(columns, zip(*rows)):
+            column.extend(values)
+    return columns
+
+
+def _day_offsets(dates: list, start: date):
+    import numpy as np
+    return (np.array(dates, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+
+
+def _cents(amounts: list):
+    import numpy as np
+    return np.rint(np.array(amounts, dtype=np.float64) * 100).astype(np.int64)
+
+
+def nightly_totals(groups: int, days: int, group: "np.ndarray", first: "np.ndarray", stop: "np.ndarray", rate: "np.ndarray"):
+    """
+    Rooms sold and room revenue per (group, day) for stays covering nights
+    [first, stop) (offsets already clipped to [0, days)), via prefix sums.
+    Returns two (groups, days) int64 arrays.
+    """
+    import numpy as np
+    size = groups * (days + 1)
+    enter, leave = group * (days + 1) + first, group * (days + 1) + stop
+    sold = np.bincount(enter, minlength=size) - np.bincount(leave, minlength=size)
+    # float64 weights are exact for integer cents up to 2**53
+    revenue = np.bincount(enter, weights=rate, minlength=size) - np.bincount(leave, weights=rate, minlength=size)
+    sold = np.cumsum(sold.reshape(groups, days + 1)[:, :days], axis=1)
+    revenue = np.cumsum(revenue.reshape(groups, days + 1)[:, :days], axis=1)
+    return sold.astype(np.int64), np.rint(revenue).astype(np.int64)
+
+
+def _period_starts(start: date, days: int, period: str):
+    """(first day offset of each period, label of each period)"""
+    import numpy as np
+    calendar = np.datetime64(start, "D") + np.arange(days)
+    if period == "total":
+        return np.array([0]), [f"{start.isoformat()}/{(start + timedelta(days=days - 1)).isoformat()}"]
+    if period == "day":
+        return np.arange(days), [str(day) for day in calendar]
+    units = calendar.astype("datetime64[M]" if period == "month" else "datetime64[Y]")
+    starts = np.flatnonzero(np.r_[True, units[1:] != units[:-1]])
+    return starts, [str(unit) for unit in units[starts]]
+
+
+def performance_report(
+    start: date,
+    end: date,
+    by: str = "hotel",
+    period: str = "day",
+    hotel_id: Optional[int] = None,
+    connection=None,
+) -> List[Dict]:
+    """
+    One row per group and period between `start` and `end` (inclusive), with
+    rooms available / sold, occupancy %, room revenue, ADR, RevPAR and paid.
+    """
+    import numpy as np
+
+    if by not in GROUPINGS or period not in PERIODS:
+        raise ValueError(f"by must be one of {GROUPINGS} and period one of {PERIODS}")
+    days = (end - start).days + 1
+    if days < 1 or days > settings.REPORT_MAX_DAYS:
+        raise ValueError(f"The range must cover 1 to {settings.REPORT_MAX_DAYS} days")
+    stop_date = end + timedelta(days=1)
+
+    room, booking, payment = models.Room.__table__, models.Booking.__table__, models.Payment.__table__
+    room_filter = room.c.hotel_id == hotel_id if hotel_id is not None else true()
+
+    conn = connection if connection is not None else get_read_engine().connect()
+    try:
+        room_ids, hotel_ids, room_types, prices = _columns(conn, select(
+            room.c.room_id, room.c.hotel_id, room.c.room_type, room.c.price_per_night
+        ).where(room_filter).order_by(room.c.room_id), 4)
+        if not room_ids:
+            return []
+        stay_rooms, check_ins, check_outs = _columns(conn, select(
+            booking.c.room_id, booking.c.check_in_date, booking.c.check_out_date
+        ).select_from(booking.join(room, booking.c.room_id == room.c.room_id)).where(and_(
+            room_filter,
+            booking.c.status.in_(SOLD_STATUSES),
+            booking.c.check_in_date < stop_date,
+            booking.c.check_out_date > start,
+        )), 3)
+        pay_rooms, pay_dates, pay_amounts = _columns(conn, select(
+            booking.c.room_id, payment.c.payment_date, payment.c.amount
+        ).select_from(
+            payment.join(booking, payment.c.booking_id == booking.c.booking_id)
+            .join(room, booking.c.room_id == room.c.room_id)
+        ).where(and_(
+            room_filter,
+            payment.c.payment_status == models.PaymentStatus.PAID,
+            payment.c.payment_date >= start,
+            payment.c.payment_date < stop_date,
+        )), 3)
+        rate_keys = sorted(set(zip(hotel_ids, room_types)))
+        plan_rate, plan_priced = pricing.nightly_rates(conn, rate_keys, start, days)
+    finally:
+        if connection is None:
+            conn.close()
+
+    # Report group of every (hotel, room type), and room_id -> ((hotel, room type), rate in cents) lookups
+    keys = list(zip(hotel_ids, room_types)) if by == "room_type" else [(h,) for h in hotel_ids]
+    group_keys = sorted(set(keys))
+    group_index = {key: g for g, key in enumerate(group_keys)}
+    rate_index = {key: k for k, key in enumerate(rate_keys)}
+    group_of_rate_key = np.array([group_index[key if by == "room_type" else key[:1]] for key in rate_keys])
+    lookup_size = max(room_ids) + 1
+    group_of_room = np.full(lookup_size, -1, dtype=np.int64)
+    rate_key_of_room = np.full(lookup_size, -1, dtype=np.int64)
+    rate_of_room = np.zeros(lookup_size, dtype=np.int64)
+    group_of_room[room_ids] = [group_index[key] for key in keys]
+    rate_key_of_room[room_ids] = [rate_index[key] for key in zip(hotel_ids, room_types)]
+    rate_of_room[room_ids] = _cents(prices)
+    capacity = np.bincount(group_of_room[room_ids], minlength=len(group_keys))
+
+    stay_rooms = np.array(stay_rooms, dtype=np.int64)
+    first = np.clip(_day_offsets(check_ins, start), 0, days) if check_ins else np.zeros(0, np.int64)
+    stop = np.clip(_day_offsets(check_outs, start), 0, days) if check_outs else np.zeros(0, np.int64)
+    key_sold, key_revenue = nightly_totals(
+        len(rate_keys), days, rate_key_of_room[stay_rooms], first, stop, rate_of_room[stay_rooms].astype(np.float64)
+    )
+    # Nights a rate plan covers earn the plan rate for every room sold, whatever the room's own price
+    key_revenue = np.where(plan_priced, plan_rate * key_sold, key_revenue)
+    sold = np.zeros((len(group_keys), days), dtype=np.int64)
+    revenue = np.zeros((len(group_keys), days), dtype=np.int64)
+    np.add.at(sold, group_of_rate_key, key_sold)
+    np.add.at(revenue, group_of_rate_key, key_revenue)
+
+    paid = np.zeros(len(group_keys) * days, dtype=np.float64)
+    if pay_rooms:
+        cells = group_of_room[np.array(pay_rooms, dtype=np.int64)] * days + _day_offsets(pay_dates, start)
+        paid = np.bincount(cells, weights=_cents(pay_amounts), minlength=len(group_keys) * days)
+    paid = np.rint(paid.reshape(len(group_keys), days)).astype(np.int64)
+
+    starts, labels = _period_starts(start, days, period)
+    period_days = np.diff(np.r_[starts, days])
+    sold, revenue, paid = (np.add.reduceat(m, starts, axis=1) for m in (sold, revenue, paid))
+    available = capacity[:, None] * period_days[None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        occupancy = np.where(available > 0, sold * 100.0 / available, 0.0)
+        adr = np.where(sold > 0, revenue / 100.0 / sold, 0.0)
+        revpar = np.where(available > 0, revenue / 100.0 / available, 0.0)
+
+    rows = []
+    for g, key in enumerate(group_keys):
+        group_fields = {"hotel_id": key[0]} if by == "hotel" else {"hotel_id": key[0], "room_type": key[1]}
+        for p, label in enumerate(labels):
+            rows.append({
+                "period": label,
+                **group_fields,
+                "rooms_available": int(available[g, p]),
+                "rooms_sold": int(sold[g, p]),
+                "occupancy_pct": round(float(occupancy[g, p]), 2),
+                "room_revenue": round(int(revenue[g, p]) / 100.0, 2),
+                "adr": round(float(adr[g, p]), 2),
+                "revpar": round(float(revpar[g, p]), 2),
+                "paid": round(int(paid[g, p]) / 100.0, 2),
+            })
+    return rows
+
+
+def totals(rows: List[Dict]) -> Dict:
+    """The same metrics over all rows of a report"""
+    available = sum(r["rooms_available"] for r in rows)
+    sold = sum(r["rooms_sold"] for r in rows)
+    revenue = round(sum(r["room_revenue"] for r in rows), 2)
+    return {
+        "rooms_available": available,
+        "rooms_sold": sold,
+        "occupancy_pct": round(sold * 100.0 / available, 2) if available else 0.0,
+        "room_revenue": revenue,
+        "adr": round(revenue / sold, 2) if sold else 0.0,
+        "revpar": round(revenue / available, 2) if available else 0.0,
+        "paid": round(sum(r["paid"] for r in rows), 2),
+    }
+
+
+def to_csv(rows: List[Dict]) -> str:
+    buffer = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue()
@@ -0,0 +1,124 @@
+"""
+revenue.py — Daily revenue rollup for the Hotel Management System.
+
+`daily_revenue` holds one row per (hotel, day, payment method) with the sum
+of paid payments. crud.create_payment increments it in the same transaction
+as the payment, so reading N days of revenue touches N rollup rows instead of
+grouping the whole payment table.
+
+Usage:
+    python revenue.py rebuild                      # recompute the whole rollup
+    python revenue.py backfill --since 2024-01-01  # recompute from a date onward
+"""
+
+import argparse
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+import models
+
+rollup = models.DailyRevenue.__table__
+
+
+def _increment(db: Session, hotel_id: int, revenue_date: date, payment_method, amount: Decimal):
+    """Atomically add one payment to its rollup row, creating the row if needed."""
+    values = dict(
+        hotel_id=hotel_id,
+        revenue_date=revenue_date,
+        payment_method=payment_method,
+        amount=amount,
+        payment_count=1,
+    )
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(rollup).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            amount=rollup.c.amount + stmt.inserted.amount,
+            payment_count=rollup.c.payment_count + 1,
+        )
+    else:
+        stmt = sqlite.insert(rollup).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollup.c.hotel_id, rollup.c.revenue_date, rollup.c.payment_method],
+            set_=dict(
+                amount=rollup.c.amount + stmt.excluded.amount,
+                payment_count=rollup.c.payment_count + 1,
+            ),
+        )
+    db.execute(stmt)
+
+
+def record_payment(db: Session, payment: models.Payment):
+    """
+    Fold a newly flushed payment into the rollup. Does not commit; the caller
+    commits it together with the payment row.
+    """
+    if payment.payment_status != models.PaymentStatus.PAID:
+        return
+    hotel_id = db.query(models.Room.hotel_id).join(
+        models.Booking, models.Booking.room_id == models.Room.room_id
+    ).filter(models.Booking.booking_id == payment.booking_id).scalar()
+    if hotel_id is None:
+        return
+    _increment(db, hotel_id, payment.payment_date, payment.payment_method, payment.amount)
+
+
+def rebuild_daily_revenue(db: Session, since: Optional[date] = None) -> int:
+    """
+    Recompute the rollup from the payment table, for every day or only from
+    `since` onward, in one transaction. Returns the number of rollup rows written.
+    """
+    delete_stmt = delete(rollup)
+    if since:
+        delete_stmt = delete_stmt.where(rollup.c.revenue_date >= since)
+
+    source = select(
+        models.Room.hotel_id,
+        models.Payment.payment_date,
+        models.Payment.payment_method,
+        func.sum(models.Payment.amount),
+        func.count(),
+    ).join(
+        models.Booking, models.Payment.booking_id == models.Booking.booking_id
+    ).join(
+        models.Room, models.Booking.room_id == models.Room.room_id
+    ).where(
+        models.Payment.payment_status == models.PaymentStatus.PAID
+    ).group_by(
+        models.Room.hotel_id, models.Payment.payment_date, models.Payment.payment_method
+    )
+    if since:
+        source = source.where(models.Payment.payment_date >= since)
+
+    try:
+        db.execute(delete_stmt)
+        result = db.execute(insert(rollup).from_select(
+            ["hotel_id", "revenue_date", "payment_method", "amount", "payment_count"], source
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the daily_revenue rollup")
+    parser.add_argument("command", choices=["rebuild", "backfill"])
+    parser.add_argument("--since", type=date.fromisoformat, help="first day to recompute (backfill)")
+    args = parser.parse_args()
+    if args.command == "backfill" and not args.since:
+        parser.error("backfill requires --since")
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_revenue(db, since=args.since if args.command == "backfill" else None)
+        print(f"✅ daily_revenue rebuilt: {rows} rows")
+    finally:
+        db.close()
@@ -0,0 +1,91 @@
+"""
+routing.py — Reads go to the replica, writes to the primary.
+
+GET and HEAD requests run with replica reads enabled (database.replica_reads):
+their plain SELECTs are served by the read replica, while a session that
+writes, locks or runs raw SQL is pinned back to the primary. Every other
+method runs on the primary, and a successful one sets a short-lived cookie so
+the same client reads from the primary for READ_YOUR_WRITES_SECONDS, longer
+than the replica normally lags: a guest who just booked sees the booking on
+the next page. Clients that drop cookies only get the per-session pinning.
+
+Without DB_REPLICA_HOST / DB_REPLICA_URL everything stays on the primary.
+"""
+
+import math
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from config import settings
+from database import begin_replica_reads, end_replica_reads, replica_reads
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "hms_primary_until"
+
+
+def reads_from_replica(method: str, pinned_until: Optional[str]) -> bool:
+    """Whether a request may read from the replica: a safe method and no live read-your-writes pin."""
+    if method not in SAFE_METHODS:
+        return False
+    try:
+        return float(pinned_until) <= time.time()
+    except (TypeError, ValueError):
+        return True
+
+
+def pins_client(method: str, status_code: int) -> bool:
+    return method not in SAFE_METHODS and status_code < 400 and settings.READ_YOUR_WRITES_SECONDS > 0
+
+
+def pin_cookie() -> str:
+    """Set-Cookie value keeping the client on the primary for READ_YOUR_WRITES_SECONDS"""
+    seconds = settings.READ_YOUR_WRITES_SECONDS
+    until = math.ceil(time.time() + seconds)
+    return f"{PIN_COOKIE}={until}; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax"
+
+
+class ReplicaRoutingMiddleware:
+    """ASGI middleware for the FastAPI app; pure ASGI, so streamed exports read from the replica too."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        cookies = SimpleCookie()
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookies.load(value.decode("latin-1"))
+        pinned_until = cookies[PIN_COOKIE].value if PIN_COOKIE in cookies else None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and pins_client(method, message["status"]):
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", pin_cookie().encode("latin-1"))]
+            await send(message)
+
+        with replica_reads(reads_from_replica(method, pinned_until)):
+            await self.app(scope, receive, send_wrapper)
+
+
+def init_flask(app):
+    """The same routing for the dashboard's raw queries (database.get_connection)."""
+    from flask import g, request
+
+    @app.before_request
+    def _route_reads():
+        g.replica_reads = begin_replica_reads(reads_from_replica(request.method, request.cookies.get(PIN_COOKIE)))
+
+    @app.after_request
+    def _pin_writer(response):
+        if pins_client(request.method, response.status_code):
+            response.headers.add("Set-Cookie", pin_cookie())
+        return response
+
+    @app.teardown_request
+    def _end_reads(exc):
+        if "replica_reads" in g:
+            end_replica_reads(g.pop("replica_reads"))
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, ValidationInfo, field_validator
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
+from models import BookingStatus
 
 # Hotel Schemas
 class HotelBase(BaseModel):
@@ -60,6 +61,57 @@ class RoomResponse(RoomBase):
     class Config:
         from_attributes = True
 
+# Rate Plan Schemas
+class RatePlanBase(BaseModel):
+    hotel_id: int
+    room_type: str = Field(..., max_length=50)
+    name: Optional[str] = Field(None, max_length=100)
+    start_date: date
+    end_date: date  # exclusive, like check_out_date
+    price_per_night: Decimal = Field(..., gt=0)
+    days_of_week: int = Field(127, ge=1, le=127)  # bit 0 = Monday ... bit 6 = Sunday; 96 = weekends
+    priority: int = 0
+
+class RatePlanCreate(RatePlanBase):
+    pass
+
+class RatePlanResponse(RatePlanBase):
+    rate_plan_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RoomQuote(BaseModel):
+    room_id: int
+    room_number: str
+    room_type: str
+    nights: int
+    total: Decimal
+    average_nightly: Decimal
+
+class CalendarRoom(BaseModel):
+    room_id: int
+    room_number: str
+    room_type: str
+    status: str
+
+    class Config:
+        from_attributes = True
+
+class AvailabilityCalendarResponse(BaseModel):
+    hotel_id: int
+    start_date: date
+    nights: int
+    encoding: str
+    rooms: List[CalendarRoom]
+    # encoding == "bits": base64 of the rooms x nights matrix, each row packed
+    # into ceil(nights / 8) bytes, most significant bit = first night, 1 = booked
+    bits: Optional[str] = None
+    # encoding == "spans": per room, [night_offset, length] runs of booked nights
+    spans: Optional[List[List[List[int]]]] = None
+
 
 # Guest Schemas
 class GuestPhoneBase(BaseModel):
@@ -73,6 +125,10 @@ class GuestBase(BaseModel):
 class GuestCreate(GuestBase):
     phones: Optional[List[GuestPhoneBase]] = []
 
+class GuestPhoneResponse(GuestPhoneBase):
+    class Config:
+        from_attributes = True
+
 class GuestResponse(GuestBase):
     guest_id: int
     created_at: datetime
@@ -83,21 +139,29 @@ class GuestResponse(GuestBase):
 
 
 # Booking Schemas
+def check_out_after_check_in(check_out: Optional[date], info: ValidationInfo):
+    check_in = info.data.get("check_in_date")
+    if check_out is not None and check_in is not None and check_out <= check_in:
+        raise ValueError("must be after check_in_date")
+    return check_out
+
 class BookingBase(BaseModel):
     guest_id: int
     room_id: int
     check_in_date: date
     check_out_date: date
-    status: str = "Confirmed"
+    status: BookingStatus = BookingStatus.CONFIRMED
 
 class BookingCreate(BookingBase):
-    pass
+    _check_dates = field_validator("check_out_date")(check_out_after_check_in)
 
 class BookingUpdate(BaseModel):
-    status: Optional[str] = None
+    status: Optional[BookingStatus] = None
     check_in_date: Optional[date] = None
     check_out_date: Optional[date] = None
 
+    _check_dates = field_validator("check_out_date")(check_out_after_check_in)
+
 class BookingResponse(BookingBase):
     booking_id: int
     booking_date: date
@@ -147,6 +211,17 @@ class ServiceResponse(ServiceBase):
     class Config:
         from_attributes = True
 
+class ServicePriceUpdate(BaseModel):
+    price: Decimal = Field(..., gt=0)
+
+class ServicePriceUpdateResult(BaseModel):
+    service_id: int
+    old_price: Decimal
+    new_price: Decimal
+    affected_bookings: int
+    elapsed_ms: float
+    dry_run: bool
+
 
 # Service Usage Schemas
 class ServiceUsageBase(BaseModel):
@@ -163,3 +238,31 @@ class ServiceUsageResponse(ServiceUsageBase):
     
     class Config:
         from_attributes = True
+
+
+# Expanded (composite) Schemas
+# Relationship fields are only set when requested with ?expand=
+class ServiceLineResponse(ServiceUsageResponse):
+    service: ServiceResponse
+
+class BookingDetail(BookingWithTotal):
+    room: Optional[RoomResponse] = None
+    guest: Optional[GuestResponse] = None
+    payments: Optional[List[PaymentResponse]] = None
+    services: Optional[List[ServiceLineResponse]] = None
+
+class GuestDetail(GuestResponse):
+    phones: Optional[List[GuestPhoneResponse]] = None
+    bookings: Optional[List[BookingWithTotal]] = None
+
+
+# Bulk Ingestion Schemas
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[str]
+
+class BulkResult(BaseModel):
+    created: int
+    # One entry per submitted row: the new id, or None if the row was rejected
+    ids: List[Optional[int]]
+    errors: List[BulkRowError]
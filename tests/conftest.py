@@ -0,0 +1,98 @@
+"""
+Shared fixtures: the API and crud against a throwaway SQLite database,
+rebuilt from the ORM models for every test, plus a second SQLite file standing
+in for the read replica.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP_DIR = tempfile.mkdtemp(prefix="hms-tests-")
+PRIMARY_DB = os.path.join(TMP_DIR, "primary.db")
+REPLICA_DB = os.path.join(TMP_DIR, "replica.db")
+
+# Before anything imports config: settings are read once, at import
+os.environ["DEBUG"] = "false"
+os.environ["DB_URL"] = f"sqlite:///{PRIMARY_DB}"
+os.environ["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{PRIMARY_DB}"
+os.environ["DB_SCHEMA_CHECK"] = "false"
+os.environ["ASYNC_API"] = "false"
+
+import pytest
+
+import availability
+import http_cache
+import models
+import pricing
+from config import settings
+from database import SessionLocal, core, get_engine
+from database.queries import invalidate_dashboard_cache
+
+
+def reset_caches():
+    availability.index.clear()
+    pricing.calendar.invalidate()
+    http_cache.invalidate(http_cache.HOTELS, http_cache.EMPLOYEES, http_cache.ROOMS, http_cache.SERVICES)
+    invalidate_dashboard_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_database():
+    engine = get_engine()
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    reset_caches()
+    yield
+    reset_caches()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """
+    The replica engine, on its own empty SQLite file. Nothing copies rows to it,
+    so whether a row is visible tells which database a read went to.
+    """
+    monkeypatch.setattr(settings, "DB_REPLICA_URL", f"sqlite:///{REPLICA_DB}")
+    monkeypatch.setattr(core, "_replica_engine", None)
+    engine = core.get_replica_engine()
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def seed_hotel(session):
+    """One hotel, one guest and two Standard rooms (ids 1 and 2)"""
+    session.add(models.Hotel(name="Test Hotel", city="Delhi"))
+    session.add(models.Guest(name="Test Guest", email="guest@test.example.com"))
+    session.flush()
+    for number in ("101", "102"):
+        session.add(models.Room(hotel_id=1, room_number=number, room_type="Standard", price_per_night=100))
+    session.commit()
+
+
+@pytest.fixture
+def hotel_with_rooms(db):
+    seed_hotel(db)
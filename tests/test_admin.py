@@ -0,0 +1,21 @@
+from config import settings
+from database import slow_queries
+
+
+def test_admin_endpoints_are_off_without_a_token(client):
+    assert client.get("/admin/slow-queries").status_code == 404
+    assert client.delete("/admin/slow-queries").status_code == 404
+
+
+def test_admin_endpoints_require_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "s3cret")
+    slow_queries.record("SELECT 1", None, 1.0, caller="test")
+
+    assert client.get("/admin/slow-queries").status_code == 401
+    assert client.delete("/admin/slow-queries", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert slow_queries.entries()
+
+    admin = {"Authorization": "Bearer s3cret"}
+    assert client.get("/admin/slow-queries", headers=admin).json()["entries"][0]["caller"] == "test"
+    assert client.delete("/admin/slow-queries", headers=admin).status_code == 204
+    assert slow_queries.entries() == []
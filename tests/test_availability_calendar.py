@@ -0,0 +1,66 @@
+import base64
+from datetime import date, timedelta
+
+import pytest
+
+import models
+
+from conftest import seed_hotel
+
+START = date.today() + timedelta(days=10)
+
+
+@pytest.fixture
+def calendar_stays(db):
+    seed_hotel(db)
+    db.add(models.Room(hotel_id=1, room_number="201", room_type="Deluxe", price_per_night=200))
+    for room_id, first, stop, status in (
+        (1, -2, 3, models.BookingStatus.CONFIRMED),  # clipped at the start: nights 0-2
+        (1, 5, 7, models.BookingStatus.CHECKED_IN),
+        (2, 0, 4, models.BookingStatus.CANCELLED),  # not booked
+        (2, 9, 20, models.BookingStatus.CONFIRMED),  # clipped at the end: night 9
+        (3, 1, 2, models.BookingStatus.CONFIRMED),  # back to back: one run, nights 1-3
+        (3, 2, 4, models.BookingStatus.CONFIRMED),
+    ):
+        db.add(models.Booking(guest_id=1, room_id=room_id, status=status,
+                              check_in_date=START + timedelta(days=first),
+                              check_out_date=START + timedelta(days=stop)))
+    db.commit()
+
+
+def calendar(client, **params):
+    response = client.get("/hotels/1/availability-calendar",
+                          params={"start_date": START.isoformat(), "nights": 10, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_spans(client, calendar_stays):
+    body = calendar(client)
+    assert [room["room_id"] for room in body["rooms"]] == [1, 2, 3]
+    assert body["spans"] == [[[0, 3], [5, 2]], [[9, 1]], [[1, 3]]]
+    assert body["bits"] is None
+
+
+def test_bits(client, calendar_stays):
+    body = calendar(client, encoding="bits")
+    # Two bytes per room for 10 nights, first night in the most significant bit
+    assert base64.b64decode(body["bits"]) == bytes([0b11100110, 0, 0, 0b01000000, 0b01110000, 0])
+    assert body["spans"] is None
+
+
+def test_room_type_filter(client, calendar_stays):
+    body = calendar(client, room_type="Deluxe")
+    assert [room["room_number"] for room in body["rooms"]] == ["201"]
+    assert body["spans"] == [[[1, 3]]]
+
+
+def test_no_rooms(client, calendar_stays):
+    body = calendar(client, room_type="Suite", encoding="bits")
+    assert body["rooms"] == [] and body["bits"] == ""
+
+
+@pytest.mark.parametrize("params", [{"nights": 366}, {"nights": 0}, {"encoding": "rle"}])
+def test_rejects_bad_parameters(client, calendar_stays, params):
+    response = client.get("/hotels/1/availability-calendar", params={"start_date": START.isoformat(), **params})
+    assert response.status_code == 422
@@ -0,0 +1,163 @@
+import warnings
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import SAWarning
+
+import bulk
+import crud
+import models
+import schemas
+from database import get_engine
+
+START = date.today() + timedelta(days=10)
+
+
+def stay(room_id, first, nights, **extra):
+    check_in = START + timedelta(days=first)
+    return {
+        "guest_id": 1, "room_id": room_id,
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+        **extra,
+    }
+
+
+def active_stays(db, room_id):
+    return db.query(models.Booking).filter(
+        models.Booking.room_id == room_id, models.Booking.status == models.BookingStatus.CONFIRMED
+    ).count()
+
+
+def test_create_booking_rejects_overlap(db, hotel_with_rooms):
+    crud.create_booking(db, schemas.BookingCreate(**stay(1, 0, 3)))
+    with pytest.raises(crud.BookingConflict):
+        crud.create_booking(db, schemas.BookingCreate(**stay(1, 2, 2)))
+    crud.create_booking(db, schemas.BookingCreate(**stay(1, 3, 2)))  # check-out day is free again
+    assert active_stays(db, 1) == 2
+
+
+def test_bulk_rejects_overlap_with_existing_stay(db, hotel_with_rooms):
+    existing = crud.create_booking(db, schemas.BookingCreate(**stay(1, 0, 3)))
+
+    result = crud.create_bookings_bulk(db, [stay(1, 1, 2), stay(1, 3, 2), stay(2, 1, 2)])
+
+    assert result.created == 2
+    assert result.ids[0] is None and None not in result.ids[1:]
+    assert [e.index for e in result.errors] == [0]
+    assert f"booking {existing.booking_id}" in result.errors[0].errors[0]
+    assert active_stays(db, 1) == 2
+
+
+def test_bulk_rejects_overlap_within_batch(db, hotel_with_rooms):
+    # Out of check-in order on purpose: the earliest stay in the room wins
+    rows = [stay(1, 2, 3), stay(1, 0, 3), stay(1, 5, 1), stay(2, 2, 3), stay(1, 1, 1, status="Cancelled")]
+
+    result = crud.create_bookings_bulk(db, rows)
+
+    assert [e.index for e in result.errors] == [0]
+    assert "row 1" in result.errors[0].errors[0]
+    assert result.created == 4
+    assert active_stays(db, 1) == 2
+
+
+def test_bulk_endpoint_reports_clashes(client, hotel_with_rooms):
+    assert client.post("/bookings/", json=stay(1, 0, 3)).status_code == 201
+
+    response = client.post("/bookings/bulk", json=[stay(1, 2, 1), stay(2, 0, 2), stay(2, 1, 2)])
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 1
+    assert [e["index"] for e in body["errors"]] == [0, 2]
+
+
+def test_booking_writes_evict_cached_rooms(client, db, hotel_with_rooms):
+    assert client.get("/rooms/1").json()["status"] == "Available"
+    booking_id = client.post("/bookings/", json=stay(1, 0, 3)).json()["booking_id"]
+
+    # What trg_room_status_update does on MySQL when the guest checks in
+    db.query(models.Room).filter(models.Room.room_id == 1).update({"status": models.RoomStatus.BOOKED})
+    db.commit()
+    assert client.put(f"/bookings/{booking_id}", json={"status": "Checked-In"}).status_code == 200
+
+    assert client.get("/rooms/1").json()["status"] == "Booked"
+
+
+def test_bulk_rejects_past_check_in(db, hotel_with_rooms):
+    yesterday = date.today() - timedelta(days=1)
+    past = {"guest_id": 1, "room_id": 1, "check_in_date": yesterday.isoformat(),
+            "check_out_date": (yesterday + timedelta(days=2)).isoformat()}
+
+    result = crud.create_bookings_bulk(db, [past, stay(2, 0, 1)])
+
+    assert result.created == 1 and result.ids[0] is None
+    assert result.errors[0].errors == ["check_in_date: cannot be in the past"]
+
+
+def test_available_rooms_sql_matches_index(db, hotel_with_rooms):
+    crud.create_booking(db, schemas.BookingCreate(**stay(1, 0, 3)))
+    check_in, check_out = START + timedelta(days=1), START + timedelta(days=2)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SAWarning)
+        rooms = crud.get_available_rooms_sql(db, 1, check_in, check_out)
+
+    assert [r.room_id for r in rooms] == [2]
+    assert [r.room_id for r in crud.get_available_rooms(db, 1, check_in, check_out)] == [2]
+
+
+def test_update_rejects_unknown_status(client, hotel_with_rooms):
+    booking_id = client.post("/bookings/", json=stay(1, 0, 3)).json()["booking_id"]
+
+    assert client.put(f"/bookings/{booking_id}", json={"status": "Bogus"}).status_code == 422
+
+    body = client.get(f"/bookings/{booking_id}").json()
+    assert body["status"] == "Confirmed"
+
+
+def test_update_rejects_check_out_before_check_in(client, hotel_with_rooms):
+    booking_id = client.post("/bookings/", json=stay(1, 0, 3)).json()["booking_id"]
+    first_night = (START + timedelta(days=0)).isoformat()
+
+    both = {"check_in_date": (START + timedelta(days=2)).isoformat(), "check_out_date": first_night}
+    assert client.put(f"/bookings/{booking_id}", json=both).status_code == 422
+    # Only the check-out sent: checked against the stored check-in
+    assert client.put(f"/bookings/{booking_id}", json={"check_out_date": first_night}).status_code == 422
+    assert client.get(f"/bookings/{booking_id}").json()["check_out_date"] == (START + timedelta(days=3)).isoformat()
+
+
+def test_create_rejects_bad_input(client, hotel_with_rooms):
+    assert client.post("/bookings/", json=stay(1, 0, 3, status="Bogus")).status_code == 422
+    backwards = dict(stay(1, 0, 3), check_out_date=START.isoformat())
+    assert client.post("/bookings/", json=backwards).status_code == 422
+
+
+def test_recalc_totals_one_update_per_chunk(db, hotel_with_rooms, monkeypatch):
+    crud.create_rate_plan(db, schemas.RatePlanCreate(
+        hotel_id=1, room_type="Standard", name="Peak", start_date=START, end_date=START + timedelta(days=2),
+        price_per_night=150,
+    ))
+    for first in range(0, 25, 5):
+        crud.create_booking(db, schemas.BookingCreate(**stay(1, first, 3)))
+    db.query(models.Booking).update({"total_amount": 0})
+    db.commit()
+
+    monkeypatch.setattr(bulk, "LOOKUP_CHUNK", 2)
+    updates = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE"):
+            updates.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", listener)
+    try:
+        assert crud.recalc_booking_totals(db) == 5
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", listener)
+
+    assert len(updates) == 3  # 5 bookings in chunks of 2
+    totals = [b.total_amount for b in db.query(models.Booking).order_by(models.Booking.booking_id)]
+    assert totals == [Decimal("400.00")] + [Decimal("300.00")] * 4
@@ -0,0 +1,37 @@
+import pytest
+
+from config import settings
+
+
+@pytest.fixture
+def dashboard(monkeypatch):
+    import app
+
+    calls = []
+    monkeypatch.setattr(app, "warm_pool", lambda: calls.append(1))
+    monkeypatch.setattr(app, "_pool_warmed", False)
+    return app.app.test_client(), calls
+
+
+def test_pool_is_warmed_by_the_first_request_only(dashboard):
+    client, calls = dashboard
+    assert calls == []
+    client.get("/login")
+    client.get("/login")
+    assert calls == [1]
+
+
+def test_pool_warm_up_can_be_turned_off(dashboard, monkeypatch):
+    client, calls = dashboard
+    monkeypatch.setattr(settings, "DB_WARM_POOL", False)
+    client.get("/login")
+    assert calls == []
+
+
+def test_revenue_report_renders(dashboard):
+    client, _ = dashboard
+    with client.session_transaction() as session:
+        session["username"] = "admin"
+    response = client.get("/reports/revenue")
+    assert response.status_code == 200
+    assert b"Avg / Day" in response.data
@@ -0,0 +1,128 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import crud
+import schemas
+from database import queries
+
+from conftest import PRIMARY_DB
+
+
+class DictCursor:
+    """Just enough of pymysql's DictCursor over sqlite3: %s placeholders, %% escapes, dict rows"""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def execute(self, sql, params=None):
+        if params is not None:
+            # pymysql formats the statement with the escaped params, which also turns %% into %
+            sql = sql % tuple("?" for _ in params)
+        return self._cursor.execute(sql, params or ())
+
+    def fetchall(self):
+        columns = [d[0] for d in self._cursor.description]
+        return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+
+
+class Connection:
+    def __init__(self):
+        self._conn = sqlite3.connect(PRIMARY_DB)
+        self._conn.create_function(
+            "DATE_FORMAT", 2, lambda value, fmt: date.fromisoformat(value[:10]).strftime(fmt)
+        )
+
+    def cursor(self, cursor_class=None):
+        return DictCursor(self._conn)
+
+    def close(self):
+        self._conn.close()
+
+
+@pytest.fixture
+def dashboard_connection(monkeypatch):
+    monkeypatch.setattr(queries, "get_connection", Connection)
+
+
+def test_recent_bookings(dashboard_connection, db, hotel_with_rooms):
+    check_in = date.today() + timedelta(days=3)
+    for room_id, nights in ((1, 2), (2, 4), (1, 1)):
+        crud.create_booking(db, schemas.BookingCreate(
+            guest_id=1, room_id=room_id, check_in_date=check_in, check_out_date=check_in + timedelta(days=nights),
+        ))
+        check_in += timedelta(days=nights)
+
+    recent = queries.get_recent_bookings(limit=2)
+
+    assert [b["booking_id"] for b in recent] == [3, 2]
+    assert recent[0]["guest_name"] == "Test Guest"
+    assert recent[0]["room_number"] == "101" and recent[0]["room_type"] == "Standard"
+    assert recent[1]["check_in_date"] == (date.today() + timedelta(days=5)).isoformat()
+    assert recent[1]["check_out_date"] == (date.today() + timedelta(days=9)).isoformat()
+
+
+@pytest.fixture
+def stats_fetches(monkeypatch):
+    """Count trips to the database behind the dashboard stats cache"""
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"total_rooms": 2, "occupied": 0, "bookings_today": len(fetches), "revenue_today": "₹0"}
+
+    monkeypatch.setattr(queries, "_fetch_dashboard_stats", fetch)
+    return fetches
+
+
+def test_dashboard_stats_are_cached(stats_fetches):
+    assert queries.get_dashboard_stats()["bookings_today"] == 1
+    assert queries.get_dashboard_stats()["bookings_today"] == 1
+    assert len(stats_fetches) == 1
+
+
+def test_booking_and_payment_writes_invalidate_stats(stats_fetches, db, hotel_with_rooms):
+    queries.get_dashboard_stats()
+    check_in = date.today() + timedelta(days=3)
+    booking = crud.create_booking(db, schemas.BookingCreate(
+        guest_id=1, room_id=1, check_in_date=check_in, check_out_date=check_in + timedelta(days=2),
+    ))
+    assert queries.get_dashboard_stats()["bookings_today"] == 2
+    crud.update_booking(db, booking.booking_id, schemas.BookingUpdate(status="Checked-In"))
+    assert queries.get_dashboard_stats()["bookings_today"] == 3
+    crud.create_payment(db, schemas.PaymentCreate(booking_id=booking.booking_id, amount=100, payment_method="Cash"))
+    assert queries.get_dashboard_stats()["bookings_today"] == 4
+    crud.create_bookings_bulk(db, [{
+        "guest_id": 1, "room_id": 2, "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=1)).isoformat(),
+    }])
+    assert queries.get_dashboard_stats()["bookings_today"] == 5
+
+
+def test_stats_read_during_a_write_are_not_cached(monkeypatch):
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        if len(fetches) == 1:
+            queries.invalidate_dashboard_cache()  # a booking committed while the query ran
+        return {"total_rooms": 2, "occupied": 0, "bookings_today": len(fetches), "revenue_today": "₹0"}
+
+    monkeypatch.setattr(queries, "_fetch_dashboard_stats", fetch)
+    assert queries.get_dashboard_stats()["bookings_today"] == 1
+    assert queries.get_dashboard_stats()["bookings_today"] == 2
+    assert queries.get_dashboard_stats()["bookings_today"] == 2
+
+
+def test_unavailable_database_is_not_cached(monkeypatch):
+    results = [None, {"total_rooms": 2, "occupied": 1, "bookings_today": 0, "revenue_today": "₹0"}]
+    monkeypatch.setattr(queries, "_fetch_dashboard_stats", lambda: results.pop(0))
+    assert queries.get_dashboard_stats()["total_rooms"] == 0
+    assert queries.get_dashboard_stats()["total_rooms"] == 2
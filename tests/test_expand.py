@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import models
+from database import get_engine
+
+from conftest import seed_hotel
+
+
+@pytest.fixture
+def booking(db):
+    seed_hotel(db)
+    check_in = date.today() + timedelta(days=10)
+    db.add(models.GuestPhone(guest_id=1, phone="+91 98100 00000"))
+    db.add(models.Service(service_name="Spa", price=10))
+    db.add(models.Booking(guest_id=1, room_id=1, check_in_date=check_in, check_out_date=check_in + timedelta(days=2)))
+    db.flush()
+    for amount in (50, 70):
+        db.add(models.Payment(booking_id=1, amount=amount, payment_method=models.PaymentMethod.CASH))
+    db.add(models.ServiceUsage(booking_id=1, service_id=1, quantity=3))
+    db.commit()
+
+
+@contextmanager
+def count_selects():
+    selects = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", listener)
+    try:
+        yield selects
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", listener)
+
+
+def test_without_expand_relations_are_left_out(client, booking):
+    body = client.get("/bookings/1").json()
+    assert body["booking_id"] == 1
+    assert not {"room", "guest", "payments", "services"} & set(body)
+
+
+def test_expand_embeds_requested_relations(client, booking):
+    body = client.get("/bookings/1", params={"expand": "room, services,payments,room"}).json()
+    assert body["room"]["room_number"] == "101"
+    assert [p["amount"] for p in body["payments"]] == ["50.00", "70.00"]
+    assert body["services"][0]["quantity"] == 3 and body["services"][0]["service"]["service_name"] == "Spa"
+    assert "guest" not in body
+
+
+def test_expanded_read_costs_a_fixed_number_of_queries(client, booking, db):
+    with count_selects() as few:
+        client.get("/bookings/1", params={"expand": "room,guest,payments,services"})
+    for amount in range(10):
+        db.add(models.Payment(booking_id=1, amount=amount + 1, payment_method=models.PaymentMethod.CASH))
+    db.commit()
+    with count_selects() as many:
+        body = client.get("/bookings/1", params={"expand": "room,guest,payments,services"}).json()
+    assert len(body["payments"]) == 12
+    assert len(many) == len(few)
+
+
+def test_guest_expand(client, booking):
+    body = client.get("/guests/1", params={"expand": "phones,bookings"}).json()
+    assert [p["phone"] for p in body["phones"]] == ["+91 98100 00000"]
+    assert [b["booking_id"] for b in body["bookings"]] == [1]
+
+
+@pytest.mark.parametrize("path", ["/bookings/1", "/guests/1", "/guests/1/bookings"])
+def test_unknown_expansion_is_a_400(client, booking, path):
+    response = client.get(path, params={"expand": "room,invoices"})
+    assert response.status_code == 400
+    assert "invoices" in response.json()["detail"]
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import exports
+import models
+from database import get_engine
+
+from conftest import seed_hotel
+
+
+@pytest.fixture
+def bookings(db):
+    seed_hotel(db)
+    db.add(models.Guest(name='Quote "Comma", Esq.', email="q@test.example.com"))
+    db.add(models.GuestPhone(guest_id=1, phone="111"))
+    db.add(models.GuestPhone(guest_id=1, phone="222"))
+    check_in = date(2026, 5, 1)
+    for n in range(5):
+        db.add(models.Booking(guest_id=1 + n % 2, room_id=1 + n % 2, check_in_date=check_in + timedelta(days=3 * n),
+                              check_out_date=check_in + timedelta(days=3 * n + 2), total_amount="200.50"))
+    db.flush()
+    db.add(models.Payment(booking_id=1, payment_date=date(2026, 5, 1), amount="200.50",
+                          payment_method=models.PaymentMethod.UPI))
+    db.commit()
+
+
+def test_csv_streams_in_chunks(bookings):
+    chunks = list(exports.stream(exports.bookings_query(), "csv", chunk_rows=2))
+    assert len(chunks) == 1 + 3  # the header, then 5 rows in chunks of 2
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [int(r["booking_id"]) for r in rows] == [1, 2, 3, 4, 5]
+    assert rows[0]["status"] == "Confirmed" and rows[0]["total_amount"] == "200.50"
+    assert rows[0]["check_in_date"] == "2026-05-01" and rows[0]["room_number"] == "101"
+
+
+def test_ndjson_one_object_per_line(bookings):
+    body = b"".join(exports.stream(exports.payments_query(), "ndjson", chunk_rows=2)).decode("utf-8")
+    (line,) = body.splitlines()
+    assert json.loads(line) == {
+        "payment_id": 1, "booking_id": 1, "payment_date": "2026-05-01", "amount": "200.50",
+        "payment_method": "UPI", "payment_status": "Paid",
+    }
+
+
+def test_connection_goes_back_to_the_pool(bookings):
+    pool = get_engine().pool
+    before = pool.checkedout()
+    stream = exports.stream(exports.guests_query(), "csv", chunk_rows=1)
+    next(stream)
+    assert pool.checkedout() == before + 1
+    list(stream)
+    assert pool.checkedout() == before
+
+
+def test_guest_export_endpoint(client, bookings):
+    response = client.get("/exports/guests", params={"search": "Comma"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="guests_')
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["name"] for r in rows] == ['Quote "Comma", Esq.']
+
+
+def test_booking_export_filters(client, bookings):
+    response = client.get("/exports/bookings", params={
+        "format": "ndjson", "date_from": "2026-05-04", "date_to": "2026-05-10", "guest_id": 2,
+    })
+    assert response.headers["content-type"] == "application/x-ndjson"
+    # date_to is inclusive: booking 4 checks in on May 10
+    assert [json.loads(line)["booking_id"] for line in response.text.splitlines()] == [2, 4]
+
+
+def test_guest_phones_are_joined(bookings):
+    body = b"".join(exports.stream(exports.guests_query(ids=[1]))).decode("utf-8")
+    (row,) = csv.DictReader(io.StringIO(body))
+    assert sorted(row["phones"].split(",")) == ["111", "222"]
@@ -0,0 +1,48 @@
+import pytest
+
+import crud
+import models
+
+GUESTS = [
+    ("Asha Verma", "asha@example.com"),
+    ("Rahul Verma", "rahul.v@example.org"),
+    ("Verity Jones", None),
+    ("100% Real_Name", "real@example.com"),
+    ("Meera Iyer", "meera@verma-family.example"),
+]
+
+
+@pytest.fixture
+def guests(db):
+    for name, email in GUESTS:
+        db.add(models.Guest(name=name, email=email))
+    db.commit()
+
+
+def names(client, term, **params):
+    response = client.get(f"/guests/search/{term}", params=params)
+    assert response.status_code == 200
+    return [guest["name"] for guest in response.json()]
+
+
+def test_matches_name_or_email_ordered_by_name(client, guests):
+    assert names(client, "verma") == ["Asha Verma", "Meera Iyer", "Rahul Verma"]
+    assert names(client, "example.org") == ["Rahul Verma"]
+
+
+def test_wildcards_are_literal(client, guests):
+    assert names(client, "0%") == ["100% Real_Name"]
+    assert names(client, "l_N") == ["100% Real_Name"]
+    assert names(client, "_") == ["100% Real_Name"]
+
+
+def test_blank_terms_match_nothing(db, guests):
+    assert crud.search_guests(db, "   ") == []
+    assert crud.search_guests(db, '""') == []
+
+
+def test_pages_are_bounded(client, guests):
+    assert names(client, "e", limit=2) == ["100% Real_Name", "Asha Verma"]
+    assert names(client, "e", limit=2, offset=2) == ["Meera Iyer", "Rahul Verma"]
+    assert client.get("/guests/search/e", params={"limit": 101}).status_code == 422
+    assert client.get("/guests/search/e", params={"offset": -1}).status_code == 422
@@ -0,0 +1,32 @@
+import http_cache
+import models
+
+from conftest import seed_hotel
+
+
+def test_etag_follows_the_representation(client, db):
+    seed_hotel(db)
+    first = client.get("/hotels/1")
+    etag = first.headers["etag"]
+    assert client.get("/hotels/1", headers={"If-None-Match": etag}).status_code == 304
+
+    # An edit within the same second: updated_at is unchanged, the body is not
+    hotel = db.get(models.Hotel, 1)
+    db.query(models.Hotel).filter(models.Hotel.hotel_id == 1).update(
+        {"name": "Renamed", "updated_at": hotel.updated_at}, synchronize_session=False
+    )
+    db.commit()
+    http_cache.invalidate(http_cache.HOTELS)  # what HTTP_CACHE_TTL does for writes from other workers
+
+    second = client.get("/hotels/1", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["name"] == "Renamed"
+    assert second.headers["etag"] != etag
+
+
+def test_write_through_the_api_evicts(client, db):
+    seed_hotel(db)
+    etag = client.get("/hotels/").headers["etag"]
+    assert client.put("/hotels/1", json={"name": "New", "city": "Pune"}).status_code == 200
+    listing = client.get("/hotels/", headers={"If-None-Match": etag})
+    assert listing.status_code == 200 and listing.json()[0]["name"] == "New"
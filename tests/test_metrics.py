@@ -0,0 +1,57 @@
+import sqlite3
+
+import metrics
+from config import settings
+from database import get_engine, slow_queries
+
+
+def test_raw_cursor_queries_count_towards_the_request():
+    conn = sqlite3.connect(":memory:")
+    stats, token = metrics.begin_request()
+    try:
+        slow_queries.execute(conn.cursor(), "SELECT 1", ())
+        slow_queries.execute(conn.cursor(), "SELECT 2", ())
+    finally:
+        metrics.end_request("test", "GET", "/raw", 200, 0.0, stats, token)
+
+    assert stats.queries == 2
+    assert stats.db_seconds > 0
+    assert metrics.QUERIES.labels("test", "/raw")._value.get() == 2
+    assert metrics.REQUEST_QUERIES.labels("test", "/raw")._sum.get() == 2
+
+
+
+def pool_value(metric, role, kind="sync"):
+    return metric.labels(role, kind)._value.get()
+
+
+def test_raw_connections_show_in_the_pool_gauges():
+    engine = get_engine()
+    in_use = pool_value(metrics.POOL_IN_USE, "primary")
+    waits = metrics.POOL_CHECKOUT_WAIT.labels("primary", "sync")._sum.get()
+
+    conn = engine.raw_connection()
+    assert pool_value(metrics.POOL_IN_USE, "primary") == in_use + 1
+    assert pool_value(metrics.POOL_OPEN, "primary") >= 1
+    conn.close()
+    assert pool_value(metrics.POOL_IN_USE, "primary") == in_use
+    assert metrics.POOL_CHECKOUT_WAIT.labels("primary", "sync")._sum.get() > waits
+    assert pool_value(metrics.POOL_SIZE, "primary") == settings.DB_POOL_SIZE
+
+
+def test_gauges_survive_dispose():
+    engine = get_engine()
+    engine.dispose()
+    in_use = pool_value(metrics.POOL_IN_USE, "primary")
+    waits = metrics.POOL_CHECKOUT_WAIT.labels("primary", "sync")._sum.get()
+    with engine.connect():
+        assert pool_value(metrics.POOL_IN_USE, "primary") == in_use + 1
+    assert metrics.POOL_CHECKOUT_WAIT.labels("primary", "sync")._sum.get() > waits
+
+
+def test_replica_pool_is_labelled_separately(replica):
+    primary = pool_value(metrics.POOL_IN_USE, "primary")
+    replica_in_use = pool_value(metrics.POOL_IN_USE, "replica")
+    with replica.connect():
+        assert pool_value(metrics.POOL_IN_USE, "replica") == replica_in_use + 1
+        assert pool_value(metrics.POOL_IN_USE, "primary") == primary
@@ -0,0 +1,31 @@
+import re
+
+from database.migrate import MIGRATIONS_DIR, discover
+from database.sql_runner import iter_statements
+
+MIGRATIONS = discover()
+
+
+def statements(migration):
+    with open(migration.path) as script:
+        return [sql for sql, _ in iter_statements(script, str(migration.path))]
+
+
+def test_versions_are_contiguous():
+    assert [int(m.version) for m in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
+
+
+def test_daily_revenue_is_created_and_backfilled():
+    daily_revenue = next(m for m in MIGRATIONS if m.name == "daily_revenue")
+    create, backfill = statements(daily_revenue)
+    assert create.startswith("CREATE TABLE IF NOT EXISTS daily_revenue")
+    assert backfill.startswith("INSERT INTO daily_revenue") and "ON DUPLICATE KEY UPDATE" in backfill
+
+
+def test_fresh_install_leaves_migrated_objects_to_migrations():
+    with open(MIGRATIONS_DIR.parent / "schema" / "tables.sql") as script:
+        tables = [sql for sql, _ in iter_statements(script)]
+    created = {re.match(r"CREATE TABLE (\w+)", sql).group(1) for sql in tables if sql.startswith("CREATE TABLE")}
+    assert not created & {"rate_plan", "daily_revenue"}
+    assert not any("ft_guest_search" in sql for sql in tables)
+    assert any("ft_guest_search" in sql for m in MIGRATIONS for sql in statements(m))
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+import pytest
+
+import models
+from pagination import NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, encode_cursor
+
+from conftest import seed_hotel
+
+KEY = [models.Booking.check_in_date, models.Booking.booking_id]
+
+
+def walk(client, path, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    token = encode_cursor([date(2026, 3, 1), 42])
+    assert "=" not in token
+    assert decode_cursor(token, KEY) == (date(2026, 3, 1), 42)
+
+
+@pytest.mark.parametrize("token", ["not-base64!", encode_cursor([1]), encode_cursor(["soon", 1]), "bnVsbA"])
+def test_decode_rejects_bad_tokens(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, KEY)
+
+
+def test_pages_cover_every_row_once(client, db):
+    for n in range(5):
+        db.add(models.Hotel(name=f"Hotel {n}", city="Delhi"))
+    db.commit()
+    pages = walk(client, "/hotels/", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [h["hotel_id"] for page in pages for h in page] == [1, 2, 3, 4, 5]
+
+
+def test_composite_key_pages_through_ties(client, db):
+    seed_hotel(db)
+    first = date.today() + timedelta(days=10)
+    # Three stays share a check-in date, so the booking_id half of the key breaks the tie
+    for room_id, offset in ((1, 5), (1, 0), (2, 0), (1, 20), (2, 5)):
+        check_in = first + timedelta(days=offset)
+        db.add(models.Booking(guest_id=1, room_id=room_id, check_in_date=check_in,
+                              check_out_date=check_in + timedelta(days=2)))
+    db.commit()
+    pages = walk(client, "/guests/1/bookings", limit=2)
+    seen = [(b["check_in_date"], b["booking_id"]) for page in pages for b in page]
+    assert len(pages) == 3
+    assert seen == sorted(seen) and len(set(seen)) == 5
+
+
+def test_bad_cursor_is_a_400(client, hotel_with_rooms):
+    for path in ("/hotels/", "/guests/1/bookings", "/services/"):
+        response = client.get(path, params={"cursor": "garbage"})
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid cursor")
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import models
+import pricing
+from config import settings
+
+MONDAY = date(2026, 3, 2)
+
+
+def plan(rate_plan_id, start, stop, price, days_of_week=pricing.ALL_DAYS, priority=0, room_type="Standard"):
+    return SimpleNamespace(
+        rate_plan_id=rate_plan_id, room_type=room_type, price_per_night=price, days_of_week=days_of_week,
+        priority=priority, start_date=MONDAY + timedelta(days=start), end_date=MONDAY + timedelta(days=stop),
+    )
+
+
+def test_hotel_rates_paint_plans_by_priority_and_weekday():
+    rates = pricing.HotelRates(MONDAY, 14, [
+        plan(1, 0, 14, 120),
+        plan(2, 0, 14, 180, days_of_week=pricing.WEEKENDS),
+        plan(3, 2, 4, 90, priority=1),  # Wednesday and Thursday
+        plan(4, 3, 5, 95, priority=1),  # same priority, newer: wins Thursday
+    ])
+    row = rates.types["Standard"]
+    assert (rates.rate[row, :7] // 100).tolist() == [120, 120, 90, 95, 95, 180, 180]
+    assert rates.priced[row].all()
+    assert not rates.priced[rates.rows(["Suite"])[0]].any()
+
+
+def test_stay_cents_mixes_plan_and_room_prices():
+    rates = pricing.HotelRates(MONDAY, 14, [plan(1, 2, 4, Decimal("150.50"))])
+    rows = rates.rows(["Standard", "Deluxe", "Standard"])
+    totals = rates.stay_cents(rows, pricing.cents([100, 200, 100]), np.array([0, 0, 3]), np.array([5, 5, 3]))
+    # Standard: 100 + 100 + 150.50 + 150.50 + 100; Deluxe has no plan; an empty stay costs nothing
+    assert totals.tolist() == [60100, 100000, 0]
+
+
+@pytest.fixture
+def hotel(db):
+    db.add(models.Hotel(name="Test Hotel", city="Delhi"))
+    db.add(models.Guest(name="Test Guest", email="guest@test.example.com"))
+    db.flush()
+    for number, room_type, price in (("101", "Standard", 100), ("102", "Standard", 100), ("201", "Deluxe", 200)):
+        db.add(models.Room(hotel_id=1, room_number=number, room_type=room_type, price_per_night=price))
+    db.commit()
+
+
+def quote(client, check_in, nights, **params):
+    response = client.get("/hotels/1/quote", params={
+        "check_in": check_in.isoformat(), "check_out": (check_in + timedelta(days=nights)).isoformat(), **params,
+    })
+    assert response.status_code == 200
+    return {q["room_number"]: (Decimal(q["total"]), Decimal(q["average_nightly"])) for q in response.json()}
+
+
+def add_plan(client, check_in, first, stop, price, **fields):
+    response = client.post("/rate-plans/", json={
+        "hotel_id": 1, "room_type": "Standard", "price_per_night": str(price),
+        "start_date": (check_in + timedelta(days=first)).isoformat(),
+        "end_date": (check_in + timedelta(days=stop)).isoformat(), **fields,
+    })
+    assert response.status_code == 201
+    return response.json()["rate_plan_id"]
+
+
+def test_quote_prices_available_rooms_night_by_night(client, hotel):
+    check_in = date.today() + timedelta(days=10)
+    assert client.post("/bookings/", json={
+        "guest_id": 1, "room_id": 2, "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=1)).isoformat(),
+    }).status_code == 201
+    add_plan(client, check_in, 1, 3, 150)
+    assert quote(client, check_in, 4) == {
+        "101": (Decimal("500.00"), Decimal("125.00")),
+        "201": (Decimal("800.00"), Decimal("200.00")),
+    }
+    assert list(quote(client, check_in, 4, room_type="Deluxe")) == ["201"]
+
+
+def test_rate_plan_writes_invalidate_the_cached_calendar(client, hotel):
+    check_in = date.today() + timedelta(days=10)
+    assert quote(client, check_in, 2)["101"][0] == 200
+    plan_id = add_plan(client, check_in, 0, 2, 130)
+    assert quote(client, check_in, 2)["101"][0] == 260
+    assert client.put(f"/rate-plans/{plan_id}", json={
+        "hotel_id": 1, "room_type": "Standard", "price_per_night": "110",
+        "start_date": check_in.isoformat(), "end_date": (check_in + timedelta(days=1)).isoformat(),
+    }).status_code == 200
+    assert quote(client, check_in, 2)["101"][0] == 210
+    assert client.delete(f"/rate-plans/{plan_id}").status_code == 204
+    assert quote(client, check_in, 2)["101"][0] == 200
+
+
+def test_stays_beyond_the_cached_window(client, hotel):
+    check_in = date.today() + timedelta(days=settings.RATE_CALENDAR_DAYS + 30)
+    add_plan(client, check_in, 0, 1, 175)
+    assert quote(client, check_in, 2)["101"][0] == 275
+
+
+def test_quote_and_plans_reject_inverted_dates(client, hotel):
+    check_in = date.today() + timedelta(days=10)
+    response = client.get("/hotels/1/quote", params={"check_in": check_in.isoformat(), "check_out": check_in.isoformat()})
+    assert response.status_code == 400
+    response = client.post("/rate-plans/", json={
+        "hotel_id": 1, "room_type": "Standard", "price_per_night": "100",
+        "start_date": check_in.isoformat(), "end_date": check_in.isoformat(),
+    })
+    assert response.status_code == 400
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+
+import models
+import reporting
+
+from conftest import seed_hotel
+
+MARCH = date(2026, 3, 1)
+
+
+def day(n):
+    return MARCH + timedelta(days=n - 1)
+
+
+@pytest.fixture
+def stays(db):
+    """
+    Rooms 1 and 2 are Standard at 100, room 3 Deluxe at 200. Over March 1-5
+    the nights sold are 1, 2, 1, 0 and 1, for 100, 300, 200, 0 and 100.
+    """
+    seed_hotel(db)
+    db.add(models.Room(hotel_id=1, room_number="201", room_type="Deluxe", price_per_night=200))
+    for room_id, check_in, check_out, status in (
+        (1, date(2026, 2, 27), day(3), models.BookingStatus.CHECKED_OUT),  # clipped at the start
+        (3, day(2), day(4), models.BookingStatus.CHECKED_OUT),
+        (2, day(1), day(5), models.BookingStatus.CANCELLED),  # not sold
+        (2, day(5), day(10), models.BookingStatus.CHECKED_IN),  # clipped at the end
+    ):
+        db.add(models.Booking(guest_id=1, room_id=room_id, check_in_date=check_in,
+                              check_out_date=check_out, status=status))
+    db.flush()
+    db.add(models.Payment(booking_id=1, payment_date=day(2), amount=250.5, payment_method=models.PaymentMethod.CARD))
+    db.add(models.Payment(booking_id=2, payment_date=day(3), amount=99, payment_method=models.PaymentMethod.UPI,
+                          payment_status=models.PaymentStatus.PENDING))
+    db.commit()
+
+
+def test_daily_rows_per_hotel(stays):
+    rows = reporting.performance_report(day(1), day(5))
+    assert [r["rooms_sold"] for r in rows] == [1, 2, 1, 0, 1]
+    assert [r["room_revenue"] for r in rows] == [100, 300, 200, 0, 100]
+    assert [r["paid"] for r in rows] == [0, 250.5, 0, 0, 0]
+    assert {r["rooms_available"] for r in rows} == {3}
+    assert rows[1]["occupancy_pct"] == 66.67 and rows[1]["adr"] == 150 and rows[1]["revpar"] == 100
+
+
+def test_total_period_matches_totals_of_days(stays):
+    daily = reporting.performance_report(day(1), day(5))
+    (total,) = reporting.performance_report(day(1), day(5), period="total")
+    assert total["period"] == "2026-03-01/2026-03-05"
+    expected = reporting.totals(daily)
+    assert {key: total[key] for key in expected} == expected
+    assert expected == {
+        "rooms_available": 15, "rooms_sold": 5, "occupancy_pct": 33.33,
+        "room_revenue": 700, "adr": 140, "revpar": 46.67, "paid": 250.5,
+    }
+
+
+def test_grouped_by_room_type(stays):
+    rows = reporting.performance_report(day(1), day(5), by="room_type", period="month")
+    assert [(r["room_type"], r["rooms_available"], r["rooms_sold"], r["room_revenue"]) for r in rows] == [
+        ("Deluxe", 5, 2, 400),
+        ("Standard", 10, 3, 300),
+    ]
+    assert {r["period"] for r in rows} == {"2026-03"}
+
+
+def test_rate_plans_price_the_nights_they_cover(stays, db):
+    db.add(models.RatePlan(hotel_id=1, room_type="Standard", start_date=day(5), end_date=day(6),
+                           price_per_night=150))
+    db.commit()
+    rows = reporting.performance_report(day(1), day(5))
+    assert [r["room_revenue"] for r in rows] == [100, 300, 200, 0, 150]
+
+
+def test_endpoint_rejects_bad_ranges(client):
+    response = client.get("/reports/performance", params={"start": "2026-03-05", "end": "2026-03-01"})
+    assert response.status_code == 400
@@ -0,0 +1,119 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+import availability
+import crud
+import models
+import routing
+import schemas
+from config import settings
+from database import SessionLocal, reading_from_replica, replica_reads
+
+from conftest import seed_hotel
+
+CHECK_IN = date.today() + timedelta(days=10)
+CHECK_OUT = CHECK_IN + timedelta(days=2)
+
+
+def test_cache_fills_read_the_primary(replica, db):
+    # The replica has the hotel but lags: no booking, no rate plan yet
+    seed_hotel(db)
+    with Session(bind=replica) as lagging:
+        seed_hotel(lagging)
+    crud.create_booking(db, schemas.BookingCreate(guest_id=1, room_id=1, check_in_date=CHECK_IN, check_out_date=CHECK_OUT))
+    crud.create_rate_plan(db, schemas.RatePlanCreate(
+        hotel_id=1, room_type="Standard", name="Peak", start_date=CHECK_IN, end_date=CHECK_OUT, price_per_night=150,
+    ))
+    availability.index.clear()
+
+    with replica_reads(), SessionLocal() as reader:
+        quotes = crud.quote_rooms(reader, 1, CHECK_IN, CHECK_OUT)
+
+    assert [q.room_id for q in quotes] == [2]
+    assert quotes[0].total == Decimal("300.00")
+    assert not availability.index.is_free(1, CHECK_IN, CHECK_OUT)
+
+
+def seed_guest(session, name):
+    session.add(models.Guest(name=name, email=f"{name.lower()}@test.example.com"))
+    session.commit()
+
+
+def test_session_reads_replica_until_it_writes(replica, db):
+    seed_guest(db, "Primary")
+    with Session(bind=replica) as lagging:
+        seed_guest(lagging, "Replica")
+
+    with replica_reads(), SessionLocal() as session:
+        assert session.query(models.Guest.name).scalar() == "Replica"
+        session.add(models.Guest(name="New", email="new@test.example.com"))
+        session.flush()
+        assert sorted(name for name, in session.query(models.Guest.name)) == ["New", "Primary"]
+        session.rollback()
+
+
+def test_locking_read_goes_to_primary(replica, db):
+    seed_guest(db, "Primary")
+    with Session(bind=replica) as lagging:
+        seed_guest(lagging, "Replica")
+
+    with replica_reads(), SessionLocal() as session:
+        assert session.query(models.Guest.name).with_for_update().scalar() == "Primary"
+        # Pinned from then on
+        assert session.query(models.Guest.name).scalar() == "Primary"
+
+
+def test_no_replica_reads_outside_get(replica, db):
+    seed_guest(db, "Primary")
+    with Session(bind=replica) as lagging:
+        seed_guest(lagging, "Replica")
+
+    with SessionLocal() as session:
+        assert session.query(models.Guest.name).scalar() == "Primary"
+
+
+def test_get_reads_replica_and_post_writes_primary(replica, client, db):
+    with Session(bind=replica) as lagging:
+        seed_guest(lagging, "Replica")
+
+    assert client.get("/guests/1").json()["name"] == "Replica"
+    response = client.post("/guests/", json={"name": "Written", "email": "written@test.example.com"})
+    assert response.status_code == 201
+    assert db.query(models.Guest.name).scalar() == "Written"
+    with Session(bind=replica) as lagging:
+        assert lagging.query(models.Guest.name).scalar() == "Replica"
+
+
+def test_write_pins_client_to_primary(replica, client):
+    import main
+    from fastapi.testclient import TestClient
+
+    response = client.post("/guests/", json={"name": "Written", "email": "written@test.example.com"})
+    guest_id = response.json()["guest_id"]
+    assert routing.PIN_COOKIE in response.cookies
+
+    # The writer reads its own write; a client without the cookie reads the lagging replica
+    assert client.get(f"/guests/{guest_id}").status_code == 200
+    with TestClient(main.app) as other:
+        assert other.get(f"/guests/{guest_id}").status_code == 404
+
+    # Once the window has passed, the writer is back on the replica
+    client.cookies.set(routing.PIN_COOKIE, str(int(time.time()) - 1))
+    assert client.get(f"/guests/{guest_id}").status_code == 404
+
+
+def test_failed_write_does_not_pin(replica, client):
+    response = client.post("/bookings/", json={"guest_id": 1, "room_id": 1})
+    assert response.status_code == 422
+    assert routing.PIN_COOKIE not in response.cookies
+
+
+def test_reading_from_replica_needs_a_replica(monkeypatch):
+    with replica_reads():
+        assert not reading_from_replica()
+        monkeypatch.setattr(settings, "DB_REPLICA_URL", "sqlite://")
+        assert reading_from_replica()
+    assert not reading_from_replica()
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+import models
+
+from conftest import seed_hotel
+
+
+@pytest.fixture
+def service_in_use(db):
+    """Spa at 10.00, used twice by an open booking and once by a checked-out one"""
+    seed_hotel(db)
+    db.add(models.Service(service_name="Spa", price=10))
+    check_in = date.today() + timedelta(days=10)
+    for room_id, status, total in (
+        (1, models.BookingStatus.CONFIRMED, 520),
+        (2, models.BookingStatus.CHECKED_OUT, 310),
+        (2, models.BookingStatus.CONFIRMED, 200),  # does not use the service
+    ):
+        db.add(models.Booking(guest_id=1, room_id=room_id, check_in_date=check_in,
+                              check_out_date=check_in + timedelta(days=2), status=status, total_amount=total))
+        check_in += timedelta(days=3)
+    db.flush()
+    db.add(models.ServiceUsage(booking_id=1, service_id=1, quantity=2))
+    db.add(models.ServiceUsage(booking_id=2, service_id=1, quantity=1))
+    db.commit()
+
+
+def totals(db):
+    db.expire_all()
+    return [b.total_amount for b in db.query(models.Booking).order_by(models.Booking.booking_id)]
+
+
+def test_dry_run_reports_without_changing_anything(client, db, service_in_use):
+    response = client.patch("/services/1/price", params={"dry_run": True}, json={"price": "15.00"})
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["affected_bookings"], result["dry_run"]) == (1, True)
+    assert Decimal(result["old_price"]) == 10 and Decimal(result["new_price"]) == 15
+    assert totals(db) == [520, 310, 200]
+    assert db.get(models.Service, 1).price == 10
+
+
+def test_reprices_open_bookings_by_quantity(client, db, service_in_use):
+    assert Decimal(client.get("/services/").json()[0]["price"]) == 10  # cached
+    response = client.patch("/services/1/price", json={"price": "15.00"})
+    assert response.status_code == 200 and response.json()["affected_bookings"] == 1
+    assert totals(db) == [530, 310, 200]
+    assert Decimal(client.get("/services/").json()[0]["price"]) == 15
+
+
+def test_same_price_touches_no_bookings(client, db, service_in_use):
+    assert client.patch("/services/1/price", json={"price": "10.00"}).json()["affected_bookings"] == 0
+    assert totals(db) == [520, 310, 200]
+
+
+def test_rejects_unknown_service_and_bad_price(client, service_in_use):
+    assert client.patch("/services/9/price", json={"price": "15.00"}).status_code == 404
+    assert client.patch("/services/1/price", json={"price": "0"}).status_code == 422
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from database.sql_runner import SQLScriptError, iter_statements, run_sql_file
+
+
+def split(script):
+    return list(iter_statements(script.splitlines(keepends=True)))
+
+
+def test_delimiters_inside_quotes_do_not_split():
+    script = (
+        "INSERT INTO t VALUES ('a;b', \"c;d\", 'it''s', 'back\\'slash;');\n"
+        "SELECT `odd;name` FROM t;\n"
+    )
+    assert [sql for sql, _ in split(script)] == [
+        "INSERT INTO t VALUES ('a;b', \"c;d\", 'it''s', 'back\\'slash;')",
+        "SELECT `odd;name` FROM t",
+    ]
+
+
+def test_quoted_values_span_lines():
+    assert split("INSERT INTO t VALUES ('one;\ntwo');\nSELECT 1;\n") == [
+        ("INSERT INTO t VALUES ('one;\ntwo')", 1),
+        ("SELECT 1", 3),
+    ]
+
+
+def test_comments_are_dropped_but_hints_kept():
+    script = (
+        "-- leading comment; not a statement\n"
+        "# another one;\n"
+        "SELECT 1 /* inline; */ + 1; -- trailing\n"
+        "/* multi\n   line; */\n"
+        "SELECT 5--1;\n"
+        "/*!40101 SET NAMES utf8mb4 */;\n"
+    )
+    statements = split(script)
+    assert [" ".join(sql.split()) for sql, _ in statements] == [
+        "SELECT 1 + 1",
+        "SELECT 5--1",  # `--` without a following space is an operator, not a comment
+        "/*!40101 SET NAMES utf8mb4 */",
+    ]
+    assert [line for _, line in statements] == [3, 6, 7]
+
+
+def test_delimiter_directive():
+    script = (
+        "DROP PROCEDURE IF EXISTS p;\n"
+        "DELIMITER //\n"
+        "CREATE PROCEDURE p()\n"
+        "BEGIN\n"
+        "  SELECT 1;\n"
+        "  SELECT ';//';\n"
+        "END //\n"
+        "DELIMITER ;\n"
+        "CALL p();\n"
+    )
+    assert split(script) == [
+        ("DROP PROCEDURE IF EXISTS p", 1),
+        ("CREATE PROCEDURE p()\nBEGIN\n  SELECT 1;\n  SELECT ';//';\nEND", 3),
+        ("CALL p()", 9),
+    ]
+
+
+def test_unterminated_quote_reports_where_it_started():
+    with pytest.raises(SQLScriptError) as error:
+        split("SELECT 1;\nSELECT 'open;\nmore;\n")
+    assert error.value.line == 2
+
+
+def test_run_sql_file_stops_at_the_failing_statement(tmp_path):
+    script = tmp_path / "seed.sql"
+    script.write_text(
+        "CREATE TABLE t (v TEXT);\n"
+        "INSERT INTO t VALUES ('a;b');\n"
+        "INSERT INTO missing VALUES (1);\n"
+        "INSERT INTO t VALUES ('never');\n"
+    )
+    engine = create_engine(f"sqlite:///{tmp_path / 'run.db'}")
+    with engine.connect() as connection:
+        with pytest.raises(SQLScriptError) as error:
+            run_sql_file(str(script), connection, batch_size=1, progress=None)
+        assert error.value.line == 3
+        assert connection.execute(text("SELECT v FROM t")).scalars().all() == ["a;b"]
+    engine.dispose()